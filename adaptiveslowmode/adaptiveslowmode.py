@@ -1,8 +1,11 @@
 import discord # type: ignore
 from redbot.core import commands, Config, checks # type: ignore
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 import asyncio
-from collections import deque, defaultdict
+import time
+from collections import deque, defaultdict, OrderedDict
+
+from .controller import CONTROLLERS
 
 def loop(*, seconds=0, minutes=0, hours=0):
     """A simple replacement for tasks.loop for Red 3.5+ compatibility."""
@@ -22,9 +25,51 @@ def plural(n, singular, plural=None):
         return singular
     return plural if plural is not None else singular + "s"
 
+class ActivityWindow:
+    """
+    Sliding window of channel activity in constant memory.
+
+    Messages are counted in per-second buckets of a ring buffer, so recording a message is O(1)
+    and the count stays exact no matter how busy the channel gets. Recent authors are kept in a
+    bounded LRU map of author id -> last second seen.
+    """
+
+    def __init__(self, window: int = 300, max_authors: int = 1000):
+        self.window = window
+        self.max_authors = max_authors
+        self._counts = [0] * window
+        self._seconds = [-1] * window  # Which second each bucket currently holds
+        self._authors = OrderedDict()
+
+    def add(self, author_id: int, now: float = None):
+        second = int(time.monotonic() if now is None else now)
+        index = second % self.window
+        if self._seconds[index] != second:
+            # Bucket still holds an older second, recycle it
+            self._seconds[index] = second
+            self._counts[index] = 0
+        self._counts[index] += 1
+        self._authors[author_id] = second
+        self._authors.move_to_end(author_id)
+        if len(self._authors) > self.max_authors:
+            self._authors.popitem(last=False)
+
+    def count(self, seconds: int, now: float = None) -> int:
+        """Number of messages in the last `seconds` seconds."""
+        second = int(time.monotonic() if now is None else now)
+        oldest = second - min(seconds, self.window)
+        return sum(c for c, s in zip(self._counts, self._seconds) if oldest < s <= second)
+
+    def authors(self, seconds: int, now: float = None) -> list:
+        """Ids of authors seen in the last `seconds` seconds."""
+        second = int(time.monotonic() if now is None else now)
+        oldest = second - seconds
+        return [uid for uid, seen in self._authors.items() if seen > oldest]
+
+
 class AdaptiveSlowmode(commands.Cog):
     """
-    Dynamically adjust channel slowmode in 1-second increments based on activity to keep chat readable and moderatable.
+    Dynamically adjust channel slowmode based on activity to keep chat readable and moderatable.
     """
 
     DEFAULTS = {
@@ -34,14 +79,17 @@ class AdaptiveSlowmode(commands.Cog):
         "target_msgs_per_min": 20,
         "channels": [],
         "log_channel": None,
+        "controller": "pi",
     }
 
     def __init__(self, bot):
         self.bot = bot
         self.config = Config.get_conf(self, identifier=0xBEEBEE01, force_registration=True)
         self.config.register_guild(**self.DEFAULTS)
-        self._message_cache = defaultdict(lambda: deque(maxlen=500))
-        self._lock = asyncio.Lock()
+        self._activity = defaultdict(ActivityWindow)  # channel_id: ActivityWindow
+        self._controllers = {}  # channel_id: (settings key, SlowmodeController)
+        self._settings = {}  # guild_id: snapshot of the guild config, refreshed by config commands
+        self._managed_channels = {}  # guild_id: frozenset of channel ids adaptive slowmode manages right now
         self._slowmode_task = self.bot.loop.create_task(self._run_slowmode_task())
         self._minute_stats = defaultdict(lambda: deque(maxlen=5))  # channel_id: deque of last 5 minute counts
         self._minute_tick = 0  # Used to track when to send the 5-min report
@@ -51,6 +99,35 @@ class AdaptiveSlowmode(commands.Cog):
         if hasattr(self, "_slowmode_task"):
             self._slowmode_task.cancel()
 
+    def _store_settings(self, guild_id: int, conf: dict):
+        self._settings[guild_id] = conf
+        # Disabled guilds manage nothing, so on_message can bail out with one set lookup
+        self._managed_channels[guild_id] = frozenset(conf["channels"]) if conf["enabled"] else frozenset()
+
+    async def _load_all_settings(self):
+        """Snapshot every guild's settings once, so the message path never reads config."""
+        stored = await self.config.all_guilds()
+        for guild in self.bot.guilds:
+            conf = dict(self.DEFAULTS)
+            conf.update(stored.get(guild.id, {}))
+            self._store_settings(guild.id, conf)
+
+    async def _refresh_settings(self, guild: discord.Guild):
+        """Re-read one guild's settings after a config command changed them."""
+        self._store_settings(guild.id, await self.config.guild(guild).all())
+
+    async def _get_settings(self, guild: discord.Guild) -> dict:
+        conf = self._settings.get(guild.id)
+        if conf is None:
+            await self._refresh_settings(guild)
+            conf = self._settings[guild.id]
+        return conf
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self._settings.pop(guild.id, None)
+        self._managed_channels.pop(guild.id, None)
+
     @commands.group()
     @commands.guild_only()
     @checks.admin_or_permissions(manage_guild=True)
@@ -63,6 +140,7 @@ class AdaptiveSlowmode(commands.Cog):
     async def enable(self, ctx):
         """Enable adaptive slowmode for this server."""
         await self.config.guild(ctx.guild).enabled.set(True)
+        await self._refresh_settings(ctx.guild)
         embed = discord.Embed(
             title="Adaptive slowmode",
             description="Adaptive slowmode enabled.",
@@ -75,6 +153,7 @@ class AdaptiveSlowmode(commands.Cog):
     async def disable(self, ctx):
         """Disable adaptive slowmode for this server."""
         await self.config.guild(ctx.guild).enabled.set(False)
+        await self._refresh_settings(ctx.guild)
         embed = discord.Embed(
             title="Adaptive slowmode",
             description="Adaptive slowmode disabled.",
@@ -87,6 +166,7 @@ class AdaptiveSlowmode(commands.Cog):
     async def min(self, ctx, seconds: int):
         """Set minimum slowmode (in seconds)."""
         await self.config.guild(ctx.guild).min_slowmode.set(seconds)
+        await self._refresh_settings(ctx.guild)
         embed = discord.Embed(
             title="Adaptive slowmode",
             description=f"Minimum slowmode set to {seconds} {plural(seconds, 'second')}.",
@@ -99,6 +179,7 @@ class AdaptiveSlowmode(commands.Cog):
     async def max(self, ctx, seconds: int):
         """Set maximum slowmode (in seconds)."""
         await self.config.guild(ctx.guild).max_slowmode.set(seconds)
+        await self._refresh_settings(ctx.guild)
         embed = discord.Embed(
             title="Adaptive slowmode",
             description=f"Maximum slowmode set to {seconds} {plural(seconds, 'second')}.",
@@ -111,6 +192,7 @@ class AdaptiveSlowmode(commands.Cog):
     async def target(self, ctx, msgs_per_min: int):
         """Set target messages per minute for a channel."""
         await self.config.guild(ctx.guild).target_msgs_per_min.set(msgs_per_min)
+        await self._refresh_settings(ctx.guild)
         embed = discord.Embed(
             title="Adaptive slowmode",
             description=f"Target {plural(msgs_per_min, 'message')} per minute set to {msgs_per_min}.",
@@ -118,6 +200,33 @@ class AdaptiveSlowmode(commands.Cog):
         )
         await ctx.send(embed=embed)
 
+    @checks.admin_or_permissions(manage_guild=True)
+    @adaptiveslowmode.command()
+    async def controller(self, ctx, name: str):
+        """
+        Choose how slowmode is adjusted.
+
+        `pi` jumps straight to the delay that meets the target and only edits when it changes.
+        `step` moves slowmode by one second per minute.
+        """
+        name = name.lower()
+        if name not in CONTROLLERS:
+            embed = discord.Embed(
+                title="Adaptive slowmode",
+                description=f"Unknown controller. Choose one of: {', '.join(CONTROLLERS)}.",
+                color=0xff4545
+            )
+            await ctx.send(embed=embed)
+            return
+        await self.config.guild(ctx.guild).controller.set(name)
+        await self._refresh_settings(ctx.guild)
+        embed = discord.Embed(
+            title="Adaptive slowmode",
+            description=f"Slowmode controller set to `{name}`.",
+            color=discord.Color.blue()
+        )
+        await ctx.send(embed=embed)
+
     @checks.admin_or_permissions(manage_guild=True)
     @adaptiveslowmode.command()
     async def add(self, ctx, channel: discord.TextChannel):
@@ -125,6 +234,7 @@ class AdaptiveSlowmode(commands.Cog):
         async with self.config.guild(ctx.guild).channels() as chans:
             if channel.id not in chans:
                 chans.append(channel.id)
+        await self._refresh_settings(ctx.guild)
         embed = discord.Embed(
             title="Adaptive slowmode",
             description=f"{channel.mention} added to dynamic slowmode.",
@@ -139,6 +249,7 @@ class AdaptiveSlowmode(commands.Cog):
         async with self.config.guild(ctx.guild).channels() as chans:
             if channel.id in chans:
                 chans.remove(channel.id)
+        await self._refresh_settings(ctx.guild)
         embed = discord.Embed(
             title="Adaptive slowmode",
             description=f"{channel.mention} removed from dynamic slowmode.",
@@ -169,6 +280,7 @@ class AdaptiveSlowmode(commands.Cog):
         embed.add_field(name="Min slowmode", value=f"{min_slowmode} {plural(min_slowmode, 'second')}", inline=True)
         embed.add_field(name="Max slowmode", value=f"{max_slowmode} {plural(max_slowmode, 'second')}", inline=True)
         embed.add_field(name="Target Messages/Minute", value=str(target_mpm), inline=True)
+        embed.add_field(name="Controller", value=conf["controller"], inline=True)
         embed.add_field(name="Log channel", value=log_channel.mention if log_channel else "None", inline=False)
         embed.add_field(name="Channels", value="\n".join(channels) if channels else "No channels set", inline=False)
 
@@ -183,6 +295,7 @@ class AdaptiveSlowmode(commands.Cog):
         """
         if channel is None:
             await self.config.guild(ctx.guild).log_channel.set(None)
+            await self._refresh_settings(ctx.guild)
             embed = discord.Embed(
                 title="Adaptive slowmode",
                 description="Adaptive slowmode log channel cleared.",
@@ -191,6 +304,7 @@ class AdaptiveSlowmode(commands.Cog):
             await ctx.send(embed=embed)
         else:
             await self.config.guild(ctx.guild).log_channel.set(channel.id)
+            await self._refresh_settings(ctx.guild)
             embed = discord.Embed(
                 title="Adaptive slowmode",
                 description=f"Adaptive slowmode log channel set to {channel.mention}.",
@@ -199,7 +313,7 @@ class AdaptiveSlowmode(commands.Cog):
             await ctx.send(embed=embed)
 
     async def _send_log(self, guild: discord.Guild, embed: discord.Embed, view: discord.ui.View = None):
-        log_channel_id = await self.config.guild(guild).log_channel()
+        log_channel_id = (await self._get_settings(guild))["log_channel"]
         if log_channel_id:
             log_channel = guild.get_channel(log_channel_id)
             if log_channel and log_channel.permissions_for(guild.me).send_messages:
@@ -306,6 +420,7 @@ class AdaptiveSlowmode(commands.Cog):
         async with self.config.guild(ctx.guild).channels() as chans:
             if channel.id not in chans:
                 chans.append(channel.id)
+        await self._refresh_settings(ctx.guild)
 
         survey_result = (
             f"Survey complete for {channel.mention}!\n"
@@ -329,19 +444,15 @@ class AdaptiveSlowmode(commands.Cog):
     async def on_message(self, message: discord.Message):
         if not message.guild or message.author.bot:
             return
-        guild = message.guild
-        conf = await self.config.guild(guild).all()
-        if not conf["enabled"]:
+        # Only channels of enabled guilds are in the managed set, so this is the whole check
+        if message.channel.id not in self._managed_channels.get(message.guild.id, ()):
             return
-        if message.channel.id not in conf["channels"]:
-            return
-        now = datetime.now(timezone.utc)
-        async with self._lock:
-            # Store (timestamp, author_id) for user tracking
-            self._message_cache[message.channel.id].append((now, message.author.id))
+        # Recording is synchronous, so no lock is needed against the slowmode task
+        self._activity[message.channel.id].add(message.author.id)
 
     async def _run_slowmode_task(self):
         await self.bot.wait_until_ready()
+        await self._load_all_settings()
         while True:
             await self.slowmode_task()
             await asyncio.sleep(60)  # Run every minute
@@ -419,44 +530,39 @@ class AdaptiveSlowmode(commands.Cog):
             except Exception as e:
                 await interaction.response.send_message(f"Failed to decrease slowmode: {e}", ephemeral=True)
 
+    def _get_controller(self, channel_id: int, conf: dict):
+        """Return the channel's controller, starting a fresh one whenever its settings change."""
+        key = (conf["controller"], conf["target_msgs_per_min"], conf["min_slowmode"], conf["max_slowmode"])
+        cached = self._controllers.get(channel_id)
+        if cached is None or cached[0] != key:
+            controller_cls = CONTROLLERS.get(conf["controller"], CONTROLLERS["pi"])
+            cached = (key, controller_cls(conf["target_msgs_per_min"], conf["min_slowmode"], conf["max_slowmode"]))
+            self._controllers[channel_id] = cached
+        return cached[1]
+
     async def slowmode_task(self):
         # This runs every minute
-        now = datetime.now(timezone.utc)
         window_seconds = 60
         report_every = 5  # minutes
 
         for guild in self.bot.guilds:
-            conf = await self.config.guild(guild).all()
+            conf = await self._get_settings(guild)
             if not conf["enabled"]:
                 continue
-            min_slow = conf["min_slowmode"]
-            max_slow = conf["max_slowmode"]
-            target_mpm = conf["target_msgs_per_min"]
             for cid in conf["channels"]:
                 channel = guild.get_channel(cid)
                 if not channel or not isinstance(channel, discord.TextChannel):
                     continue
-                async with self._lock:
-                    # Remove messages older than 5 minutes for stats, but only count last minute for slowmode
-                    cache = self._message_cache[cid]
-                    while cache and (now - cache[0][0]).total_seconds() > 300:
-                        cache.popleft()
-                    # Count messages in the last minute
-                    minute_ago = now - timedelta(seconds=window_seconds)
-                    msg_count_minute = sum(1 for t, _ in cache if t > minute_ago)
-                    # Track per-minute stats for reporting
-                    self._minute_stats[cid].append(msg_count_minute)
-                # Calculate new slowmode in 1-second increments
+                # Count messages and authors in the last minute
+                activity = self._activity[cid]
+                msg_count_minute = activity.count(window_seconds)
+                authors_minute = len(activity.authors(window_seconds))
+                # Track per-minute stats for reporting
+                self._minute_stats[cid].append(msg_count_minute)
+                # Let the channel's controller pick the new slowmode
                 current = channel.slowmode_delay
-                if msg_count_minute > target_mpm:
-                    # Too fast, increase slowmode by 1 second
-                    new_slowmode = min(current + 1, max_slow)
-                elif msg_count_minute < (target_mpm // 2):
-                    # Too slow, decrease slowmode by 1 second
-                    new_slowmode = max(current - 1, min_slow)
-                else:
-                    # Within target, keep current
-                    new_slowmode = current
+                controller = self._get_controller(cid, conf)
+                new_slowmode = controller.update(msg_count_minute, authors_minute, current, time.monotonic())
 
                 if new_slowmode != current:
                     try:
@@ -473,7 +579,7 @@ class AdaptiveSlowmode(commands.Cog):
         if self._minute_tick >= report_every:
             self._minute_tick = 0
             for guild in self.bot.guilds:
-                conf = await self.config.guild(guild).all()
+                conf = await self._get_settings(guild)
                 if not conf["enabled"]:
                     continue
                 target_mpm = conf["target_msgs_per_min"]
@@ -490,13 +596,7 @@ class AdaptiveSlowmode(commands.Cog):
                     current = channel.slowmode_delay
 
                     # Collect users seen in the last 5 minutes
-                    async with self._lock:
-                        cache = self._message_cache[cid]
-                        five_min_ago = datetime.now(timezone.utc) - timedelta(minutes=5)
-                        user_ids = set()
-                        for t, uid in cache:
-                            if t > five_min_ago:
-                                user_ids.add(uid)
+                    user_ids = self._activity[cid].authors(300)
                     # Get user objects and mentions
                     user_mentions = []
                     for uid in user_ids:
@@ -0,0 +1,112 @@
+import abc
+import math
+
+
+class SlowmodeController(abc.ABC):
+    """
+    Decides the slowmode delay for one channel from its recent activity.
+
+    `update` is called once per tick with the messages seen in the last minute, the number of
+    distinct authors behind them and the delay currently applied to the channel. It returns the
+    delay that should be applied, which is `current` when nothing needs to change.
+    """
+
+    def __init__(self, target: int, min_delay: int, max_delay: int):
+        self.target = max(1, target)
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+
+    def clamp(self, delay: float) -> int:
+        return int(max(self.min_delay, min(self.max_delay, round(delay))))
+
+    @abc.abstractmethod
+    def update(self, rate: float, authors: int, current: int, now: float) -> int:
+        ...
+
+
+class StepController(SlowmodeController):
+    """The original behaviour: one second up when above target, one second down below half of it."""
+
+    def update(self, rate: float, authors: int, current: int, now: float) -> int:
+        if rate > self.target:
+            return self.clamp(current + 1)
+        if rate < self.target // 2:
+            return self.clamp(current - 1)
+        return current
+
+
+class PIController(SlowmodeController):
+    """
+    EWMA-smoothed, model-based PI controller.
+
+    While slowmode is the limiting factor every author sends at most 60/delay messages a minute,
+    so the channel rate scales with 1/delay and multiplying the delay by rate/target lands on the
+    target in one step; the proportional gain sits a little below 1 to damp noisy minutes. The
+    proportional and integral terms act on log(rate/target) so increases and decreases are
+    symmetric, and from zero the delay jumps to 60 * authors / target, the delay
+    at which the current authors can't exceed the target. Inside the hysteresis band nothing
+    changes, decreases wait at least `min_edit_interval` seconds after the previous edit, and the
+    average restarts after every edit since it was measured under the old delay.
+    """
+
+    def __init__(
+        self,
+        target: int,
+        min_delay: int,
+        max_delay: int,
+        alpha: float = 0.4,
+        kp: float = 0.7,
+        ki: float = 0.1,
+        hysteresis: float = 0.3,
+        min_edit_interval: float = 120,
+    ):
+        super().__init__(target, min_delay, max_delay)
+        self.alpha = alpha
+        self.kp = kp
+        self.ki = ki
+        self.hysteresis = hysteresis
+        self.min_edit_interval = min_edit_interval
+        self.smoothed = None
+        self.integral = 0.0
+        self.last_edit = None
+
+    def update(self, rate: float, authors: int, current: int, now: float) -> int:
+        if self.smoothed is None or rate > self.smoothed * 2:
+            # First sample, or a burst: don't let the average lag behind it
+            self.smoothed = float(rate)
+        else:
+            self.smoothed = self.alpha * rate + (1 - self.alpha) * self.smoothed
+
+        ratio = max(self.smoothed, 0.5) / self.target
+        if abs(ratio - 1) <= self.hysteresis:
+            self.integral = 0.0
+            return self.clamp(current)
+        if ratio < 1 and current <= self.min_delay:
+            self.integral = 0.0
+            return self.clamp(current)
+
+        error = math.log(ratio)
+        self.integral = max(-2.0, min(2.0, self.integral + error))
+        if current > 0:
+            desired = current * math.exp(self.kp * error + self.ki * self.integral)
+        elif ratio > 1:
+            desired = 60 * max(authors, 1) / self.target
+        else:
+            desired = current
+        new = self.clamp(desired)
+
+        if new == current:
+            return current
+        if new < current and self.last_edit is not None and now - self.last_edit < self.min_edit_interval:
+            return current
+        self.last_edit = now
+        # Rates measured under the old delay say nothing about the new one
+        self.smoothed = None
+        self.integral = 0.0
+        return new
+
+
+CONTROLLERS = {
+    "pi": PIController,
+    "step": StepController,
+}
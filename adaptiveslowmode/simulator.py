@@ -0,0 +1,129 @@
+"""Offline simulator for the slowmode controllers.
+
+Run from the repository root with ``python adaptiveslowmode/simulator.py``.
+It replays synthetic traffic curves against each controller, one tick per
+minute like the cog's task, and reports convergence time, overshoot and the
+number of ``channel.edit`` calls. Not loaded by Red.
+"""
+import random
+
+from controller import CONTROLLERS
+
+TARGET = 20
+MIN_DELAY = 0
+MAX_DELAY = 120
+MSGS_PER_AUTHOR = 6  # Unthrottled messages per minute from one active author
+
+
+def burst(minute):
+    """Quiet channel, a 30 minute burst at 10x the target, then quiet again."""
+    return 200 if 10 <= minute < 40 else 10
+
+
+def ramp(minute):
+    """Activity climbs steadily to 8x the target and falls back."""
+    if minute < 30:
+        return 10 + minute * 5
+    return max(10, 160 - (minute - 30) * 5)
+
+
+def spikes(minute):
+    """Short spikes every 15 minutes on top of near-target traffic."""
+    return 120 if minute % 15 in (5, 6) else 18
+
+
+CURVES = {
+    "burst": (burst, 60),
+    "ramp": (ramp, 70),
+    "spikes": (spikes, 60),
+}
+
+
+def observed_rate(demand, delay, rng):
+    """Messages seen in a minute when `demand` messages/min are wanted under `delay` seconds of slowmode."""
+    authors = max(1, round(demand / MSGS_PER_AUTHOR))
+    per_author = demand / authors
+    if delay > 0:
+        per_author = min(per_author, 60 / delay)
+    rate = authors * per_author
+    return max(0, round(rng.gauss(rate, rate ** 0.5))), authors
+
+
+def ideal_delay(demand):
+    """Smallest delay that keeps `demand` at or under the target, 0 when it already is."""
+    if demand <= TARGET:
+        return 0
+    authors = max(1, round(demand / MSGS_PER_AUTHOR))
+    return min(MAX_DELAY, 60 * authors / TARGET)
+
+
+def simulate(controller_name, curve, minutes, seed=0):
+    rng = random.Random(seed)
+    controller = CONTROLLERS[controller_name](TARGET, MIN_DELAY, MAX_DELAY)
+    delay = 0
+    rates = []
+    delays = []
+    edits = 0
+    for minute in range(minutes):
+        rate, authors = observed_rate(curve(minute), delay, rng)
+        rates.append(rate)
+        delays.append(delay)
+        new = controller.update(rate, authors, delay, minute * 60)
+        if new != delay:
+            edits += 1
+            delay = new
+    return rates, delays, edits
+
+
+def convergence_minutes(rates, band=0.3):
+    """Longest run of consecutive minutes with the rate more than `band` above the target."""
+    longest = current = 0
+    for rate in rates:
+        current = current + 1 if rate > TARGET * (1 + band) else 0
+        longest = max(longest, current)
+    return longest
+
+
+def overshoot(curve, delays):
+    """Worst relative excess of the applied delay over the ideal one while traffic is above target."""
+    worst = 0.0
+    for minute, delay in enumerate(delays):
+        ideal = ideal_delay(curve(minute))
+        if ideal:
+            worst = max(worst, delay / ideal - 1)
+    return worst
+
+
+def report(controller_name, curve_name):
+    curve, minutes = CURVES[curve_name]
+    rates, delays, edits = simulate(controller_name, curve, minutes)
+    over_target = [rate for rate in rates if rate > TARGET]
+    return {
+        "controller": controller_name,
+        "curve": curve_name,
+        "edits": edits,
+        "minutes_over_target": len(over_target),
+        "excess_messages": sum(rate - TARGET for rate in over_target),
+        "convergence": convergence_minutes(rates),
+        "overshoot": overshoot(curve, delays),
+        "peak_delay": max(delays),
+    }
+
+
+def main():
+    print(f"Target {TARGET} msgs/min, slowmode {MIN_DELAY}-{MAX_DELAY}s, one tick per minute")
+    print(
+        f"{'curve':<8}{'controller':<12}{'edits':>6}{'min>target':>12}{'excess msgs':>13}"
+        f"{'converge(min)':>15}{'overshoot':>11}{'peak':>6}"
+    )
+    for curve_name in CURVES:
+        for controller_name in CONTROLLERS:
+            row = report(controller_name, curve_name)
+            print(
+                f"{row['curve']:<8}{row['controller']:<12}{row['edits']:>6}{row['minutes_over_target']:>12}"
+                f"{row['excess_messages']:>13}{row['convergence']:>15}{row['overshoot']:>10.0%}{row['peak_delay']:>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Offline benchmark for the InfoControl detection pipeline.
+
+Run from the repository root with ``python infocontrol/benchmark.py``. It
+reports scan throughput for the legacy per-pattern loop and the compiled
+scanner, then precision/recall per pattern for the combined scanner the cog
+runs, with and without the validation stage, against the labelled corpus
+below. Not loaded by Red.
+"""
+import re
+import time
+
+from detection import DEFAULT_PATTERNS, STRIP_PATTERN, PatternScanner
+
+# (message, set of pattern keys that should fire on it)
+CORPUS = [
+    # Harmless chatter that the bare patterns tend to trip on
+    ("hey everyone, how's it going?", set()),
+    ("I have 3 apples and 2 oranges left", set()),
+    ("we need 12 more people for the raid tonight", set()),
+    ("the score was 1024 to 768 in the final round", set()),
+    ("ANYTHING IMPORTANT happening THIS WEEKEND", set()),
+    ("ABSOLUTELY WONDERFUL stream today", set()),
+    ("my router is at 192.168.1.1 if you want to test locally", set()),
+    ("localhost is 127.0.0.1, try that", set()),
+    ("the docs use 10.0.0.5 in the example", set()),
+    ("order number 1234 5678 9012 3456 shipped", set()),
+    ("build id 4000 1234 5678 9011 failed", set()),
+    ("tracking 1234567890123 arrives tuesday", set()),
+    ("version 2 1 0 3 4 5 6 7 8 9 1 2 3 released", set()),
+    ("fake ssn 000-12-3456 from the tutorial", set()),
+    ("example 666-12-3456 is never issued", set()),
+    ("room 900-55-1234 in the building map", set()),
+    ("DE00123456789012345678 is a made up code", set()),
+    ("NOTAREALCODE1234567 for the giveaway", set()),
+    ("it took 5 minutes to load the game", set()),
+    ("level 42 boss has 3 phases", set()),
+    ("the year 2024 was wild", set()),
+    ("PASSWORDS should be long", set()),
+    ("HOMEWORK due FRIDAY", set()),
+    ("just joined <@123456789012345678> in <#234567890123456789>", set()),
+    ("check [this](https://example.com/123-45-6789) out", set()),
+    ("https://example.com/user/4111111111111111 is the link", set()),
+    ("loopback ::1 and fe80:0:0:0:0:0:0:1 are local", set()),
+    # Real sensitive data
+    ("email me at jane.doe@example.com", {"email"}),
+    ("my ssn is 123-45-6789", {"ssn", "ssn_alternative"}),
+    ("ssn 219 09 9999 please keep it secret", {"ssn_alternative"}),
+    ("card 4111 1111 1111 1111 exp 12/26", {"bankcard", "creditcard"}),
+    ("pay with 5500-0000-0000-0004", {"creditcard"}),
+    ("amex 378282246310005", {"creditcard"}),
+    ("call me at 555-867-5309", {"phone"}),
+    ("order 12 555-867-5309 thanks", {"phone"}),
+    ("call me 999 555-867-5309", {"phone"}),
+    ("text 5558675309 anytime", {"phone", "phone_no_spaces"}),
+    ("office (555) 867-5309", {"phone_alternative"}),
+    ("my ip is 8.8.4.4 lol", {"ipv4"}),
+    ("server at 2001:4860:4860:0:0:0:0:8888", {"ipv6"}),
+    ("transfer to GB82WEST12345698765432", {"iban"}),
+    ("iban DE89370400440532013000", {"iban"}),
+    ("mac 00:1A:2B:3C:4D:5E on the lan", {"mac_address"}),
+    ("send btc to 1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa", {"bitcoin_address"}),
+    ("license CA-12345678", {"drivers_license"}),
+    ("vin 1HGCM82633A004352", {"vin"}),
+    ("zip 90210-1234", {"zip_code"}),
+    ("I live at 1600 Pennsylvania Avenue", {"street_address"}),
+    ("come to 221 Baker Street tonight", {"street_address"}),
+    ("born 04/12/1990", {"birthdate"}),
+    ("national id AB1234567", {"national_id"}),
+    ("my id AB1234567 here", {"national_id"}),
+    ("AB12CDEFG", {"national_id"}),
+    ("ein 12-3456789", {"tax_id"}),
+    ("student 2023AB45 here", {"student_id"}),
+]
+
+LEGACY_PREPROCESS = [
+    r'<@!?[0-9]+>',
+    r'<#[0-9]+>',
+    r'\[.*?\]\(.*?\)',
+    r'https?://\S+',
+    r'\b\d{17,19}\b',
+]
+
+
+def legacy_detect(content):
+    """The per-message path before the compiled scanner, kept for comparison."""
+    for pattern in LEGACY_PREPROCESS:
+        content = re.sub(pattern, '', content)
+    for key, pattern in DEFAULT_PATTERNS.items():
+        if re.search(pattern, content):
+            return key
+    return None
+
+
+def throughput(detect, rounds):
+    messages = [message for message, _ in CORPUS]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for message in messages:
+            detect(message)
+    elapsed = time.perf_counter() - start
+    return len(messages) * rounds / elapsed
+
+
+def precision_recall(validate):
+    """Score the combined scanner the cog runs, which reports one pattern per message.
+
+    A hit counts for the pattern the scanner returned: a true positive if the
+    message was labelled with it, otherwise a false positive. A labelled
+    message that isn't matched under one of its labels is a false negative for
+    each of them. Returns the per-pattern rows and the labelled messages that
+    weren't caught at all.
+    """
+    scanner = PatternScanner(DEFAULT_PATTERNS, validate=validate)
+    counts = {key: [0, 0, 0] for key in DEFAULT_PATTERNS}  # {key: [tp, fp, fn]}
+    missed = []
+    for message, expected in CORPUS:
+        key = scanner.search(STRIP_PATTERN.sub('', message))
+        if key is not None and key in expected:
+            counts[key][0] += 1
+            continue
+        if key is not None:
+            counts[key][1] += 1
+        for expected_key in expected:
+            counts[expected_key][2] += 1
+        if expected and key is None:
+            missed.append(message)
+    rows = []
+    for key, (tp, fp, fn) in counts.items():
+        precision = tp / (tp + fp) if tp + fp else 1.0
+        recall = tp / (tp + fn) if tp + fn else 1.0
+        rows.append((key, tp, fp, fn, precision, recall))
+    return rows, missed
+
+
+def main(rounds=200):
+    unvalidated = PatternScanner(DEFAULT_PATTERNS, validate=False)
+    validated = PatternScanner(DEFAULT_PATTERNS)
+    print(f"Corpus: {len(CORPUS)} messages, {rounds} rounds")
+    print(f"  legacy loop                {throughput(legacy_detect, rounds):>10.0f} msg/s")
+    print(f"  scanner without validation {throughput(lambda m: unvalidated.search(STRIP_PATTERN.sub('', m)), rounds):>10.0f} msg/s")
+    print(f"  scanner with validation    {throughput(lambda m: validated.search(STRIP_PATTERN.sub('', m)), rounds):>10.0f} msg/s")
+
+    for validate in (False, True):
+        rows, missed = precision_recall(validate)
+        total_fp = sum(row[2] for row in rows)
+        labelled = sum(1 for _, expected in CORPUS if expected)
+        print()
+        print(
+            f"{'With' if validate else 'Without'} validation ({total_fp} false positives, "
+            f"{labelled - len(missed)}/{labelled} sensitive messages caught)"
+        )
+        print(f"  {'pattern':<18}{'tp':>4}{'fp':>4}{'fn':>4}{'precision':>11}{'recall':>8}")
+        for key, tp, fp, fn, precision, recall in rows:
+            print(f"  {key:<18}{tp:>4}{fp:>4}{fn:>4}{precision:>11.2f}{recall:>8.2f}")
+        for message in missed:
+            print(f"  missed: {message!r}")
+
+
+if __name__ == "__main__":
+    main()
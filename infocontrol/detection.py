@@ -0,0 +1,185 @@
+import ipaddress
+import re
+
+try:
+    import re2 # Optional linear-time multi-pattern engine
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+DEFAULT_PATTERNS = {
+    "email": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b",
+    "ssn": r"\b\d{3}-\d{2}-\d{4}\b",
+    "bankcard": r"\b\d{4} \d{4} \d{4} \d{4}\b",
+    "phone": r"\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b",
+    "phone_no_spaces": r"\b\d{10}\b",
+    "ipv4": r"\b((25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\b",
+    "ipv6": r"\b([0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}\b",
+    "creditcard": r"\b(?:\d[ -]?){13,19}\b",
+    "passport": r"\b[A-PR-WYa-pr-wy][1-9]\d\s?\d{4}[1-9]\b",
+    "iban": r"\b[A-Z]{2}\d{2}[A-Z0-9]{1,30}\b",
+    "mac_address": r"\b([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})\b",
+    "bitcoin_address": r"\b[13][a-km-zA-HJ-NP-Z1-9]{25,34}\b",
+    "drivers_license": r"\b[A-Z]{2}-\d{1,14}\b",
+    "vin": r"\b[A-HJ-NPR-Z0-9]{17}\b",
+    "ssn_alternative": r"\b\d{3}[-\s]?\d{2}[-\s]?\d{4}\b",
+    "phone_alternative": r"\(\d{3}\)\s?\d{3}[-.\s]?\d{4}\b",
+    "zip_code": r"\b\d{5}(?:[-\s]\d{4})?\b",
+    "street_address": r"\b\d{1,5}\s(?:[A-Za-z0-9#]+\s?){1,5}\b",
+    "birthdate": r"\b\d{2}/\d{2}/\d{4}\b",
+    "national_id": r"\b[A-Z0-9]{9}\b",
+    "tax_id": r"\b\d{2}-\d{7}\b",
+    "student_id": r"\b[A-Z0-9]{8}\b"
+}
+
+# Everything that should be ignored before scanning, removed in a single pass.
+# Hyperlinks come before bare URLs so the whole markdown link is stripped.
+STRIP_PATTERN = re.compile(
+    r"\[.*?\]\(.*?\)"  # Hyperlinks
+    r"|https?://\S+"  # URLs
+    r"|<@!?[0-9]+>"  # User mentions
+    r"|<#[0-9]+>"  # Channel mentions
+    r"|\b\d{17,19}\b"  # Discord user ID's, message ID's, and channel ID's
+)
+
+STREET_SUFFIXES = frozenset({
+    "street", "st", "avenue", "ave", "road", "rd", "boulevard", "blvd", "lane", "ln",
+    "drive", "dr", "court", "ct", "way", "place", "pl", "terrace", "ter", "circle", "cir",
+    "highway", "hwy", "parkway", "pkwy", "square", "sq", "trail", "trl", "apt", "suite", "ste",
+})
+
+
+def luhn_valid(text):
+    """Card numbers must pass the Luhn checksum."""
+    digits = [int(c) for c in text if c.isdigit()]
+    if not 13 <= len(digits) <= 19:
+        return False
+    total = 0
+    for index, digit in enumerate(reversed(digits)):
+        if index % 2 == 1:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return total % 10 == 0
+
+
+def iban_valid(text):
+    """IBANs must have a plausible length and pass the ISO 13616 mod-97 check."""
+    iban = text.replace(" ", "").upper()
+    if not 15 <= len(iban) <= 34:
+        return False
+    rearranged = iban[4:] + iban[:4]
+    try:
+        return int("".join(str(int(c, 36)) for c in rearranged)) % 97 == 1
+    except ValueError:
+        return False
+
+
+def ssn_valid(text):
+    """SSNs never use area 000, 666 or 900-999, group 00, or serial 0000."""
+    digits = "".join(c for c in text if c.isdigit())
+    if len(digits) != 9:
+        return False
+    area, group, serial = int(digits[:3]), int(digits[3:5]), int(digits[5:])
+    return area not in (0, 666) and area < 900 and group != 0 and serial != 0
+
+
+def ip_is_public(text):
+    """Private, loopback, link-local, reserved and other bogon addresses don't identify anyone."""
+    try:
+        return ipaddress.ip_address(text).is_global
+    except ValueError:
+        return False
+
+
+def has_letters_and_digits(text):
+    """Identifier-shaped matches need both, otherwise plain words and numbers would match."""
+    return any(c.isdigit() for c in text) and any(c.isalpha() for c in text)
+
+
+def has_street_suffix(text):
+    """A number followed by words is only an address if one of the words is a street type."""
+    return any(word.strip("#.,").lower() in STREET_SUFFIXES for word in text.split()[1:])
+
+
+# Post-match checks run before a message is deleted. Patterns without an entry are trusted as-is.
+VALIDATORS = {
+    "bankcard": luhn_valid,
+    "creditcard": luhn_valid,
+    "iban": iban_valid,
+    "ssn": ssn_valid,
+    "ssn_alternative": ssn_valid,
+    "ipv4": ip_is_public,
+    "ipv6": ip_is_public,
+    "national_id": has_letters_and_digits,
+    "student_id": has_letters_and_digits,
+    "street_address": has_street_suffix,
+}
+
+
+class PatternScanner:
+    """Scan text for any of a set of named patterns in one pass.
+
+    The patterns are combined into a single alternation of named groups so the
+    match tells us which category it belongs to. If the combined expression
+    can't be compiled (e.g. a custom pattern reuses a group name) each pattern
+    is compiled on its own and tried in order instead. When a match fails its
+    category's validator, the alternatives after it are tried at the same
+    position, since the alternation only reports the first one that matched
+    there, and scanning then resumes one character on.
+    """
+
+    def __init__(self, patterns, validate=True):
+        self.keys = list(patterns.keys())
+        self.validators = VALIDATORS if validate else {}
+        self.combined = None
+        self.individual = {}  # {key: compiled pattern}, in the same order as the alternation
+        for key, pattern in patterns.items():
+            try:
+                self.individual[key] = re.compile(pattern)
+            except re.error:
+                continue
+        if not patterns:
+            return
+        combined = "|".join(f"(?P<{key}>{pattern})" for key, pattern in patterns.items())
+        if RE2_AVAILABLE:
+            try:
+                self.combined = re2.compile(combined)
+                return
+            except Exception:
+                pass
+        try:
+            self.combined = re.compile(combined)
+        except re.error:
+            pass
+
+    def _is_valid(self, key, text):
+        validator = self.validators.get(key)
+        return validator is None or validator(text)
+
+    def search(self, content):
+        """Return the key of the first valid pattern match in `content`, or None."""
+        if self.combined is not None:
+            pos = 0
+            while pos <= len(content):
+                match = self.combined.search(content, pos)
+                if match is None:
+                    return None
+                key = next(key for key in self.keys if match.group(key) is not None)
+                if self._is_valid(key, match.group(0)):
+                    return key
+                start = match.start()
+                for later in self.keys[self.keys.index(key) + 1:]:
+                    pattern = self.individual.get(later)
+                    retry = pattern.match(content, start) if pattern is not None else None
+                    if retry is not None and self._is_valid(later, retry.group(0)):
+                        return later
+                # Nothing valid starts here, but a real match can still start inside the rejected span
+                pos = start + 1
+            return None
+        for key, pattern in self.individual.items():
+            for match in pattern.finditer(content):
+                if self._is_valid(key, match.group(0)):
+                    return key
+        return None
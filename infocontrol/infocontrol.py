@@ -1,12 +1,13 @@
-import re
 import discord #type: ignore
 import asyncio
 from redbot.core import commands, Config #type: ignore
 
+from .detection import DEFAULT_PATTERNS, STRIP_PATTERN, PatternScanner
+
 class InfoControl(commands.Cog):
     """Detect and remove potentially sensitive information from chat."""
     
-    __version__ = "1.0.8"
+    __version__ = "1.2.0"
 
     def __init__(self, bot):
         self.bot = bot
@@ -15,62 +16,44 @@ class InfoControl(commands.Cog):
             "enabled": False,
             "log_channel": None,
             "moderator_roles": [],
-            "patterns": {
-                "email": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b",
-                "ssn": r"\b\d{3}-\d{2}-\d{4}\b",
-                "bankcard": r"\b\d{4} \d{4} \d{4} \d{4}\b",
-                "phone": r"\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b",
-                "phone_no_spaces": r"\b\d{10}\b",
-                "ipv4": r"\b((25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\b",
-                "ipv6": r"\b([0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}\b",
-                "creditcard": r"\b(?:\d[ -]?){13,19}\b",
-                "passport": r"\b[A-PR-WYa-pr-wy][1-9]\d\s?\d{4}[1-9]\b",
-                "iban": r"\b[A-Z]{2}\d{2}[A-Z0-9]{1,30}\b",
-                "mac_address": r"\b([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})\b",
-                "bitcoin_address": r"\b[13][a-km-zA-HJ-NP-Z1-9]{25,34}\b",
-                "drivers_license": r"\b[A-Z]{2}-\d{1,14}\b",
-                "vin": r"\b[A-HJ-NPR-Z0-9]{17}\b",
-                "ssn_alternative": r"\b\d{3}[-\s]?\d{2}[-\s]?\d{4}\b",
-                "phone_alternative": r"\b\(\d{3}\)\s?\d{3}[-.\s]?\d{4}\b",
-                "zip_code": r"\b\d{5}(?:[-\s]\d{4})?\b",
-                "street_address": r"\b\d{1,5}\s(?:[A-Za-z0-9#]+\s?){1,5}\b",
-                "birthdate": r"\b\d{2}/\d{2}/\d{4}\b",
-                "national_id": r"\b[A-Z0-9]{9}\b",
-                "tax_id": r"\b\d{2}-\d{7}\b",
-                "student_id": r"\b[A-Z0-9]{8}\b"
-            }
+            "patterns": dict(DEFAULT_PATTERNS)
         }
         self.default_guild.update({f"block_{key}": True for key in self.default_guild["patterns"].keys()})
         self.config.register_guild(**self.default_guild)
+        self._guild_cache = {}  # {guild_id: (guild_config, PatternScanner)}, dropped when settings change
+
+    async def _get_guild_state(self, guild):
+        """Return the guild config and its compiled scanner, building them on first use."""
+        state = self._guild_cache.get(guild.id)
+        if state is None:
+            guild_config = await self.config.guild(guild).all()
+            enabled_patterns = {
+                key: pattern
+                for key, pattern in guild_config["patterns"].items()
+                if guild_config.get(f"block_{key}", False)
+            }
+            state = (guild_config, PatternScanner(enabled_patterns))
+            self._guild_cache[guild.id] = state
+        return state
+
+    def _invalidate(self, guild):
+        self._guild_cache.pop(guild.id, None)
 
     @commands.Cog.listener()
     async def on_message_without_command(self, message):
         if message.author.bot or not message.guild:
             return
 
-        guild_config = await self.config.guild(message.guild).all()
+        guild_config, scanner = await self._get_guild_state(message.guild)
         if not guild_config["enabled"]:
             return
 
-        # Remove user and channel mentions from the message content
-        content = re.sub(r'<@!?[0-9]+>', '', message.content)  # User mentions
-        content = re.sub(r'<#[0-9]+>', '', content)  # Channel mentions
-
-        # Ignore content inside hyperlinks and URLs
-        def remove_hyperlinks_and_urls(text):
-            text = re.sub(r'\[.*?\]\(.*?\)', '', text)  # Hyperlinks
-            text = re.sub(r'https?://\S+', '', text)  # URLs
-            return text
-
-        content = remove_hyperlinks_and_urls(content)
-
-        # Ignore discord user ID's, message ID's, and channel ID's
-        content = re.sub(r'\b\d{17,19}\b', '', content)  # Discord ID's
+        # Remove mentions, hyperlinks, URLs and Discord ID's from the message content
+        content = STRIP_PATTERN.sub('', message.content)
 
-        for key, pattern in guild_config["patterns"].items():
-            if guild_config.get(f"block_{key}", False) and re.search(pattern, content):
-                await self.handle_message_deletion(message, key, guild_config)
-                break
+        key = scanner.search(content)
+        if key is not None:
+            await self.handle_message_deletion(message, key, guild_config)
 
     async def handle_message_deletion(self, message, key, guild_config):
         try:
@@ -126,6 +109,7 @@ class InfoControl(commands.Cog):
     async def enable(self, ctx):
         """Enable info enforcement"""
         await self.config.guild(ctx.guild).enabled.set(True)
+        self._invalidate(ctx.guild)
         await ctx.send("Info enforcement is now enabled.")
 
     @commands.admin_or_permissions()
@@ -133,6 +117,7 @@ class InfoControl(commands.Cog):
     async def disable(self, ctx):
         """Disable info enforcement"""
         await self.config.guild(ctx.guild).enabled.set(False)
+        self._invalidate(ctx.guild)
         await ctx.send("Info enforcement is now disabled.")
 
     @commands.admin_or_permissions()
@@ -151,6 +136,7 @@ class InfoControl(commands.Cog):
 
         current = await self.config.guild(ctx.guild).get_raw(f"block_{data_type}")
         await self.config.guild(ctx.guild).set_raw(f"block_{data_type}", value=not current)
+        self._invalidate(ctx.guild)
         status = "enabled" if not current else "disabled"
         embed = discord.Embed(
             title="Blocking toggled",
@@ -164,6 +150,7 @@ class InfoControl(commands.Cog):
     async def alerts(self, ctx, channel: discord.TextChannel):
         """Set the log channel for info control deletions."""
         await self.config.guild(ctx.guild).log_channel.set(channel.id)
+        self._invalidate(ctx.guild)
         await ctx.send(f"Log channel set to {channel.mention}.")
 
     @commands.admin_or_permissions()
@@ -176,6 +163,7 @@ class InfoControl(commands.Cog):
                 await ctx.send(f"Role {role.mention} added to the list of roles to mention in alerts.")
             else:
                 await ctx.send(f"Role {role.mention} is already in the list of roles to mention in alerts.")
+        self._invalidate(ctx.guild)
 
     @commands.admin_or_permissions()
     @infocontrol.command()
@@ -187,6 +175,7 @@ class InfoControl(commands.Cog):
                 await ctx.send(f"Role {role.mention} removed from the list of roles to mention in alerts.")
             else:
                 await ctx.send(f"Role {role.mention} is not in the list of roles to mention in alerts.")
+        self._invalidate(ctx.guild)
 
     @infocontrol.command()
     async def settings(self, ctx):
@@ -274,5 +263,6 @@ class InfoControl(commands.Cog):
     async def reset(self, ctx):
         """Reset the info control settings to default for this guild."""
         await self.config.guild(ctx.guild).set(self.default_guild)
+        self._invalidate(ctx.guild)
         await ctx.send("Info control settings have been reset to default.")
 
@@ -1,7 +1,19 @@
+import asyncio
 import discord
+from discord.ext import tasks  # type: ignore
 from redbot.core import commands, Config  # type: ignore
 import re
 import datetime  # Added for timedelta
+from collections import defaultdict
+
+# Catches variations like ".gg/server" and captures the code part for fetch_invite.
+# The optional scheme/www prefix is part of the match so group(0) is the full URL for logging.
+INVITE_PATTERN = re.compile(
+    r"(?:https?://)?(?:www\.)?"
+    r"(?:discord\.(?:gg|io|me|li)|discordapp\.com/invite|dsc\.gg|invite\.gg)"
+    r"/(?P<code>[a-zA-Z0-9\-]+)",
+    re.IGNORECASE,
+)
 
 class InviteFilter(commands.Cog):
     """A cog to detect and remove Discord server invites from chat."""
@@ -10,6 +22,15 @@ class InviteFilter(commands.Cog):
         self.bot = bot
         self.config = Config.get_conf(self, identifier=22222222222)
         self._register_config()
+        self._own_invite_codes = {}  # {guild_id: set of invite codes belonging to that guild}
+        self._settings_cache = {}  # {guild_id: settings snapshot}, rebuilt lazily after any config change
+        self._pending_counters = defaultdict(int)  # {(guild_id, counter): amount not yet written to config}, guild_id None for global counters
+        self._flush_lock = asyncio.Lock()  # The loop, `stats` and unload all flush; each write reads the stored value first
+        self.flush_counters_loop.start()
+
+    async def cog_unload(self):
+        self.flush_counters_loop.cancel()
+        await self._flush_counters()
 
     def _register_config(self):
         """Register configuration defaults."""
@@ -35,188 +56,271 @@ class InviteFilter(commands.Cog):
         if message.author.bot or not message.guild:
             return
 
+        # Cheapest check first, most messages don't contain an invite at all
+        invites = self.find_invites(message.content)
+        if not invites:
+            return
+
         guild = message.guild
         member = message.author  # Use member object for timeout
+        settings = await self._get_settings(guild)
 
         # Check if filtering is enabled
-        if not await self.config.guild(guild).delete_invites():
+        if not settings["delete_invites"]:
             return
 
         # Check channel whitelist
-        whitelisted_channels = await self.config.guild(guild).whitelisted_channels()
-        if message.channel.id in whitelisted_channels:
+        if message.channel.id in settings["whitelisted_channels"]:
             return
 
         # Check category whitelist
-        whitelisted_categories = await self.config.guild(guild).whitelisted_categories()
-        if message.channel.category_id and message.channel.category_id in whitelisted_categories:
+        if message.channel.category_id and message.channel.category_id in settings["whitelisted_categories"]:
             return
 
         # Check user whitelist
-        whitelisted_users = await self.config.guild(guild).whitelisted_users()
-        if member.id in whitelisted_users:
+        if member.id in settings["whitelisted_users"]:
             return
 
         # Check role whitelist (ensure member object is used)
         if isinstance(member, discord.Member):  # Ensure it's a member object before checking roles
-            whitelisted_roles = await self.config.guild(guild).whitelisted_roles()
             # Use member.roles directly
-            if any(role.id in whitelisted_roles for role in member.roles):
+            if any(role.id in settings["whitelisted_roles"] for role in member.roles):
                 return
         else:
             # This case should ideally not happen in guilds, but safety check
             return
 
-        # Enhanced invite pattern to catch variations like ".gg/server"
-        # Regex needs to capture the code part for fetch_invite if the full URL isn't present
-        # Using a more robust regex to capture various forms and extract the code
-        invite_pattern = r"(?:discord\.(?:gg|io|me|li)|discordapp\.com/invite|dsc\.gg|invite\.gg)[/](?P<code>[a-zA-Z0-9\-]+)"
-        full_url_pattern = r"(?:https?://)?(?:www\.)?" + invite_pattern  # For logging the full match
-
-        match = re.search(invite_pattern, message.content, re.IGNORECASE)
-        full_match = re.search(full_url_pattern, message.content, re.IGNORECASE)
-
-        if match:
-            invite_code = match.group("code")
-            log_invite_url = full_match.group(0) if full_match else f"discord.gg/{invite_code}"  # Log the matched URL or construct one
-
-            actions_taken = []
-            log_fields = {}
-            invite_info = None  # Store invite info for logging
+        own_codes = await self._get_own_invite_codes(guild)
+        vanity_code = (guild.vanity_url_code or "").lower()
+
+        # Walk every invite in the message; the first one that doesn't belong to this server triggers action
+        foreign_invites = []
+        invite_code = None
+        invite_info = None  # Store invite info for logging
+        log_fields = {}
+        for url, code in invites:
+            if code in own_codes or (vanity_code and code.lower() == vanity_code):
+                continue
+            if invite_code is not None:
+                # Already have a confirmed foreign invite, the rest only need to be listed in the log
+                foreign_invites.append(url)
+                continue
 
             # Fetch invite details first (if possible) to log them even if deletion/timeout fails
-            is_own_guild_invite = False
+            fields = {}
+            info = None
             try:
-                # Use the extracted code which is more reliable for fetch_invite
-                invite_info = await self.bot.fetch_invite(invite_code)
-                log_fields["Server name"] = invite_info.guild.name if getattr(invite_info, "guild", None) else "Unknown (Group DM or Deleted Server)"
-                log_fields["Server ID"] = invite_info.guild.id if getattr(invite_info, "guild", None) else "N/A"
-                log_fields["Member count"] = getattr(invite_info, 'approximate_member_count', 'N/A')  # Use getattr for safety
-                log_fields["Online now"] = getattr(invite_info, 'approximate_presence_count', 'N/A')
-                # Ignore invites that belong to the current server
-                if getattr(invite_info, "guild", None) and invite_info.guild.id == guild.id:
-                    is_own_guild_invite = True
+                info = await self.bot.fetch_invite(code)
+                # Ignore invites that belong to the current server, and remember them for next time
+                if getattr(info, "guild", None) and info.guild.id == guild.id:
+                    own_codes.add(code)
+                    continue
+                fields["Server name"] = info.guild.name if getattr(info, "guild", None) else "Unknown (Group DM or Deleted Server)"
+                fields["Server ID"] = info.guild.id if getattr(info, "guild", None) else "N/A"
+                fields["Member count"] = getattr(info, 'approximate_member_count', 'N/A')  # Use getattr for safety
+                fields["Online now"] = getattr(info, 'approximate_presence_count', 'N/A')
             except discord.NotFound:
-                log_fields["Invite Status"] = "Invalid or Expired"
+                fields["Invite Status"] = "Invalid or Expired"
             except discord.HTTPException as e:
-                log_fields["Invite Fetch Error"] = f"HTTP Error: {getattr(e, 'status', 'Unknown')}"
+                fields["Invite Fetch Error"] = f"HTTP Error: {getattr(e, 'status', 'Unknown')}"
             # No except discord.Forbidden here, handle below for specific actions
 
-            # If the invite is for this server, ignore it
-            if is_own_guild_invite:
-                return
+            invite_code = code
+            invite_info = info
+            log_fields = fields
+            foreign_invites.append(url)
 
-            # --- Action: Delete Message ---
-            try:
-                await message.delete()
-                actions_taken.append("Message deleted")
-                # Increment counters only on successful deletion
-                current_guild_deleted = await self.config.guild(guild).invites_deleted()
-                await self.config.guild(guild).invites_deleted.set(current_guild_deleted + 1)
-                current_total_deleted = await self.config.total_invites_deleted()
-                await self.config.total_invites_deleted.set(current_total_deleted + 1)
-            except discord.Forbidden:
-                actions_taken.append("Deletion failed (Missing Permissions)")
-            except discord.NotFound:
-                actions_taken.append("Deletion failed (Message already deleted)")
-            except discord.HTTPException as e:
-                actions_taken.append(f"Deletion failed (HTTP Error: {getattr(e, 'status', 'Unknown')})")
-
-            # --- Action: Timeout User ---
-            timeout_duration_minutes = await self.config.guild(guild).timeout_duration()
-            if timeout_duration_minutes > 0 and isinstance(member, discord.Member):  # Check if timeout is enabled and we have a member object
-                # Ensure the bot has permissions higher than the target user
-                if guild.me and guild.me.top_role > member.top_role:
-                    try:
-                        # Check if the user is already timed out
-                        # member.timed_out_until is a datetime.datetime or None
-                        now_utc = datetime.datetime.now(datetime.timezone.utc)
-                        timed_out_until = getattr(member, "timed_out_until", None)
-                        if timed_out_until and timed_out_until > now_utc:
-                            # User is already timed out, so extend the timeout by the additional duration
-                            new_timeout_until = timed_out_until + datetime.timedelta(minutes=timeout_duration_minutes)
-                            # Discord's max timeout is 28 days from now
-                            max_timeout_until = now_utc + datetime.timedelta(days=28)
-                            if new_timeout_until > max_timeout_until:
-                                new_timeout_until = max_timeout_until
-                            await member.edit(timeout=new_timeout_until, reason="Sent Discord invite link (timeout extended)")
-                            actions_taken.append(f"Timeout extended by {timeout_duration_minutes} minutes (new expiry: <t:{int(new_timeout_until.timestamp())}:R>)")
-                            # Increment timeout stats on success
-                            current_timeouts = await self.config.guild(guild).timeouts_issued()
-                            await self.config.guild(guild).timeouts_issued.set(current_timeouts + 1)
-                            current_total_minutes = await self.config.guild(guild).total_timeout_minutes()
-                            # Only add the additional minutes, not the full new timeout
-                            await self.config.guild(guild).total_timeout_minutes.set(current_total_minutes + timeout_duration_minutes)
-                        else:
-                            # User is not currently timed out, apply a new timeout
-                            timeout_delta = datetime.timedelta(minutes=timeout_duration_minutes)
-                            await member.timeout(timeout_delta, reason="Sent Discord invite link")
-                            actions_taken.append(f"Timeout issued for {timeout_duration_minutes} minutes")
-                            # Increment timeout stats on success
-                            current_timeouts = await self.config.guild(guild).timeouts_issued()
-                            await self.config.guild(guild).timeouts_issued.set(current_timeouts + 1)
-                            current_total_minutes = await self.config.guild(guild).total_timeout_minutes()
-                            await self.config.guild(guild).total_timeout_minutes.set(current_total_minutes + timeout_duration_minutes)
-                    except discord.Forbidden:
-                        actions_taken.append(f"Timeout failed (Missing Permissions or Role Hierarchy)")
-                    except discord.HTTPException as e:
-                        actions_taken.append(f"Timeout failed (HTTP Error: {getattr(e, 'status', 'Unknown')})")
-                else:
-                    actions_taken.append(f"Timeout skipped (Bot role not high enough)")
-
-            # --- Action: Log Event ---
-            logging_channel_id = await self.config.guild(guild).logging_channel()
-            if logging_channel_id:
-                logging_channel = guild.get_channel(logging_channel_id)
-                if (
-                    logging_channel
-                    and logging_channel.permissions_for(guild.me).send_messages
-                    and logging_channel.permissions_for(guild.me).embed_links
-                ):
-                    embed = discord.Embed(
-                        title="Unwanted invite detected",
-                        description="An invite link was detected",
-                        color=0xff4545
-                    )
-                    embed.add_field(name="Channel", value=message.channel.mention, inline=True)
-                    embed.add_field(name="User", value=f"{member.mention} ({member.id})", inline=True)
-                    embed.add_field(name="Detected invite", value=f"`{log_invite_url}`", inline=True)  # Use the matched URL
-
-                    # Add invite details if fetched
-                    for name, value in log_fields.items():
-                        embed.add_field(name=name, value=value, inline=True)
-
-                    # If the invite_info was fetched and has a guild with a description, show it
-                    if "Server name" in log_fields and "Server ID" in log_fields:
-                        # Try to get the invite_info.guild.description if available
-                        try:
-                            invite_info2 = await self.bot.fetch_invite(invite_code)
-                            if getattr(invite_info2, "guild", None) and getattr(invite_info2.guild, "description", None):
-                                description = invite_info2.guild.description
-                                if description:
-                                    embed.add_field(
-                                        name="Server description",
-                                        value=description[:1024],  # Discord embed field value limit
-                                        inline=False
-                                    )
-                        except Exception:
-                            pass  # Don't break logging if this fails
-
-                    if actions_taken:
-                        embed.add_field(name="Actions taken", value="\n".join(f"- {action}" for action in actions_taken), inline=False)
+        # Every invite in the message is for this server, ignore it
+        if invite_code is None:
+            return
+
+        actions_taken = []
+
+        # --- Action: Delete Message ---
+        try:
+            await message.delete()
+            actions_taken.append("Message deleted")
+            # Increment counters only on successful deletion
+            self._pending_counters[(guild.id, "invites_deleted")] += 1
+        except discord.Forbidden:
+            actions_taken.append("Deletion failed (Missing Permissions)")
+        except discord.NotFound:
+            actions_taken.append("Deletion failed (Message already deleted)")
+        except discord.HTTPException as e:
+            actions_taken.append(f"Deletion failed (HTTP Error: {getattr(e, 'status', 'Unknown')})")
+
+        # --- Action: Timeout User ---
+        timeout_duration_minutes = settings["timeout_duration"]
+        if timeout_duration_minutes > 0 and isinstance(member, discord.Member):  # Check if timeout is enabled and we have a member object
+            # Ensure the bot has permissions higher than the target user
+            if guild.me and guild.me.top_role > member.top_role:
+                try:
+                    # Check if the user is already timed out
+                    # member.timed_out_until is a datetime.datetime or None
+                    now_utc = datetime.datetime.now(datetime.timezone.utc)
+                    timed_out_until = getattr(member, "timed_out_until", None)
+                    if timed_out_until and timed_out_until > now_utc:
+                        # User is already timed out, so extend the timeout by the additional duration
+                        new_timeout_until = timed_out_until + datetime.timedelta(minutes=timeout_duration_minutes)
+                        # Discord's max timeout is 28 days from now
+                        max_timeout_until = now_utc + datetime.timedelta(days=28)
+                        if new_timeout_until > max_timeout_until:
+                            new_timeout_until = max_timeout_until
+                        await member.edit(timeout=new_timeout_until, reason="Sent Discord invite link (timeout extended)")
+                        actions_taken.append(f"Timeout extended by {timeout_duration_minutes} minutes (new expiry: <t:{int(new_timeout_until.timestamp())}:R>)")
+                        # Increment timeout stats on success
+                        self._pending_counters[(guild.id, "timeouts_issued")] += 1
+                        # Only add the additional minutes, not the full new timeout
+                        self._pending_counters[(guild.id, "total_timeout_minutes")] += timeout_duration_minutes
                     else:
-                        embed.add_field(name="Actions taken", value="None", inline=False)
+                        # User is not currently timed out, apply a new timeout
+                        timeout_delta = datetime.timedelta(minutes=timeout_duration_minutes)
+                        await member.timeout(timeout_delta, reason="Sent Discord invite link")
+                        actions_taken.append(f"Timeout issued for {timeout_duration_minutes} minutes")
+                        # Increment timeout stats on success
+                        self._pending_counters[(guild.id, "timeouts_issued")] += 1
+                        self._pending_counters[(guild.id, "total_timeout_minutes")] += timeout_duration_minutes
+                except discord.Forbidden:
+                    actions_taken.append(f"Timeout failed (Missing Permissions or Role Hierarchy)")
+                except discord.HTTPException as e:
+                    actions_taken.append(f"Timeout failed (HTTP Error: {getattr(e, 'status', 'Unknown')})")
+            else:
+                actions_taken.append(f"Timeout skipped (Bot role not high enough)")
+
+        # --- Action: Log Event ---
+        logging_channel_id = settings["logging_channel"]
+        if logging_channel_id:
+            logging_channel = guild.get_channel(logging_channel_id)
+            if (
+                logging_channel
+                and logging_channel.permissions_for(guild.me).send_messages
+                and logging_channel.permissions_for(guild.me).embed_links
+            ):
+                embed = discord.Embed(
+                    title="Unwanted invite detected",
+                    description="An invite link was detected",
+                    color=0xff4545
+                )
+                embed.add_field(name="Channel", value=message.channel.mention, inline=True)
+                embed.add_field(name="User", value=f"{member.mention} ({member.id})", inline=True)
+                detected = "\n".join(f"`{url}`" for url in foreign_invites)  # Use the matched URLs
+                embed.add_field(name="Detected invite" if len(foreign_invites) == 1 else "Detected invites", value=detected[:1024], inline=True)
+
+                # Add invite details if fetched
+                for name, value in log_fields.items():
+                    embed.add_field(name=name, value=value, inline=True)
+
+                # If the invite_info was fetched and has a guild with a description, show it
+                description = getattr(getattr(invite_info, "guild", None), "description", None)
+                if description:
+                    embed.add_field(
+                        name="Server description",
+                        value=description[:1024],  # Discord embed field value limit
+                        inline=False
+                    )
 
-                    embed.set_footer(text=f"Message ID: {message.id}")
-                    embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
+                if actions_taken:
+                    embed.add_field(name="Actions taken", value="\n".join(f"- {action}" for action in actions_taken), inline=False)
+                else:
+                    embed.add_field(name="Actions taken", value="None", inline=False)
+
+                embed.set_footer(text=f"Message ID: {message.id}")
+                embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
 
-                    try:
-                        await logging_channel.send(embed=embed)
-                    except discord.HTTPException:
-                        # Log failure to send log message (e.g., to console or another fallback)
-                        print(f"Failed to send invite filter log to channel {logging_channel_id} in guild {guild.id}")
-                elif logging_channel:
-                    print(f"Missing Send/Embed permissions for invite filter log channel {logging_channel_id} in guild {guild.id}")
+                try:
+                    await logging_channel.send(embed=embed)
+                except discord.HTTPException:
+                    # Log failure to send log message (e.g., to console or another fallback)
+                    print(f"Failed to send invite filter log to channel {logging_channel_id} in guild {guild.id}")
+            elif logging_channel:
+                print(f"Missing Send/Embed permissions for invite filter log channel {logging_channel_id} in guild {guild.id}")
+
+    async def _get_settings(self, guild):
+        """Return a cached snapshot of the guild's settings, reading config only on a cache miss."""
+        settings = self._settings_cache.get(guild.id)
+        if settings is None:
+            data = await self.config.guild(guild).all()
+            settings = {
+                "delete_invites": data["delete_invites"],
+                "whitelisted_channels": frozenset(data["whitelisted_channels"]),
+                "whitelisted_categories": frozenset(data["whitelisted_categories"]),
+                "whitelisted_users": frozenset(data["whitelisted_users"]),
+                "whitelisted_roles": frozenset(data["whitelisted_roles"]),
+                "logging_channel": data["logging_channel"],
+                "timeout_duration": data["timeout_duration"],
+            }
+            self._settings_cache[guild.id] = settings
+        return settings
+
+    def _invalidate_settings(self, guild):
+        self._settings_cache.pop(guild.id, None)
+
+    async def _flush_counters(self):
+        """Write buffered statistics counters to config."""
+        async with self._flush_lock:
+            pending, self._pending_counters = self._pending_counters, defaultdict(int)
+            try:
+                while pending:
+                    (guild_id, counter), amount = next(iter(pending.items()))
+                    group = self.config if guild_id is None else self.config.guild_from_id(guild_id)
+                    value = group.get_attr(counter)
+                    await value.set(await value() + amount)
+                    del pending[(guild_id, counter)]
+                    if counter == "invites_deleted":
+                        # Counted towards the global total once the guild's own count is written
+                        pending[(None, "total_invites_deleted")] += amount
+            except Exception as e:
+                # Put back whatever wasn't written so the next flush retries it
+                for key, amount in pending.items():
+                    self._pending_counters[key] += amount
+                print(f"Failed to write invite filter counters, will retry: {e}")
+
+    @tasks.loop(seconds=60)
+    async def flush_counters_loop(self):
+        await self._flush_counters()
+
+    @staticmethod
+    def find_invites(content):
+        """Return a list of `(url, code)` for every unique invite in `content`, in order of appearance."""
+        invites = []
+        seen = set()
+        for match in INVITE_PATTERN.finditer(content):
+            code = match.group("code")
+            if code in seen:
+                continue
+            seen.add(code)
+            invites.append((match.group(0), code))
+        return invites
+
+    async def _get_own_invite_codes(self, guild):
+        """Return the set of invite codes known to belong to `guild`, building it on first use."""
+        codes = self._own_invite_codes.get(guild.id)
+        if codes is None:
+            codes = set()
+            if guild.me and guild.me.guild_permissions.manage_guild:
+                try:
+                    codes.update(invite.code for invite in await guild.invites())
+                except discord.HTTPException:
+                    pass
+            self._own_invite_codes[guild.id] = codes
+        return codes
+
+    @commands.Cog.listener()
+    async def on_invite_create(self, invite):
+        if invite.guild is None or invite.guild.id not in self._own_invite_codes:
+            return
+        self._own_invite_codes[invite.guild.id].add(invite.code)
+
+    @commands.Cog.listener()
+    async def on_invite_delete(self, invite):
+        if invite.guild is None or invite.guild.id not in self._own_invite_codes:
+            return
+        self._own_invite_codes[invite.guild.id].discard(invite.code)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self._own_invite_codes.pop(guild.id, None)
+        self._settings_cache.pop(guild.id, None)
 
     @commands.guild_only()
     @commands.admin_or_permissions(manage_guild=True)
@@ -241,6 +345,7 @@ class InviteFilter(commands.Cog):
             new_status = on_off
 
         await self.config.guild(guild).delete_invites.set(new_status)
+        self._invalidate_settings(guild)
         status = "enabled" if new_status else "disabled"
         await ctx.send(f"✅ Invite filter is now **{status}**.")
 
@@ -269,6 +374,8 @@ class InviteFilter(commands.Cog):
                 whitelisted_channels.append(channel.id)
                 changelog.append(f"➕ Added channel: {channel.mention}")
 
+        self._invalidate_settings(guild)
+
         if changelog:
             changelog_message = "\n".join(changelog)
             embed = discord.Embed(title="Whitelist Channel Updated", description=changelog_message, color=discord.Color.blue())
@@ -294,6 +401,8 @@ class InviteFilter(commands.Cog):
                 whitelisted_categories.append(category.id)
                 changelog.append(f"➕ Added category: {category.name}")
 
+        self._invalidate_settings(guild)
+
         if changelog:
             changelog_message = "\n".join(changelog)
             embed = discord.Embed(title="Whitelist Category Updated", description=changelog_message, color=discord.Color.blue())
@@ -319,6 +428,8 @@ class InviteFilter(commands.Cog):
                 whitelisted_roles.append(role.id)
                 changelog.append(f"➕ Added role: {role.mention}")
 
+        self._invalidate_settings(guild)
+
         if changelog:
             changelog_message = "\n".join(changelog)
             embed = discord.Embed(title="Whitelist Role Updated", description=changelog_message, color=discord.Color.blue())
@@ -344,6 +455,8 @@ class InviteFilter(commands.Cog):
                 whitelisted_users.append(user.id)
                 changelog.append(f"➕ Added user: {user.mention}")
 
+        self._invalidate_settings(guild)
+
         if changelog:
             changelog_message = "\n".join(changelog)
             embed = discord.Embed(title="Whitelist User Updated", description=changelog_message, color=discord.Color.blue())
@@ -365,9 +478,11 @@ class InviteFilter(commands.Cog):
                 await ctx.send(f"⚠️ I lack `Send Messages` or `Embed Links` permissions in {channel.mention}. Please grant them for logging to work.")
                 return
             await self.config.guild(guild).logging_channel.set(channel.id)
+            self._invalidate_settings(guild)
             await ctx.send(f"✅ Logging channel set to {channel.mention}.")
         else:
             await self.config.guild(guild).logging_channel.set(None)
+            self._invalidate_settings(guild)
             await ctx.send("✅ Logging channel disabled.")
 
     @commands.admin_or_permissions(manage_guild=True)
@@ -384,6 +499,7 @@ class InviteFilter(commands.Cog):
             return
 
         await self.config.guild(guild).timeout_duration.set(minutes)
+        self._invalidate_settings(guild)
         if minutes > 0:
             await ctx.send(f"✅ Timeout duration set to **{minutes}** minutes.")
         else:
@@ -393,6 +509,7 @@ class InviteFilter(commands.Cog):
     async def stats(self, ctx):
         """Display statistics for the invite filter."""
         guild = ctx.guild
+        await self._flush_counters()  # Make sure buffered counts are included
         invites_deleted = await self.config.guild(guild).invites_deleted()
         timeouts_issued = await self.config.guild(guild).timeouts_issued()
         total_timeout_minutes = await self.config.guild(guild).total_timeout_minutes()
@@ -0,0 +1,115 @@
+import asyncio
+import io
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+
+CHART_TTL = 120  # Seconds a rendered chart is served from the cache
+CACHE_SIZE = 64  # Rendered charts kept at most
+POOL_WORKERS = 2
+
+
+def render_growth(points, title="Server Member Growth"):
+    """
+    Draw a member growth line chart from [(timestamp, member count)] and return PNG bytes.
+
+    Runs in a spawned worker process, so it has to stay importable at module level, and it uses
+    the object-oriented Agg API rather than pyplot's global state.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg  # type: ignore
+    from matplotlib.figure import Figure  # type: ignore
+
+    figure = Figure(figsize=(8, 4))
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot()
+    axes.plot([datetime.fromtimestamp(ts, timezone.utc) for ts, _ in points], [count for _, count in points], marker="o")
+    axes.set_title(title)
+    axes.set_xlabel("Date")
+    axes.set_ylabel("Member Count")
+    figure.autofmt_xdate()
+    figure.tight_layout()
+    buf = io.BytesIO()
+    figure.savefig(buf, format="png")
+    return buf.getvalue()
+
+
+class ChartRenderer:
+    """
+    Renders charts off the event loop and caches the PNGs for a short while.
+
+    Rendering runs in a small process pool, since matplotlib isn't thread-safe and a chart can
+    hold the GIL for hundreds of milliseconds. Results are cached under the caller's key, which
+    should name the guild, the chart type and the version of the data drawn, for `CHART_TTL`
+    seconds; concurrent requests for the same key share one render. If the pool can't be used
+    (no spawn support, a crashed worker) charts are drawn in a thread instead, one at a time.
+    """
+
+    def __init__(self, workers=POOL_WORKERS, ttl=CHART_TTL):
+        self.workers = workers
+        self.ttl = ttl
+        self._pool = None
+        self._pool_failed = False
+        self._thread_lock = asyncio.Lock()
+        self._cache = {}  # {key: (expires, png bytes)}
+        self._inflight = {}  # {key: asyncio.Future}
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None and not self._pool_failed:
+            # Forking would copy the bot's running event loop, sockets and locks into the worker
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    async def _run(self, func, *args):
+        pool = self._get_pool()
+        if pool is not None:
+            try:
+                return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+            except (BrokenProcessPool, OSError, RuntimeError) as e:
+                print(f"[Invites] Chart process pool unavailable, rendering in a thread: {e}")
+                self._pool_failed = True
+                self.close()
+        async with self._thread_lock:
+            return await asyncio.to_thread(func, *args)
+
+    async def render(self, key, func, *args):
+        """Return the PNG for `key`, rendering it with func(*args) unless a fresh copy is cached."""
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            png = await self._run(func, *args)
+        except BaseException as e:
+            if isinstance(e, Exception):
+                future.set_exception(e)
+                # Mark the exception as retrieved when nobody else was waiting on it
+                future.exception()
+            else:
+                future.cancel()
+            raise
+        finally:
+            del self._inflight[key]
+        future.set_result(png)
+
+        self._cache[key] = (time.monotonic() + self.ttl, png)
+        if len(self._cache) > CACHE_SIZE:
+            now = time.monotonic()
+            for stale in [k for k, (expires, _) in self._cache.items() if expires <= now]:
+                del self._cache[stale]
+            while len(self._cache) > CACHE_SIZE:
+                # Dicts keep insertion order, so this drops the oldest render
+                del self._cache[next(iter(self._cache))]
+        return png
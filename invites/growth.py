@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+
+HOUR = 3600
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+
+# (name, bucket width in seconds, buckets kept)
+RESOLUTIONS = (
+    ("hourly", HOUR, 24 * 14),  # Two weeks of hours
+    ("daily", DAY, 400),  # A bit over a year of days
+    ("weekly", WEEK, 520),  # Ten years of weeks
+)
+
+
+class GrowthSeries:
+    """
+    Bounded member-count history for one guild.
+
+    Every observation is written into an hourly, a daily and a weekly bucket, each keeping the
+    last member count seen in its period, and each resolution only keeps its most recent
+    buckets. The whole series is at most a little over 1200 numbers however long the guild
+    has been tracked, and range queries read from the coarsest resolution that still has
+    enough points for the range.
+    """
+
+    def __init__(self, buckets=None):
+        self.version = 0  # Bumped on every change, lets rendered charts be cached per version
+        self.buckets = {name: {} for name, _width, _keep in RESOLUTIONS}
+        for name, data in (buckets or {}).items():
+            if name in self.buckets:
+                # Config stores keys as strings
+                self.buckets[name] = {int(start): count for start, count in data.items()}
+
+    def to_dict(self):
+        return {name: {str(start): count for start, count in data.items()} for name, data in self.buckets.items()}
+
+    def record(self, timestamp, member_count):
+        self.version += 1
+        for name, width, keep in RESOLUTIONS:
+            data = self.buckets[name]
+            start = int(timestamp // width * width)
+            data[start] = member_count
+            if len(data) > keep:
+                for old in sorted(data)[: len(data) - keep]:
+                    del data[old]
+
+    def range(self, start, end, min_points=12):
+        """
+        Return [(bucket start, member count)] between two timestamps, oldest first.
+
+        Uses the coarsest resolution with at least `min_points` buckets in the range, or the
+        one with the most buckets in it when none has that many.
+        """
+        chosen = None
+        for name, _width, _keep in reversed(RESOLUTIONS):
+            points = sorted((ts, count) for ts, count in self.buckets[name].items() if start <= ts <= end)
+            if len(points) >= min_points:
+                return points
+            if chosen is None or len(points) > len(chosen):
+                chosen = points
+        return chosen or []
+
+    def record_legacy(self, growth):
+        """Add the observations from the old unbounded [(iso date, member count)] list."""
+        for iso, count in growth:
+            try:
+                moment = datetime.fromisoformat(iso)
+            except (TypeError, ValueError):
+                continue
+            if moment.tzinfo is None:
+                moment = moment.replace(tzinfo=timezone.utc)
+            self.record(moment.timestamp(), count)
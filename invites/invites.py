@@ -1,9 +1,13 @@
 import discord  # type: ignore
+from discord.ext import tasks  # type: ignore
 from redbot.core import commands, Config, checks  # type: ignore
-import matplotlib.pyplot as plt  # type: ignore
-import io
 import asyncio
-from datetime import datetime
+import io
+from datetime import datetime, timezone
+
+from .charts import ChartRenderer, render_growth
+from .growth import DAY, GrowthSeries
+from .tracker import InviteState, InviteUsesCache, JoinBurstResolver
 
 class Invites(commands.Cog):
     """
@@ -20,10 +24,51 @@ class Invites(commands.Cog):
             "invites": {},  # {user_id: count}
             "rewards": {},  # {invite_count: role_id}
             "announcement_channel": None,
-            "member_growth": [],  # [(iso_date, member_count)]
+            "member_growth": [],  # Legacy [(iso_date, member_count)], migrated into growth_series
+            "growth_series": {},  # GrowthSeries.to_dict()
         }
         self.config.register_guild(**default_guild)
-        self._cache = {}  # {guild_id: [Invite objects]}
+        self._invite_cache = InviteUsesCache()  # {guild_id: {code: InviteState}}, kept current from gateway events
+        self._resolver = JoinBurstResolver(self._invite_cache, self._fetch_invites)
+        self._growth = {}  # {guild_id: GrowthSeries}, loaded lazily
+        self._growth_dirty = set()  # Guilds whose series changed since the last flush
+        self._charts = ChartRenderer()
+        self.flush_growth_loop.start()
+
+    async def cog_unload(self):
+        self.flush_growth_loop.cancel()
+        await self._flush_growth()
+        self._charts.close()
+
+    async def _get_growth(self, guild):
+        series = self._growth.get(guild.id)
+        if series is None:
+            conf = self.config.guild(guild)
+            series = GrowthSeries(await conf.growth_series())
+            legacy = await conf.member_growth()
+            if legacy:
+                # One-time migration of the old unbounded list
+                series.record_legacy(legacy)
+                await conf.growth_series.set(series.to_dict())
+                await conf.member_growth.clear()
+            self._growth[guild.id] = series
+        return series
+
+    async def _record_growth(self, guild):
+        series = await self._get_growth(guild)
+        series.record(datetime.now(timezone.utc).timestamp(), guild.member_count)
+        self._growth_dirty.add(guild.id)
+
+    async def _flush_growth(self):
+        dirty, self._growth_dirty = self._growth_dirty, set()
+        for guild_id in dirty:
+            series = self._growth.get(guild_id)
+            if series is not None:
+                await self.config.guild_from_id(guild_id).growth_series.set(series.to_dict())
+
+    @tasks.loop(minutes=5)
+    async def flush_growth_loop(self):
+        await self._flush_growth()
 
     async def red_delete_data_for_user(self, *, requester, user_id: int):
         # Remove user invite data for GDPR compliance
@@ -31,79 +76,98 @@ class Invites(commands.Cog):
             async with self.config.guild_from_id(guild_id).invites() as invites:
                 invites.pop(str(user_id), None)
 
+    @staticmethod
+    async def _fetch_invites(guild):
+        """Snapshot a guild's invites in the form the tracker caches."""
+        return {
+            invite.code: InviteState(
+                invite.uses or 0, invite.max_uses, invite.inviter.id if invite.inviter else None
+            )
+            for invite in await guild.invites()
+        }
+
+    async def _prime_invites(self, guild):
+        try:
+            self._invite_cache.replace(guild.id, await self._fetch_invites(guild))
+        except Exception:
+            # Left unprimed, joins aren't attributed until a snapshot succeeds
+            self._invite_cache.forget(guild.id)
+
     @commands.Cog.listener()
     async def on_ready(self):
         # Cache invites for all guilds
         for guild in self.bot.guilds:
-            try:
-                self._cache[guild.id] = await guild.invites()
-            except Exception:
-                self._cache[guild.id] = []
+            await self._prime_invites(guild)
 
     @commands.Cog.listener()
     async def on_guild_join(self, guild):
-        try:
-            self._cache[guild.id] = await guild.invites()
-        except Exception:
-            self._cache[guild.id] = []
+        await self._prime_invites(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self._invite_cache.forget(guild.id)
 
     @commands.Cog.listener()
     async def on_invite_create(self, invite):
-        # Update cache when new invite is created
-        guild = invite.guild
-        try:
-            self._cache[guild.id] = await guild.invites()
-        except Exception:
-            pass
+        # The gateway event carries everything the cache needs, no need to list the invites again
+        if invite.guild is None:
+            return
+        self._invite_cache.created(
+            invite.guild.id,
+            invite.code,
+            InviteState(invite.uses or 0, invite.max_uses, invite.inviter.id if invite.inviter else None),
+        )
 
     @commands.Cog.listener()
     async def on_invite_delete(self, invite):
-        # Update cache when invite is deleted
-        guild = invite.guild
-        try:
-            self._cache[guild.id] = await guild.invites()
-        except Exception:
-            pass
+        if invite.guild is None:
+            return
+        self._invite_cache.deleted(invite.guild.id, invite.code)
 
     @commands.Cog.listener()
     async def on_member_join(self, member):
         guild = member.guild
         try:
-            before = self._cache.get(guild.id, [])
-            after = await guild.invites()
-            self._cache[guild.id] = after
-
-            used_invite = None
-            for old in before:
-                new = next((i for i in after if i.code == old.code), None)
-                if new and new.uses > old.uses:
-                    used_invite = new
-                    break
-
-            inviter = used_invite.inviter if used_invite else None
+            # Every join in a burst shares one snapshot of the guild's invites
+            inviter_id, exact = await self._resolver.attribute(guild)
 
             # Ignore Disboard bot invites
-            if inviter and inviter.id == self.DISBOARD_BOT_ID:
+            if inviter_id == self.DISBOARD_BOT_ID:
                 return
 
-            if inviter:
+            if inviter_id:
+                inviter = guild.get_member(inviter_id) or self.bot.get_user(inviter_id)
+                if inviter is None:
+                    # Inviters who left every shared guild aren't cached, but can still be announced
+                    try:
+                        inviter = await self.bot.fetch_user(inviter_id)
+                    except discord.HTTPException:
+                        inviter = discord.Object(id=inviter_id)
                 await self._increment_invite(guild, inviter)
-                await self._announce_invite(guild, member, inviter)
-                await self._check_and_award_rewards(guild, inviter)
+                if not isinstance(inviter, discord.Object):
+                    await self._announce_invite(guild, member, inviter, exact)
+                if isinstance(inviter, discord.Member):
+                    await self._check_and_award_rewards(guild, inviter)
 
             # Track member growth
-            async with self.config.guild(guild).member_growth() as growth:
-                growth.append((member.joined_at.isoformat(), guild.member_count))
+            await self._record_growth(guild)
 
         except Exception as e:
             print(f"[Invites] Error processing member join in {guild.id}: {e}")
 
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        try:
+            await self._record_growth(member.guild)
+        except Exception as e:
+            print(f"[Invites] Error recording member growth in {member.guild.id}: {e}")
+
     async def _increment_invite(self, guild, inviter):
         async with self.config.guild(guild).invites() as invites:
             invites.setdefault(str(inviter.id), 0)
             invites[str(inviter.id)] += 1
 
-    async def _announce_invite(self, guild, member, inviter):
+    async def _announce_invite(self, guild, member, inviter, exact=True):
         channel_id = await self.config.guild(guild).announcement_channel()
         if not channel_id:
             return
@@ -112,7 +176,11 @@ class Invites(commands.Cog):
             return
         embed = discord.Embed(
             title="New Member Joined!",
-            description=f"{member.mention} joined using {inviter.mention}'s invite.",
+            description=(
+                f"{member.mention} joined using {inviter.mention}'s invite."
+                if exact
+                else f"{member.mention} joined, most likely using {inviter.mention}'s invite."
+            ),
             color=0x2bbd8e
         )
         await channel.send(embed=embed)
@@ -259,32 +327,20 @@ class Invites(commands.Cog):
         await ctx.send(embed=embed)
 
     @invites_group.command(name="chart")
-    async def chart(self, ctx):
-        """Show a chart of server member growth."""
-        growth = await self.config.guild(ctx.guild).member_growth()
-        if not growth or len(growth) < 2:
+    async def chart(self, ctx, days: int = 30):
+        """Show a chart of server member growth over the last `days` days."""
+        series = await self._get_growth(ctx.guild)
+        end = datetime.now(timezone.utc).timestamp()
+        points = series.range(end - max(1, days) * DAY, end)
+        if len(points) < 2:
             await ctx.send("Not enough data to plot member growth.")
             return
 
-        # Summarize by day
-        daily = {}
-        for iso, count in growth:
-            day = iso.split("T")[0]
-            daily[day] = count
-        days = sorted(daily.keys())
-        counts = [daily[day] for day in days]
-
-        plt.figure(figsize=(8, 4))
-        plt.plot([datetime.strptime(d, "%Y-%m-%d") for d in days], counts, marker="o")
-        plt.title("Server Member Growth")
-        plt.xlabel("Date")
-        plt.ylabel("Member Count")
-        plt.tight_layout()
-        buf = io.BytesIO()
-        plt.savefig(buf, format="png")
-        plt.close()
-        buf.seek(0)
-        await ctx.send(file=discord.File(buf, filename="growth.png"))
+        # Drawn in the renderer's process pool, repeat requests for unchanged data hit its cache
+        key = (ctx.guild.id, "growth", days, series.version)
+        async with ctx.typing():
+            png = await self._charts.render(key, render_growth, points)
+        await ctx.send(file=discord.File(io.BytesIO(png), filename="growth.png"))
 
     @invites_group.command(name="stats")
     async def stats(self, ctx, member: discord.Member = None):
@@ -0,0 +1,154 @@
+"""Replay synthetic invite/join event streams against the invite tracker.
+
+Run from the repository root with ``python invites/replay.py``. Each scenario
+drives ``InviteUsesCache`` and ``JoinBurstResolver`` the way the cog's
+listeners do, against a fake guild whose ``invites()`` reflects the true uses
+and counts every call. It checks per-inviter counts against the ground truth,
+that every join flagged as exact was attributed correctly, and how many
+snapshots each stream cost. Exits non-zero on a mismatch. Not loaded by Red.
+"""
+import asyncio
+import sys
+from collections import Counter
+
+from tracker import InviteState, InviteUsesCache, JoinBurstResolver
+
+DEBOUNCE = 0.05  # Scaled down from the cog's 2 seconds so the replay runs quickly
+
+
+class FakeGuild:
+    """Holds the true invite state, as Discord would report it."""
+
+    def __init__(self, guild_id=1):
+        self.id = guild_id
+        self.invites_state = {}  # {code: InviteState}
+        self.calls = 0
+
+    async def invites(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)  # The REST round trip
+        return {code: InviteState(s.uses, s.max_uses, s.inviter_id) for code, s in self.invites_state.items()}
+
+
+async def fetch(guild):
+    return await guild.invites()
+
+
+async def replay(stream, prime=True):
+    """
+    Feed `stream`, a list of (delay, event, args), and return the outcome.
+
+    Events: ("create", code, inviter_id, max_uses), ("delete", code), ("join", member_id, code).
+    """
+    guild = FakeGuild()
+    cache = InviteUsesCache()
+    resolver = JoinBurstResolver(cache, fetch, window=DEBOUNCE)
+    truth = {}  # {member_id: inviter_id}
+    pending = []
+
+    async def join(member_id):
+        return member_id, await resolver.attribute(guild)
+
+    for delay, event, *args in stream:
+        if delay:
+            await asyncio.sleep(delay)
+        if event == "create":
+            code, inviter_id, max_uses = args
+            guild.invites_state[code] = InviteState(0, max_uses, inviter_id)
+            cache.created(guild.id, code, InviteState(0, max_uses, inviter_id))
+        elif event == "prime":
+            if prime:
+                cache.replace(guild.id, await guild.invites())
+        elif event == "delete":
+            (code,) = args
+            guild.invites_state.pop(code, None)
+            cache.deleted(guild.id, code)
+        elif event == "join":
+            member_id, code = args
+            state = guild.invites_state[code]
+            state.uses += 1
+            truth[member_id] = state.inviter_id
+            if state.max_uses and state.uses >= state.max_uses:
+                # Discord deletes an invite the moment it runs out
+                del guild.invites_state[code]
+                cache.deleted(guild.id, code)
+            pending.append(asyncio.create_task(join(member_id)))
+    results = dict(await asyncio.gather(*pending))
+    return guild, truth, results
+
+
+def check(name, guild, truth, results, max_snapshots, expect_attributed=True):
+    expected = Counter(truth.values())
+    counted = Counter(inviter for inviter, _exact in results.values() if inviter)
+    exact = [(member, inviter) for member, (inviter, is_exact) in results.items() if is_exact]
+    wrong_exact = [member for member, inviter in exact if truth[member] != inviter]
+    snapshots = guild.calls
+    ok = not wrong_exact and snapshots <= max_snapshots
+    ok = ok and (counted == expected if expect_attributed else not counted)
+    print(
+        f"{'ok  ' if ok else 'FAIL'} {name:<34}{len(truth):>5} joins {snapshots:>3} snapshots "
+        f"{len(exact):>5} exact  counts {dict(counted)}"
+    )
+    return ok
+
+
+def single_invite_raid():
+    # Ten waves of 50 joins, one debounce window apart
+    stream = [(0, "create", "raid", 100, None), (0, "prime")]
+    for member_id in range(500):
+        stream.append((DEBOUNCE if member_id % 50 == 0 else 0, "join", member_id, "raid"))
+    return stream
+
+
+def mixed_burst():
+    stream = [(0, "create", "a", 1, None), (0, "create", "b", 2, None), (0, "prime")]
+    stream += [(0, "join", member_id, "a" if member_id % 3 else "b") for member_id in range(60)]
+    return stream
+
+
+def max_uses_invite():
+    stream = [(0, "create", "once", 7, 3), (0, "create", "other", 8, None), (0, "prime")]
+    stream += [(0, "join", 1, "once"), (0, "join", 2, "once"), (0, "join", 3, "once"), (0, "join", 4, "other")]
+    return stream
+
+
+def invite_created_mid_burst():
+    stream = [(0, "create", "old", 1, None), (0, "prime"), (0, "join", 1, "old")]
+    stream += [(0.01, "create", "new", 2, None), (0, "join", 2, "new"), (0, "join", 3, "new")]
+    return stream
+
+
+def separate_bursts():
+    stream = [(0, "create", "a", 1, None), (0, "create", "b", 2, None), (0, "prime")]
+    for burst in range(5):
+        code = "a" if burst % 2 else "b"
+        stream += [(DEBOUNCE * 3, "join", burst * 10, code)]
+        stream += [(0, "join", burst * 10 + i, code) for i in range(1, 4)]
+    return stream
+
+
+def unprimed_guild():
+    stream = [(0, "create", "a", 1, None), (0, "prime")]
+    stream += [(0, "join", member_id, "a") for member_id in range(10)]
+    return stream
+
+
+async def main():
+    scenarios = [
+        # (name, stream, most snapshots allowed including the priming one, primed)
+        ("500-member raid on one invite", single_invite_raid(), 11, True),
+        ("mixed burst over two inviters", mixed_burst(), 2, True),
+        ("invite deleted at max uses", max_uses_invite(), 2, True),
+        ("invite created mid-burst", invite_created_mid_burst(), 2, True),
+        ("five separate bursts", separate_bursts(), 6, True),
+        ("unprimed guild", unprimed_guild(), 1, False),
+    ]
+    ok = True
+    for name, stream, max_snapshots, primed in scenarios:
+        guild, truth, results = await replay(stream, prime=primed)
+        ok = check(name, guild, truth, results, max_snapshots, expect_attributed=primed) and ok
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(main()) else 1)
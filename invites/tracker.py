@@ -0,0 +1,126 @@
+import asyncio
+import time
+
+BURST_WINDOW = 2.0  # Joins this close together share one guild.invites() call
+EXHAUSTED_TTL = 60  # Seconds an invite deleted with uses left can still explain a join
+CARRY_TTL = 10  # Seconds uses counted ahead of their join event are held for it
+
+
+class InviteState:
+    __slots__ = ("uses", "max_uses", "inviter_id")
+
+    def __init__(self, uses, max_uses=None, inviter_id=None):
+        self.uses = uses
+        self.max_uses = max_uses
+        self.inviter_id = inviter_id
+
+
+class InviteUsesCache:
+    """Invite uses per guild, primed from a full listing and then kept current from invite events."""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.guilds = {}  # {guild_id: {code: InviteState}}, only guilds whose invites could be listed
+        self._deleted = {}  # {guild_id: [(deleted_at, InviteState)]}
+
+    def replace(self, guild_id, snapshot):
+        self.guilds[guild_id] = dict(snapshot)
+
+    def created(self, guild_id, code, state):
+        if guild_id in self.guilds:
+            self.guilds[guild_id][code] = state
+
+    def deleted(self, guild_id, code):
+        state = self.guilds.get(guild_id, {}).pop(code, None)
+        if state is not None:
+            self._deleted.setdefault(guild_id, []).append((self.clock(), state))
+
+    def forget(self, guild_id):
+        self.guilds.pop(guild_id, None)
+        self._deleted.pop(guild_id, None)
+
+    def diff(self, guild_id, snapshot):
+        """
+        Store `snapshot` as the guild's invites and return (used, exhausted), both [(state, uses)].
+
+        `used` are the uses counted since the last snapshot, most first. `exhausted` are recently
+        deleted invites that had uses left; Discord deletes an invite as its last use joins, but
+        so can a moderator, so they only explain joins nothing in `used` accounts for. An unprimed
+        guild is primed and reports nothing.
+        """
+        cached = self.guilds.get(guild_id)
+        self.replace(guild_id, snapshot)
+        deleted = self._deleted.pop(guild_id, [])
+        if cached is None:
+            return [], []
+        used = []
+        for code, state in snapshot.items():
+            previous = cached[code].uses if code in cached else 0
+            if state.uses > previous:
+                used.append((state, state.uses - previous))
+        used.sort(key=lambda item: item[1], reverse=True)
+        now = self.clock()
+        exhausted = [
+            (state, state.max_uses - state.uses)
+            for deleted_at, state in deleted
+            if now - deleted_at <= EXHAUSTED_TTL and state.max_uses and state.max_uses > state.uses
+        ]
+        return used, exhausted
+
+
+class JoinBurstResolver:
+    """
+    Attributes each join to an inviter, with one invite listing per burst of joins.
+
+    `fetch(guild)` returns the guild's {code: InviteState}. The uses a listing counts are handed
+    to the burst's joins in order; any beyond the burst's size belong to joins whose events
+    haven't arrived yet and are held for the next burst. A join is only reported as exact when
+    all of the uses came from one inviter.
+    """
+
+    def __init__(self, cache, fetch, window=BURST_WINDOW):
+        self.cache = cache
+        self.fetch = fetch
+        self.window = window
+        self._bursts = {}  # {guild_id: [joins so far, future of the burst's results]}
+        self._locks = {}  # {guild_id: asyncio.Lock}, so each diff starts from the previous listing
+        self._carried = {}  # {guild_id: [(inviter_id, counted_at)]}
+        self._tasks = set()
+
+    async def attribute(self, guild):
+        """Return (inviter_id, exact) for a member who just joined `guild`, inviter_id None if unknown."""
+        burst = self._bursts.get(guild.id)
+        if burst is None:
+            burst = self._bursts[guild.id] = [0, asyncio.get_running_loop().create_future()]
+            task = asyncio.create_task(self._resolve(guild, burst))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        index = burst[0]
+        burst[0] += 1
+        return (await asyncio.shield(burst[1]))[index]
+
+    async def _resolve(self, guild, burst):
+        used, exhausted = [], []
+        try:
+            await asyncio.sleep(self.window)
+            if self._bursts.get(guild.id) is burst:
+                del self._bursts[guild.id]
+            async with self._locks.setdefault(guild.id, asyncio.Lock()):
+                used, exhausted = self.cache.diff(guild.id, await self.fetch(guild))
+        except Exception as e:
+            print(f"[Invites] Error resolving invites in {guild.id}: {e}")
+        finally:
+            if self._bursts.get(guild.id) is burst:
+                del self._bursts[guild.id]
+            if not burst[1].done():
+                burst[1].set_result(self._assign(guild.id, used, exhausted, burst[0]))
+
+    def _assign(self, guild_id, used, exhausted, joins):
+        now = self.cache.clock()
+        slots = [slot for slot in self._carried.pop(guild_id, []) if now - slot[1] <= CARRY_TTL]
+        slots += [(state.inviter_id, now) for state, uses in used for _ in range(uses)]
+        exact = joins <= len(slots) and len({inviter_id for inviter_id, _counted_at in slots}) == 1
+        if len(slots) > joins:
+            self._carried[guild_id] = slots[joins:]
+        slots += [(state.inviter_id, now) for state, uses in exhausted for _ in range(uses)]
+        return [(slots[i][0], exact) if i < len(slots) else (None, False) for i in range(joins)]
@@ -0,0 +1,144 @@
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+# Digits and symbols raiders swap in for letters, mapped back so "r4id3r" groups with "raider"
+CONFUSABLES = str.maketrans("013457@$", "oleastas")
+TRAILING_NOISE = re.compile(r"[\d_.\-\s]+$")
+NON_LETTERS = re.compile(r"[^a-z]")
+PREFIX_LENGTH = 5  # Names sharing this many leading letters are grouped too ("raidbot", "raidbotx")
+MIN_CLUSTER = 3  # Smallest group treated as a cluster
+MIN_CLUSTER_SHARE = 0.2  # ...and it must also hold this share of the cohort
+
+
+def name_keys(name):
+    """Return the (skeleton, prefix) grouping keys for a username, None where there isn't one."""
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c)).lower()
+    # Strip the numbered suffixes bulk-created accounts get before mapping digits to letters
+    name = TRAILING_NOISE.sub("", name).translate(CONFUSABLES)
+    skeleton = NON_LETTERS.sub("", name)
+    if not skeleton:
+        return None, None
+    prefix = skeleton[:PREFIX_LENGTH] if len(skeleton) >= PREFIX_LENGTH else None
+    return skeleton, prefix
+
+
+class JoinRecord:
+    """The parts of a join the surge detector and cohort analysis need, captured once per join."""
+
+    __slots__ = ("timestamp", "member_id", "created", "skeleton", "prefix", "avatar")
+
+    def __init__(self, timestamp, member_id=None, created=None, skeleton=None, prefix=None, avatar=None):
+        self.timestamp = timestamp
+        self.member_id = member_id
+        self.created = created
+        self.skeleton = skeleton
+        self.prefix = prefix
+        self.avatar = avatar
+
+    @classmethod
+    def from_member(cls, member, timestamp):
+        skeleton, prefix = name_keys(member.name)
+        avatar = member.avatar.key if member.avatar is not None else None
+        return cls(timestamp, member.id, member.created_at.timestamp(), skeleton, prefix, avatar)
+
+
+class CohortReport:
+    """Summary of one join cohort and the members it flags as the likely raid cluster."""
+
+    def __init__(self, size, young, creation_day, name_cluster, avatar_cluster, default_avatars, score, flagged):
+        self.size = size
+        self.young = young  # Accounts younger than the alert criteria's minimum age
+        self.creation_day = creation_day  # (day as unix timestamp, accounts created that day)
+        self.name_cluster = name_cluster  # (grouping key, member ids)
+        self.avatar_cluster = avatar_cluster  # (avatar hash, member ids)
+        self.default_avatars = default_avatars
+        self.score = score  # 0-100, how raid-like the cohort looks
+        self.flagged = flagged  # Member ids in any cluster or below the minimum account age
+
+    def summary(self):
+        lines = [
+            f"Cohort score **{self.score}/100** for {self.size} joins, {len(self.flagged)} flagged.",
+            f"Accounts younger than the minimum age: {self.young}",
+        ]
+        day, count = self.creation_day
+        if count >= MIN_CLUSTER:
+            lines.append(f"{count} accounts created on <t:{day}:D>")
+        key, ids = self.name_cluster
+        if ids:
+            lines.append(f"{len(ids)} similar usernames (`{key}`)")
+        key, ids = self.avatar_cluster
+        if ids:
+            lines.append(f"{len(ids)} accounts sharing one avatar")
+        if self.default_avatars:
+            lines.append(f"{self.default_avatars} default avatars")
+        return "\n".join(lines)
+
+
+def _largest(groups, minimum):
+    """The biggest group in `groups` with at least `minimum` members, as (key, ids)."""
+    best_key, best_ids = None, []
+    for key, ids in groups.items():
+        if len(ids) >= minimum and len(ids) > len(best_ids):
+            best_key, best_ids = key, ids
+    return best_key, best_ids
+
+
+def analyze_cohort(records, now, min_account_age_days=3):
+    """
+    Analyze the joins in `records` in one pass over the cohort.
+
+    Creation times are bucketed by day and names and avatars are grouped by hash key rather
+    than compared pairwise, so the cost is linear in the cohort size.
+    """
+    days = Counter()
+    day_members = defaultdict(list)
+    names = defaultdict(list)
+    avatars = defaultdict(list)
+    young = set()
+    default_avatars = 0
+    size = 0
+    min_age = min_account_age_days * 86400
+    for record in records:
+        if record.member_id is None:
+            continue  # Restored from storage without member details
+        size += 1
+        day = int(record.created // 86400) * 86400
+        days[day] += 1
+        day_members[day].append(record.member_id)
+        if record.skeleton:
+            names[record.skeleton].append(record.member_id)
+            if record.prefix and record.prefix != record.skeleton:
+                names[record.prefix + "*"].append(record.member_id)
+        if record.avatar is None:
+            default_avatars += 1
+        else:
+            avatars[record.avatar].append(record.member_id)
+        if now - record.created < min_age:
+            young.add(record.member_id)
+    if not size:
+        return None
+
+    minimum = max(MIN_CLUSTER, int(size * MIN_CLUSTER_SHARE))
+    day, day_ids = _largest(day_members, minimum)
+    name_key, name_ids = _largest(names, minimum)
+    avatar_key, avatar_ids = _largest(avatars, minimum)
+
+    score = (
+        35 * len(young) / size
+        + 20 * len(day_ids) / size
+        + 25 * len(name_ids) / size
+        + 20 * max(len(avatar_ids) / size, 0.5 * default_avatars / size)
+    )
+    flagged = young.union(day_ids, name_ids, avatar_ids)
+    return CohortReport(
+        size=size,
+        young=len(young),
+        creation_day=(day or 0, len(day_ids)),
+        name_cluster=(name_key, name_ids),
+        avatar_cluster=(avatar_key, avatar_ids),
+        default_avatars=default_avatars,
+        score=min(100, round(score)),
+        flagged=flagged,
+    )
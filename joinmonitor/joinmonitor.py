@@ -1,8 +1,15 @@
 import discord
+from discord.ext import tasks
 from redbot.core import commands, Config, checks
 from redbot.core.bot import Red
 from datetime import datetime, timedelta, timezone
+from collections import deque
 import asyncio
+import time
+
+from .cohort import JoinRecord, analyze_cohort
+
+JOIN_BUFFER_SIZE = 1000  # Most recent joins kept per guild, far above any sane surge threshold
 
 class JoinMonitor(commands.Cog):
     """
@@ -37,11 +44,70 @@ class JoinMonitor(commands.Cog):
         self.config = Config.get_conf(self, identifier=0xAABBCCDD)
         self.config.register_guild(**self.DEFAULT_GUILD)
         self._surge_tasks = {}
-
-    def cog_unload(self):
+        self._settings_cache = {}  # {guild_id: settings snapshot}, rebuilt lazily after any config change
+        self._join_windows = {}  # {guild_id: deque of JoinRecord}, oldest first
+        self._cohorts = {}  # {guild_id: CohortReport} for the current or latest surge
+        self._surge_joins = {}  # {guild_id: [JoinRecord]} from the surge's start to the end of its cooldown
+        self._surge_until = {}  # {guild_id: timestamp the active surge ends}
+        self._dirty_windows = set()  # Guilds whose join window changed since the last persist
+        self._detection_latency = {}  # {guild_id: {"last": ms, "max": ms, "surges": n}}
+        self.persist_windows_loop.start()
+
+    async def cog_load(self):
+        # Restore recent joins and surge state so a restart mid-raid doesn't reset the count
+        now = datetime.now(timezone.utc).timestamp()
+        for guild_id, data in (await self.config.all_guilds()).items():
+            interval = data.get("surge", {}).get("interval_seconds", 30)
+            recent = [ts for ts in data.get("join_timestamps", []) if now - ts <= interval]
+            if recent:
+                self._join_windows[guild_id] = deque((JoinRecord(ts) for ts in recent), maxlen=JOIN_BUFFER_SIZE)
+            if data.get("surge_active_until"):
+                self._surge_until[guild_id] = data["surge_active_until"]
+
+    async def cog_unload(self):
+        self.persist_windows_loop.cancel()
+        await self._persist_windows()
         for task in self._surge_tasks.values():
             task.cancel()
 
+    async def _get_settings(self, guild):
+        """Return the cached settings for a guild, loading them with a single config read if needed."""
+        settings = self._settings_cache.get(guild.id)
+        if settings is None:
+            settings = await self.config.guild(guild).all()
+            self._settings_cache[guild.id] = settings
+        return settings
+
+    def _invalidate_settings(self, guild):
+        self._settings_cache.pop(guild.id, None)
+
+    def _record_join(self, guild_id, record, interval):
+        """Add a join to the guild's window, drop joins older than `interval` and return the window."""
+        window = self._join_windows.get(guild_id)
+        if window is None:
+            window = self._join_windows[guild_id] = deque(maxlen=JOIN_BUFFER_SIZE)
+        window.append(record)
+        now = record.timestamp
+        while window and now - window[0].timestamp > interval:
+            window.popleft()
+        self._dirty_windows.add(guild_id)
+        return window
+
+    async def _persist_windows(self):
+        """Write the compact join windows of changed guilds, only needed to survive a restart."""
+        dirty, self._dirty_windows = self._dirty_windows, set()
+        for guild_id in dirty:
+            window = self._join_windows.get(guild_id, ())
+            await self.config.guild_from_id(guild_id).join_timestamps.set([record.timestamp for record in window])
+
+    @tasks.loop(seconds=60)
+    async def persist_windows_loop(self):
+        await self._persist_windows()
+
+    @persist_windows_loop.before_loop
+    async def before_persist_windows_loop(self):
+        await self.bot.wait_until_ready()
+
     async def red_delete_data_for_user(self, *, requester, user_id: int):
         # No per-user data stored
         return
@@ -74,6 +140,7 @@ class JoinMonitor(commands.Cog):
             `[p]joinmonitor alerts` (to clear)
         """
         await self.config.guild(ctx.guild).alerts_channel.set(channel.id if channel else None)
+        self._invalidate_settings(ctx.guild)
         if channel:
             await ctx.send(f"Alerts channel set to {channel.mention}.")
         else:
@@ -120,6 +187,7 @@ class JoinMonitor(commands.Cog):
                         continue
         current.update(updates)
         await self.config.guild(ctx.guild).alert_criteria.set(current)
+        self._invalidate_settings(ctx.guild)
         await ctx.send(f"Updated alert criteria: `{current}`")
 
     @joinmonitor.command()
@@ -166,8 +234,131 @@ class JoinMonitor(commands.Cog):
         if enabled is not None:
             surge["enabled"] = enabled
         await self.config.guild(ctx.guild).surge.set(surge)
+        self._invalidate_settings(ctx.guild)
         await ctx.send(f"Surge config updated: `{surge}`")
 
+    @joinmonitor.command()
+    async def status(self, ctx):
+        """
+        Show the current join window and surge detection timings.
+
+        Detection latency is the time from the join that crossed the threshold to the surge handler starting.
+        """
+        settings = await self._get_settings(ctx.guild)
+        surge_conf = settings["surge"]
+        interval = surge_conf.get("interval_seconds", 30)
+        now = datetime.now(timezone.utc).timestamp()
+        window = self._join_windows.get(ctx.guild.id, ())
+        recent = sum(1 for record in window if now - record.timestamp <= interval)
+        lines = [f"Joins in the last {interval}s: {recent}/{surge_conf.get('threshold', 5)}"]
+        surge_until = self._surge_until.get(ctx.guild.id)
+        if surge_until and now < surge_until:
+            lines.append(f"Surge active until <t:{int(surge_until)}:T>")
+        stats = self._detection_latency.get(ctx.guild.id)
+        if stats:
+            lines.append(
+                f"Surges detected since load: {stats['surges']}, latency last {stats['last']:.1f} ms, max {stats['max']:.1f} ms"
+            )
+        else:
+            lines.append("No surges detected since load.")
+        await ctx.send("\n".join(lines))
+
+    @joinmonitor.group(invoke_without_command=True)
+    async def raid(self, ctx):
+        """
+        Review the latest surge cohort.
+
+        The cohort is every join from the start of the surge to the end of its cooldown. Members
+        are flagged when their account is younger than `min_account_age_days` or they belong to a
+        cluster of accounts created on the same day, with similar usernames or with the same avatar.
+
+        **Examples:**
+            `[p]joinmonitor raid`
+            `[p]joinmonitor raid ban Raid on 2024-05-01`
+            `[p]joinmonitor raid timeout 60`
+        """
+        report = self._cohorts.get(ctx.guild.id)
+        if report is None:
+            await ctx.send("No surge cohort has been analyzed since the cog was loaded.")
+            return
+        present = [member_id for member_id in report.flagged if ctx.guild.get_member(member_id)]
+        mentions = " ".join(f"<@{member_id}>" for member_id in present[:50])
+        if len(present) > 50:
+            mentions += f" and {len(present) - 50} more"
+        await ctx.send(
+            f"{report.summary()}\nStill in the server: {mentions or 'none'}",
+            allowed_mentions=discord.AllowedMentions.none(),
+        )
+
+    @raid.command(name="ban")
+    @commands.bot_has_permissions(ban_members=True)
+    @checks.admin_or_permissions(ban_members=True)
+    async def raid_ban(self, ctx, *, reason: str = "JoinMonitor: Raid cohort"):
+        """
+        Ban every flagged member of the latest surge cohort in one batch.
+        """
+        report = self._cohorts.get(ctx.guild.id)
+        if report is None or not report.flagged:
+            await ctx.send("There is no flagged cohort to ban.")
+            return
+        targets = [discord.Object(id=member_id) for member_id in report.flagged]
+        banned = 0
+        failed = 0
+        if hasattr(ctx.guild, "bulk_ban"):
+            # One request per 200 users
+            for start in range(0, len(targets), 200):
+                try:
+                    result = await ctx.guild.bulk_ban(targets[start:start + 200], reason=reason)
+                    banned += len(result.banned)
+                    failed += len(result.failed)
+                except discord.HTTPException:
+                    failed += len(targets[start:start + 200])
+        else:
+            banned, failed = await self._batched(ctx.guild.ban, targets, reason=reason)
+        self._cohorts.pop(ctx.guild.id, None)
+        # Later joins of the same surge re-analyze the cohort, which shouldn't flag these again
+        surge_joins = self._surge_joins.get(ctx.guild.id)
+        if surge_joins is not None:
+            surge_joins[:] = [record for record in surge_joins if record.member_id not in report.flagged]
+        await ctx.send(f"Banned {banned} members of the raid cohort, {failed} failed.")
+
+    @raid.command(name="timeout")
+    @commands.bot_has_permissions(moderate_members=True)
+    @checks.admin_or_permissions(moderate_members=True)
+    async def raid_timeout(self, ctx, minutes: int = 60, *, reason: str = "JoinMonitor: Raid cohort"):
+        """
+        Time out every flagged member of the latest surge cohort still in the server.
+
+        Discord caps timeouts at 28 days.
+        """
+        report = self._cohorts.get(ctx.guild.id)
+        members = [ctx.guild.get_member(member_id) for member_id in (report.flagged if report else ())]
+        members = [member for member in members if member is not None]
+        if not members:
+            await ctx.send("There is no flagged cohort to time out.")
+            return
+        duration = timedelta(minutes=max(1, min(minutes, 28 * 24 * 60)))
+        done, failed = await self._batched(
+            lambda member, **kwargs: member.timeout(duration, **kwargs), members, reason=reason
+        )
+        await ctx.send(f"Timed out {done} members of the raid cohort for {duration}, {failed} failed.")
+
+    async def _batched(self, action, targets, concurrency=5, **kwargs):
+        """Run `action` on every target with bounded concurrency, returning (succeeded, failed)."""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(target):
+            async with semaphore:
+                try:
+                    await action(target, **kwargs)
+                    return True
+                except discord.HTTPException:
+                    return False
+
+        results = await asyncio.gather(*(run(target) for target in targets))
+        succeeded = sum(results)
+        return succeeded, len(results) - succeeded
+
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
         """
@@ -176,25 +367,45 @@ class JoinMonitor(commands.Cog):
         Evaluates the new member against alert criteria and sends an alert if needed.
         Also checks for join surges and raises verification level if a surge is detected.
         """
+        joined_at = time.perf_counter()
         guild = member.guild
         conf = self.config.guild(guild)
-        alert_criteria = await conf.alert_criteria()
-        alerts_channel_id = await conf.alerts_channel()
-        surge_conf = await conf.surge()
-        join_timestamps = await conf.join_timestamps()
+        settings = await self._get_settings(guild)
+        alert_criteria = settings["alert_criteria"]
+        alerts_channel_id = settings["alerts_channel"]
+        surge_conf = settings["surge"]
 
         now = datetime.now(timezone.utc).timestamp()
-        join_timestamps.append(now)
         # Keep only recent joins within the interval
         interval = surge_conf.get("interval_seconds", 30)
-        join_timestamps = [ts for ts in join_timestamps if now - ts <= interval]
-        await conf.join_timestamps.set(join_timestamps)
+        record = JoinRecord.from_member(member, now)
+        window = self._record_join(guild.id, record, interval)
 
         # Check for surge
         if surge_conf.get("enabled", True):
             threshold = surge_conf.get("threshold", 5)
-            if len(join_timestamps) >= threshold:
-                await self._handle_surge(guild, conf, surge_conf, now)
+            surge_joins = self._surge_joins.get(guild.id)
+            surge_until = self._surge_until.get(guild.id)
+            if surge_until and now < surge_until:
+                # The cohort keeps every join until the cooldown ends, not just the sliding window
+                if surge_joins is None:
+                    surge_joins = self._surge_joins[guild.id] = list(window)
+                else:
+                    surge_joins.append(record)
+            elif len(window) >= threshold:
+                surge_joins = self._surge_joins[guild.id] = list(window)
+            elif surge_joins is not None:
+                # The cooldown ended without its task clearing the cohort, e.g. across a restart
+                self._surge_joins.pop(guild.id, None)
+                self._cohorts.pop(guild.id, None)
+                surge_joins = None
+            if surge_joins is not None:
+                # Re-analyze the cohort on every join of the surge so moderators act on the whole raid
+                self._cohorts[guild.id] = analyze_cohort(
+                    surge_joins, now, alert_criteria.get("min_account_age_days", 3)
+                )
+            if len(window) >= threshold:
+                await self._handle_surge(guild, conf, surge_conf, now, joined_at)
 
         # Evaluate alert criteria
         reasons = []
@@ -250,14 +461,24 @@ class JoinMonitor(commands.Cog):
                 embed.set_thumbnail(url=member.display_avatar.url if member.display_avatar else discord.Embed.Empty)
                 await channel.send(embed=embed)
 
-    async def _handle_surge(self, guild, conf, surge_conf, now_ts):
+    async def _handle_surge(self, guild, conf, surge_conf, now_ts, joined_at=None):
         """
         Internal: Handles raising the verification level during a join surge and notifying the alert channel.
+
+        `joined_at` is the `time.perf_counter()` reading taken when the threshold join arrived,
+        used to report how long detection took.
         """
         # Only act if not already in surge
-        surge_active_until = await conf.surge_active_until()
+        surge_active_until = self._surge_until.get(guild.id)
         if surge_active_until and now_ts < surge_active_until:
             return
+        latency_ms = None
+        if joined_at is not None:
+            latency_ms = (time.perf_counter() - joined_at) * 1000
+            stats = self._detection_latency.setdefault(guild.id, {"last": 0.0, "max": 0.0, "surges": 0})
+            stats["last"] = latency_ms
+            stats["max"] = max(stats["max"], latency_ms)
+            stats["surges"] += 1
         # Save current verification level
         try:
             current_level = guild.verification_level
@@ -271,6 +492,7 @@ class JoinMonitor(commands.Cog):
             return  # Insufficient permissions or error
 
         cooldown = surge_conf.get("cooldown_seconds", 300)
+        self._surge_until[guild.id] = now_ts + cooldown
         await conf.surge_active_until.set(now_ts + cooldown)
         # Schedule lowering verification level
         if guild.id in self._surge_tasks:
@@ -278,13 +500,16 @@ class JoinMonitor(commands.Cog):
         self._surge_tasks[guild.id] = self.bot.loop.create_task(self._lower_verification_later(guild, conf, cooldown))
 
         # Alert channel
-        alerts_channel_id = await conf.alerts_channel()
+        alerts_channel_id = (await self._get_settings(guild))["alerts_channel"]
         if alerts_channel_id:
             channel = guild.get_channel(alerts_channel_id)
             if channel:
-                await channel.send(
-                    f"⚠️ **Join surge detected!** Raised verification level to `{new_level_str}` for {cooldown} seconds."
-                )
+                detected = f" Detected {latency_ms:.1f} ms after the threshold join." if latency_ms is not None else ""
+                message = f"⚠️ **Join surge detected!** Raised verification level to `{new_level_str}` for {cooldown} seconds.{detected}"
+                report = self._cohorts.get(guild.id)
+                if report is not None:
+                    message += f"\n{report.summary()}\nUse `joinmonitor raid` to review the cohort and act on it."
+                await channel.send(message)
 
     async def _lower_verification_later(self, guild, conf, cooldown):
         """
@@ -299,9 +524,12 @@ class JoinMonitor(commands.Cog):
                     await guild.edit(verification_level=last_level, reason="JoinMonitor: Surge cooldown ended")
                 except Exception:
                     pass
+            self._surge_until.pop(guild.id, None)
+            self._surge_joins.pop(guild.id, None)
+            self._cohorts.pop(guild.id, None)
             await conf.surge_active_until.set(None)
             # Alert channel
-            alerts_channel_id = await conf.alerts_channel()
+            alerts_channel_id = (await self._get_settings(guild))["alerts_channel"]
             if alerts_channel_id:
                 channel = guild.get_channel(alerts_channel_id)
                 if channel:
@@ -0,0 +1,180 @@
+import asyncio
+import datetime
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import discord # type: ignore
+from red_commons.logging import getLogger # type: ignore
+
+logger = getLogger("red.beehive-cogs.ModLogging")
+
+ENTRY_TTL = 300  # Seconds an entry stays matchable after it was received
+ANY_TARGET_TTL = 30  # Shorter window when any target will do, so an older edit isn't blamed
+ENTRIES_PER_KEY = 5
+FETCH_LIMIT = 25
+FETCH_REUSE = 3  # Seconds a fallback fetch result is reused by other waiters
+
+Key = Tuple[discord.AuditLogAction, Any]
+
+
+class AuditLogWatcher:
+    """
+    Correlates log events with the audit log entries that explain them.
+
+    Entries from `on_audit_log_entry_create` are indexed per guild by (action, target id), by
+    (action, invite code) for invites and by (action, None) for "any target", and expire after
+    `ENTRY_TTL` seconds. Listeners `wait_for` an entry: a match already indexed is returned
+    straight away, otherwise the caller is parked on a future that `add` resolves when the entry
+    arrives, or gets None after the timeout. Nothing polls.
+
+    When the gateway doesn't deliver audit log events (the moderation intent is off) a timed-out
+    wait falls back to one `guild.audit_logs()` call per guild and action, shared by every waiter
+    that misses within a few seconds of it and fed back into the same index.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        # guild_id -> key -> [(received, entry)], oldest first
+        self.entries: Dict[int, Dict[Key, Deque[Tuple[float, discord.AuditLogEntry]]]] = {}
+        # guild_id -> [(received, key)] in arrival order, for expiry
+        self._order: Dict[int, Deque[Tuple[float, Key]]] = {}
+        # guild_id -> key -> [(future, extra)]
+        self._waiters: Dict[int, Dict[Key, List[Tuple[asyncio.Future, Optional[str]]]]] = {}
+        self._fetches: Dict[Tuple[int, discord.AuditLogAction], asyncio.Task] = {}
+        self._fetched_at: Dict[Tuple[int, discord.AuditLogAction], float] = {}
+
+    @property
+    def live(self) -> bool:
+        """Whether audit log entries are pushed to us by the gateway."""
+        return self.bot.intents.moderation
+
+    @staticmethod
+    def _keys(entry: discord.AuditLogEntry) -> List[Key]:
+        keys = [(entry.action, None)]
+        target_id = getattr(entry.target, "id", None)
+        if target_id is not None:
+            keys.append((entry.action, target_id))
+        code = getattr(entry.target, "code", None)
+        if code is not None:
+            keys.append((entry.action, code))
+        return keys
+
+    @staticmethod
+    def _matches(entry: discord.AuditLogEntry, extra: Optional[str]) -> bool:
+        return extra is None or getattr(entry.after, extra, None) is not None
+
+    def _prune(self, guild_id: int, now: float) -> None:
+        order = self._order.get(guild_id)
+        if not order:
+            return
+        entries = self.entries[guild_id]
+        expiry = now - ENTRY_TTL
+        while order and order[0][0] < expiry:
+            _received, key = order.popleft()
+            bucket = entries.get(key)
+            while bucket and bucket[0][0] < expiry:
+                bucket.popleft()
+            if not bucket:
+                entries.pop(key, None)
+
+    def add(self, entry: discord.AuditLogEntry) -> None:
+        guild_id = entry.guild.id
+        now = time.monotonic()
+        entries = self.entries.setdefault(guild_id, {})
+        order = self._order.setdefault(guild_id, deque())
+        self._prune(guild_id, now)
+        waiters = self._waiters.get(guild_id, {})
+        for key in self._keys(entry):
+            bucket = entries.setdefault(key, deque(maxlen=ENTRIES_PER_KEY))
+            if any(known.id == entry.id for _received, known in bucket):
+                # Fetched entries can overlap ones we already have
+                continue
+            bucket.append((now, entry))
+            order.append((now, key))
+            for future, extra in waiters.get(key, []):
+                if not future.done() and self._matches(entry, extra):
+                    future.set_result(entry)
+
+    def get(
+        self,
+        guild_id: int,
+        action: discord.AuditLogAction,
+        target_id: Any,
+        *,
+        extra: Optional[str] = None,
+    ) -> Optional[discord.AuditLogEntry]:
+        """The most recent indexed entry for `target_id`, or None."""
+        now = time.monotonic()
+        self._prune(guild_id, now)
+        bucket = self.entries.get(guild_id, {}).get((action, target_id))
+        if not bucket:
+            return None
+        for received, entry in reversed(bucket):
+            if target_id is None and now - received > ANY_TARGET_TTL:
+                break
+            if self._matches(entry, extra):
+                return entry
+        return None
+
+    async def wait_for(
+        self,
+        guild: discord.Guild,
+        action: discord.AuditLogAction,
+        target_id: Any,
+        *,
+        extra: Optional[str] = None,
+        timeout: float = 5.0,
+    ) -> Optional[discord.AuditLogEntry]:
+        entry = self.get(guild.id, action, target_id, extra=extra)
+        if entry is not None:
+            logger.trace("Found entry through cache")
+            return entry
+        key = (action, target_id)
+        future = asyncio.get_running_loop().create_future()
+        waiters = self._waiters.setdefault(guild.id, {}).setdefault(key, [])
+        waiters.append((future, extra))
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            waiters.remove((future, extra))
+            if not waiters:
+                self._waiters[guild.id].pop(key, None)
+        if self.live:
+            # Every entry is pushed to us, so nothing arriving means there is nothing to find
+            return None
+        await self._fetch(guild, action)
+        return self.get(guild.id, action, target_id, extra=extra)
+
+    async def _fetch(self, guild: discord.Guild, action: discord.AuditLogAction) -> None:
+        fetch_key = (guild.id, action)
+        task = self._fetches.get(fetch_key)
+        if task is None:
+            if time.monotonic() - self._fetched_at.get(fetch_key, 0) < FETCH_REUSE:
+                return
+            task = self._fetches[fetch_key] = asyncio.create_task(self._do_fetch(guild, action))
+        try:
+            await asyncio.shield(task)
+        except Exception:
+            logger.exception("Error fetching audit logs in %s", guild.id)
+
+    async def _do_fetch(self, guild: discord.Guild, action: discord.AuditLogAction) -> None:
+        fetch_key = (guild.id, action)
+        try:
+            after = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(
+                seconds=ENTRY_TTL
+            )
+            entries = [
+                log
+                async for log in guild.audit_logs(limit=FETCH_LIMIT, action=action)
+                if log.created_at >= after
+            ]
+            # Oldest first so the newest entry ends up last in each bucket
+            for log in reversed(entries):
+                self.add(log)
+            logger.trace("Fetched %s audit log entries for %s", len(entries), action)
+        finally:
+            self._fetched_at[fetch_key] = time.monotonic()
+            del self._fetches[fetch_key]
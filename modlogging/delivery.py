@@ -0,0 +1,177 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import discord # type: ignore
+from red_commons.logging import getLogger # type: ignore
+
+logger = getLogger("red.beehive-cogs.ModLogging")
+
+MAX_EMBEDS = 10  # Discord's limit of embeds per message
+MAX_EMBED_CHARS = 6000  # Discord's limit on the combined size of every embed in a message
+MAX_CONTENT = 2000
+FLUSH_DELAY = 2.0  # Seconds the oldest queued log may wait for others to join it
+MAX_QUEUE = 500  # Logs held per channel before new ones are dropped
+SHUTDOWN_TIMEOUT = 5.0
+
+
+class ChannelQueue:
+    """Pending logs and delivery counters for one log channel."""
+
+    def __init__(self, channel: discord.abc.Messageable):
+        self.channel = channel
+        # (time queued, content, embed) - exactly one of content and embed is set
+        self.items: Deque[Tuple[float, Optional[str], Optional[discord.Embed]]] = deque()
+        self.full = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.delivered = 0
+        self.messages = 0
+        self.dropped = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+
+class LogDelivery:
+    """
+    Per-channel batched delivery of log messages.
+
+    Listeners hand their embed or text to `enqueue` and return straight away. Each channel gets
+    a worker task that waits until the oldest pending log is `flush_delay` seconds old, or until
+    a full message's worth is waiting, and then packs consecutive embeds (up to 10) or
+    consecutive text lines (up to 2000 characters) into a single send. A backlog is sent back
+    to back in full batches, so a purge or raid costs a tenth of the sends it used to.
+    """
+
+    def __init__(
+        self,
+        allowed_mentions: discord.AllowedMentions,
+        flush_delay: float = FLUSH_DELAY,
+        max_queue: int = MAX_QUEUE,
+    ):
+        self.allowed_mentions = allowed_mentions
+        self.flush_delay = flush_delay
+        self.max_queue = max_queue
+        self.queues: Dict[int, ChannelQueue] = {}
+
+    def enqueue(
+        self,
+        channel: discord.abc.Messageable,
+        content: Optional[str] = None,
+        *,
+        embed: Optional[discord.Embed] = None,
+    ) -> bool:
+        """Queue a log for `channel`. Returns False when the channel's queue is full and it was dropped."""
+        queue = self.queues.get(channel.id)
+        if queue is None:
+            queue = self.queues[channel.id] = ChannelQueue(channel)
+        queue.channel = channel
+        if len(queue.items) >= self.max_queue:
+            queue.dropped += 1
+            return False
+        if content is not None:
+            content = content[:MAX_CONTENT]
+        queue.items.append((time.monotonic(), content, embed))
+        if queue.task is None or queue.task.done():
+            queue.task = asyncio.create_task(self._worker(queue))
+        elif len(queue.items) >= MAX_EMBEDS:
+            queue.full.set()
+        return True
+
+    async def _worker(self, queue: ChannelQueue) -> None:
+        while queue.items:
+            wait = queue.items[0][0] + self.flush_delay - time.monotonic()
+            if wait > 0 and len(queue.items) < MAX_EMBEDS:
+                queue.full.clear()
+                try:
+                    await asyncio.wait_for(queue.full.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+            await self._send_batch(queue)
+
+    def _take_batch(self, queue: ChannelQueue) -> Tuple[List[float], Optional[str], List[discord.Embed]]:
+        """Pop the longest run of same-kind logs at the head of the queue that fits in one message."""
+        queued_at: List[float] = []
+        lines: List[str] = []
+        embeds: List[discord.Embed] = []
+        length = 0
+        while queue.items:
+            ts, content, embed = queue.items[0]
+            if embed is not None:
+                if lines or len(embeds) >= MAX_EMBEDS:
+                    break
+                size = len(embed)
+                if embeds and length + size > MAX_EMBED_CHARS:
+                    break
+                embeds.append(embed)
+            else:
+                if embeds or (lines and ">>>" in lines[-1]):
+                    # A ">>>" block quote runs to the end of the message and would swallow the next log
+                    break
+                size = len(content) + (1 if lines else 0)
+                if lines and length + size > MAX_CONTENT:
+                    break
+                lines.append(content)
+            length += size
+            queued_at.append(ts)
+            queue.items.popleft()
+        return queued_at, "\n".join(lines) if lines else None, embeds
+
+    async def _send_batch(self, queue: ChannelQueue) -> None:
+        queued_at, content, embeds = self._take_batch(queue)
+        if not queued_at:
+            return
+        try:
+            await queue.channel.send(
+                content=content, embeds=embeds, allowed_mentions=self.allowed_mentions
+            )
+        except discord.HTTPException as e:
+            queue.dropped += len(queued_at)
+            logger.error(
+                "Error delivering %s logs to channel %s: %s", len(queued_at), queue.channel.id, e
+            )
+            return
+        now = time.monotonic()
+        queue.messages += 1
+        queue.delivered += len(queued_at)
+        for ts in queued_at:
+            latency = now - ts
+            queue.total_latency += latency
+            queue.max_latency = max(queue.max_latency, latency)
+
+    def channel_stats(self, channel_id: int) -> Optional[Dict[str, Any]]:
+        queue = self.queues.get(channel_id)
+        if queue is None:
+            return None
+        return {
+            "depth": len(queue.items),
+            "delivered": queue.delivered,
+            "messages": queue.messages,
+            "dropped": queue.dropped,
+            "avg_latency": queue.total_latency / queue.delivered if queue.delivered else 0.0,
+            "max_latency": queue.max_latency,
+        }
+
+    def guild_stats(self, guild_id: int) -> Dict[int, Dict[str, Any]]:
+        return {
+            channel_id: self.channel_stats(channel_id)
+            for channel_id, queue in self.queues.items()
+            if getattr(getattr(queue.channel, "guild", None), "id", None) == guild_id
+        }
+
+    async def close(self) -> None:
+        """Stop the workers and make a last, bounded attempt to deliver what is still queued."""
+        for queue in self.queues.values():
+            if queue.task is not None and not queue.task.done():
+                queue.task.cancel()
+
+        async def drain(queue: ChannelQueue) -> None:
+            while queue.items:
+                await self._send_batch(queue)
+
+        pending = [drain(queue) for queue in self.queues.values() if queue.items]
+        if pending:
+            try:
+                await asyncio.wait_for(asyncio.gather(*pending), timeout=SHUTDOWN_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("Timed out delivering queued logs on unload")
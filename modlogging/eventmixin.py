@@ -1,8 +1,7 @@
 import asyncio
 import datetime
-from collections import deque
 from enum import Enum
-from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple, Union, cast
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union, cast
 
 import discord # type: ignore
 from discord.ext import tasks # type: ignore
@@ -20,6 +19,11 @@ from redbot.core.utils.chat_formatting import ( # type: ignore
     pagify,
 )
 
+from .auditlog import AuditLogWatcher
+from .delivery import LogDelivery
+from .invites import InviteTracker, invite_data
+from .routing import GuildRoutes
+
 _ = i18n.Translator("Logging", __file__)
 logger = getLogger("red.beehive-cogs.Logging")
 
@@ -121,47 +125,37 @@ class EventMixin:
     settings: Dict[int, Any]
     _ban_cache: Dict[int, List[int]]
     allowed_mentions: discord.AllowedMentions
-    audit_log: Dict[int, Deque[discord.AuditLogEntry]]
+    audit_watcher: AuditLogWatcher
+    invite_tracker: InviteTracker
+    log_delivery: LogDelivery
+    _routes: Dict[int, GuildRoutes]
+
+    async def get_routes(self, guild: discord.Guild) -> GuildRoutes:
+        routes = self._routes.get(guild.id)
+        if routes is None or routes.stale:
+            try:
+                default_channel = await modlog.get_logging_channel(guild)
+            except RuntimeError:
+                default_channel = None
+            routes = GuildRoutes(self.settings[guild.id], getattr(default_channel, "id", None))
+            self._routes[guild.id] = routes
+        return routes
+
+    def invalidate_routes(self, guild: discord.Guild) -> None:
+        self._routes.pop(guild.id, None)
 
     async def get_event_colour(
         self, guild: discord.Guild, event_type: str, changed_object: Optional[discord.Role] = None
     ) -> discord.Colour:
-        if guild.text_channels:
-            cmd_colour = await self.bot.get_embed_colour(guild.text_channels[0])
-        else:
-            cmd_colour = discord.Colour.red()
-        defaults = {
-            "message_edit": discord.Colour.orange(),
-            "message_delete": 0xff4545,
-            "user_change": discord.Colour.greyple(),
-            "role_change": changed_object.colour if changed_object else discord.Colour.blue(),
-            "role_create": discord.Colour.blue(),
-            "role_delete": discord.Colour.dark_blue(),
-            "voice_change": discord.Colour.magenta(),
-            "user_join": discord.Colour.green(),
-            "user_left": discord.Colour.dark_green(),
-            "channel_change": discord.Colour.teal(),
-            "channel_create": discord.Colour.teal(),
-            "channel_delete": 0xff4545,
-            "guild_change": discord.Colour.blurple(),
-            "emoji_change": discord.Colour.gold(),
-            "stickers_change": discord.Colour.gold(),
-            "commands_used": 0xfffffe,
-            "invite_created": discord.Colour.blurple(),
-            "invite_deleted": 0xff4545,
-            "thread_change": discord.Colour.teal(),
-            "thread_create": discord.Colour.teal(),
-            "thread_delete": 0xff4545,
-        }
-        colour = defaults[event_type]
-        if self.settings[guild.id][event_type]["colour"] is not None:
-            colour = discord.Colour(self.settings[guild.id][event_type]["colour"])
-        return colour
+        route = (await self.get_routes(guild)).routes[event_type]
+        if changed_object is not None and not route.custom_colour:
+            return changed_object.colour
+        return route.colour
 
     async def is_ignored_channel(
         self, guild: discord.Guild, channel: Union[discord.abc.GuildChannel, discord.Thread, int]
     ) -> bool:
-        ignored_channels = self.settings[guild.id]["ignored_channels"]
+        ignored_channels = (await self.get_routes(guild)).ignored_channels
         if isinstance(channel, int):
             # This is mainly here because you can have threads parent channel
             # deleted which would make the return of `thread.parent` be `None`.
@@ -181,15 +175,15 @@ class EventMixin:
         return False
 
     async def modlog_channel(self, guild: discord.Guild, event: str) -> discord.TextChannel:
+        routes = await self.get_routes(guild)
         channel = None
-        settings = self.settings[guild.id].get(event)
-        if "channel" in settings and settings["channel"]:
-            channel = guild.get_channel(settings["channel"])
+        route = routes.routes.get(event)
+        if route is not None and route.channel_id:
+            channel = guild.get_channel(route.channel_id)
+        if channel is None and routes.default_channel_id:
+            channel = guild.get_channel(routes.default_channel_id)
         if channel is None:
-            try:
-                channel = await modlog.get_logging_channel(guild)
-            except RuntimeError:
-                raise RuntimeError("No Modlog set")
+            raise RuntimeError("No Modlog set")
         if not channel.permissions_for(guild.me).send_messages:
             raise RuntimeError("No permission to send messages in channel")
         return channel
@@ -341,7 +335,7 @@ class EventMixin:
             embed.add_field(name=_("User needs"), value=role)
             if i_require:
                 embed.add_field(name=_("Bot needs"), value=i_require)
-            await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, embed=embed)
         else:
             infomessage = _(
                 "{emoji} {time} {author}(`{a_id}`) used the following command in {channel}\n> {com}"
@@ -353,7 +347,7 @@ class EventMixin:
                 channel=message.channel.mention,
                 com=com_str,
             )
-            await channel.send(infomessage[:2000], allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, infomessage)
 
     @commands.Cog.listener(name="on_raw_message_delete")
     async def on_raw_message_delete_listener(
@@ -404,7 +398,7 @@ class EventMixin:
                 )
                 embed.add_field(name=_("Channel"), value=message_channel.mention)
                 embed.add_field(name=_("Message ID"), value=box(str(payload.message_id)))
-                await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+                self.log_delivery.enqueue(channel, embed=embed)
             else:
                 infomessage = _(
                     "{emoji} {time} A message ({message_id}) was deleted in {channel}"
@@ -414,9 +408,8 @@ class EventMixin:
                     message_id=box(str(payload.message_id)),
                     channel=message_channel.mention,
                 )
-                await channel.send(
-                    f"{infomessage}\n> *Message's content unknown.*",
-                    allowed_mentions=self.allowed_mentions,
+                self.log_delivery.enqueue(
+                    channel, f"{infomessage}\n> *Message's content unknown.*"
                 )
             return
         await self._cached_message_delete(
@@ -511,12 +504,10 @@ class EventMixin:
             if replying:
                 embed.add_field(name=_("Replying to:"), value=replying)
 
-            await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, embed=embed)
         else:
             clean_msg = message.clean_content[: (1990 - len(infomessage))]
-            await channel.send(
-                f"{infomessage}\n>>> {clean_msg}", allowed_mentions=self.allowed_mentions
-            )
+            self.log_delivery.enqueue(channel, f"{infomessage}\n>>> {clean_msg}")
 
     @commands.Cog.listener()
     async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
@@ -561,7 +552,7 @@ class EventMixin:
             )
             embed.add_field(name=_("Channel"), value=message_channel.mention)
             embed.add_field(name=_("Messages deleted"), value=str(message_amount))
-            await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, embed=embed)
         else:
             infomessage = _(
                 "{emoji} {time} Bulk message delete in {channel}, {amount} messages deleted."
@@ -571,7 +562,7 @@ class EventMixin:
                 amount=message_amount,
                 channel=message_channel.mention,
             )
-            await channel.send(infomessage, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, infomessage)
         if settings["bulk_individual"]:
             for message in payload.cached_messages:
                 new_payload = discord.RawMessageDeleteEvent(
@@ -583,9 +574,14 @@ class EventMixin:
                 except Exception:
                     pass
 
-    @tasks.loop(seconds=300)
+    @tasks.loop(hours=1)
     async def invite_links_loop(self) -> None:
-        """Check every 5 minutes for updates to the invite links"""
+        """
+        Resync the invite links every hour.
+
+        Invite events and the snapshot taken for each join burst keep the cache current,
+        this only catches drift such as missed gateway events.
+        """
         for guild_id in self.settings.keys():
             guild = self.bot.get_guild(guild_id)
             if guild is None:
@@ -598,40 +594,14 @@ class EventMixin:
         await self.bot.wait_until_red_ready()
 
     async def save_invite_links(self, guild: discord.Guild) -> bool:
-        invites = {}
         if not guild.me.guild_permissions.manage_guild:
             return False
-        try:
-            for invite in await guild.invites():
-                created_at = getattr(
-                    invite, "created_at", datetime.datetime.now(datetime.timezone.utc)
-                )
-                channel = getattr(invite, "channel", discord.Object(id=0))
-                inviter = getattr(invite, "inviter", discord.Object(id=0))
-                invites[invite.code] = {
-                    "uses": getattr(invite, "uses", 0),
-                    "max_age": getattr(invite, "max_age", None),
-                    "created_at": created_at.timestamp(),
-                    "max_uses": getattr(invite, "max_uses", None),
-                    "temporary": getattr(invite, "temporary", False),
-                    "inviter": getattr(inviter, "id", "Unknown"),
-                    "channel": getattr(channel, "id", "Unknown"),
-                }
-        except discord.HTTPException:
-            logger.error("Error saving invites for guild %s. Discord Server Error.", guild.id)
-            return False
-        except Exception:
-            logger.exception("Error saving invites for guild %s.", guild.id)
-            return False
-
-        self.settings[guild.id]["invite_links"] = invites
-        await self.save(guild)
-        return True
+        # Same lock and path as the join bursts, so this can't overwrite a snapshot being diffed
+        return await self.invite_tracker.resync(guild)
 
     async def get_invite_link(self, member: discord.Member) -> str:
         guild = member.guild
         manage_guild = guild.me.guild_permissions.manage_guild
-        invites = self.settings[guild.id]["invite_links"]
         possible_link = ""
         check_logs = manage_guild and guild.me.guild_permissions.view_audit_log
         if member.bot:
@@ -641,56 +611,25 @@ class EventMixin:
                 if entry:
                     possible_link = _("Added by: {inviter}").format(inviter=str(entry.user))
             return possible_link
-        if manage_guild and "VANITY_URL" in guild.features:
-            try:
-                possible_link = str(await guild.vanity_invite())
-            except (discord.errors.NotFound, discord.errors.HTTPException):
-                pass
-
-        if invites and manage_guild:
-            guild_invites = await guild.invites()
-            for invite in guild_invites:
-                if invite.code in invites:
-                    uses = invites[invite.code]["uses"]
-                    # we can't get accurate information if the uses is None
-                    if invite.uses is None or uses is None:
-                        continue
-                    if invite.uses > uses:
-                        possible_link = _(
-                            "https://discord.gg/{code}\nInvited by: {inviter}"
-                        ).format(
-                            code=invite.code,
-                            inviter=str(
-                                getattr(invite.inviter, "mention", _("Web integration"))
-                            ),
-                        )
 
-            if not possible_link:
-                for code, data in invites.items():
-                    try:
-                        invite = await self.bot.fetch_invite(code)
-                    except Exception:
-                        logger.error("Error getting invite {code}".format(code=code))
-                        invite = None
-                        pass
-                    if invite is None:
-                        if (data["max_uses"] - data["uses"]) == 1:
-                            # The invite link was on its last uses and subsequently
-                            # deleted so we're fairly sure this was the one used
-                            try:
-                                inviter = guild.get_member(data["inviter"])
-                                if inviter is None:
-                                    inviter = await self.bot.fetch_user(data["inviter"])
-                                if inviter is not None:
-                                    inviter = inviter.mention
-                            except (discord.errors.NotFound, discord.errors.Forbidden):
-                                inviter = _("Unknown or deleted user ({inviter})").format(
-                                    inviter=data["inviter"]
-                                )
-                            possible_link = _(
-                                "https://discord.gg/{code}\nInvited by: {inviter}"
-                            ).format(code=code, inviter=str(inviter))
-            await self.save_invite_links(guild)  # Save all the invites again since they've changed
+        if manage_guild:
+            used = await self.invite_tracker.used_invites(member)
+            links = []
+            for code, data, uses in used:
+                if isinstance(data["inviter"], int) and data["inviter"]:
+                    inviter = f"<@{data['inviter']}>"
+                else:
+                    inviter = _("Web integration")
+                links.append(
+                    _("https://discord.gg/{code}\nInvited by: {inviter}").format(
+                        code=code, inviter=inviter
+                    )
+                )
+            if len(links) == 1:
+                possible_link = links[0]
+            elif links:
+                # Several invites were used in the same burst of joins
+                possible_link = _("One of:\n{links}").format(links="\n".join(links))
         if check_logs and not possible_link:
             action = discord.AuditLogAction.invite_create
             entry = await self.get_audit_log_entry(guild, None, action)
@@ -744,7 +683,7 @@ class EventMixin:
             if possible_link:
                 embed.add_field(name=_("Invite used"), value=possible_link, inline=False)
             embed.set_thumbnail(url=member.display_avatar)
-            await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, embed=embed)
         else:
             time = datetime.datetime.now(datetime.timezone.utc)
             msg = _(
@@ -756,7 +695,7 @@ class EventMixin:
                 m_id=member.id,
                 users=users,
             )
-            await channel.send(msg, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, msg)
 
     @commands.Cog.listener()
     async def on_member_ban(self, guild: discord.Guild, member: discord.Member):
@@ -821,7 +760,7 @@ class EventMixin:
             if reason:
                 embed.add_field(name=_("Reason"), value=str(reason), inline=False)
             embed.set_thumbnail(url=member.display_avatar)
-            await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, embed=embed)
         else:
             time = datetime.datetime.now(datetime.timezone.utc)
             msg = _(
@@ -845,7 +784,7 @@ class EventMixin:
                     perp=perp,
                     users=len(guild.members),
                 )
-            await channel.send(msg, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, msg)
 
     async def get_permission_change(
         self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel, embed_links: bool
@@ -980,9 +919,9 @@ class EventMixin:
             channel=new_channel.mention,
         )
         if embed_links:
-            await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, embed=embed)
         else:
-            await channel.send(msg, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, msg)
 
     @commands.Cog.listener()
     async def on_guild_channel_delete(self, old_channel: discord.abc.GuildChannel):
@@ -1042,15 +981,13 @@ class EventMixin:
             channel=f"#{old_channel.name} ({old_channel.id})",
         )
         if embed_links:
-            await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, embed=embed)
         else:
-            await channel.send(msg, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, msg)
 
     @commands.Cog.listener()
     async def on_audit_log_entry_create(self, entry: discord.AuditLogEntry):
-        if entry.guild.id not in self.audit_log:
-            self.audit_log[entry.guild.id] = deque(maxlen=10)
-        self.audit_log[entry.guild.id].append(entry)
+        self.audit_watcher.add(entry)
 
     async def get_audit_log_entry(
         self,
@@ -1068,7 +1005,6 @@ class EventMixin:
         *,
         extra: Optional[str] = None,
     ) -> Optional[discord.AuditLogEntry]:
-        entry = None
         if isinstance(target, int) or target is None:
             target_id = target
         elif isinstance(target, discord.Invite):
@@ -1076,36 +1012,10 @@ class EventMixin:
         else:
             target_id = target.id
 
-        if guild.me.guild_permissions.view_audit_log:
-            await asyncio.sleep(5)
-            # wait 5 seconds incase the audit log entry is slow and we prioritize the cache
-            if guild.id in self.audit_log:
-                for log in self.audit_log[guild.id]:
-                    if log.action != action:
-                        continue
-                    if extra is not None:
-                        if getattr(log.after, extra, None) is None:
-                            continue
-                    if target_id == getattr(log.target, "id", None):
-                        logger.trace("Found entry through cache")
-                        entry = log
-                    if target_id == getattr(log.target, "code", None):
-                        logger.trace("Found invite code entry through cache")
-                        entry = log
-
-            if entry is None:
-                async for log in guild.audit_logs(limit=5, action=action):
-                    if extra is not None:
-                        if getattr(log.after, extra, None) is None:
-                            continue
-                    if target_id == getattr(log.target, "id", None):
-                        logger.trace("Found perp through fetch")
-                        entry = log
-                        break
-                    if target_id == getattr(log.target, "code", None):
-                        logger.trace("Found invite code entry through fetch")
-                        entry = log
-        return entry
+        if not guild.me.guild_permissions.view_audit_log:
+            return None
+        # None matches the most recent entry for the action whatever its target
+        return await self.audit_watcher.wait_for(guild, action, target_id, extra=extra)
 
     @commands.Cog.listener()
     async def on_guild_channel_update(
@@ -1217,9 +1127,9 @@ class EventMixin:
         if not worth_updating:
             return
         if embed_links:
-            await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, embed=embed)
         else:
-            await channel.send(msg, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, msg)
 
     async def get_role_permission_change(self, before: discord.Role, after: discord.Role) -> str:
         p_msg = ""
@@ -1326,9 +1236,9 @@ class EventMixin:
         if not worth_updating:
             return
         if embed_links:
-            await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, embed=embed)
         else:
-            await channel.send(msg, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, msg)
 
     @commands.Cog.listener()
     async def on_guild_role_create(self, role: discord.Role) -> None:
@@ -1401,9 +1311,9 @@ class EventMixin:
             msg += _("Reason ") + str(reason) + "\n"
 
         if embed_links:
-            await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, embed=embed)
         else:
-            await channel.send(msg, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, msg)
 
     @commands.Cog.listener()
     async def on_guild_role_delete(self, role: discord.Role) -> None:
@@ -1476,9 +1386,9 @@ class EventMixin:
             msg += _("Reason ") + str(reason) + "\n"
 
         if embed_links:
-            await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, embed=embed)
         else:
-            await channel.send(msg, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, msg)
 
     @commands.Cog.listener()
     async def on_message_edit(self, before: discord.Message, after: discord.Message) -> None:
@@ -1551,7 +1461,7 @@ class EventMixin:
                 ),
                 icon_url=str(before.author.display_avatar),
             )
-            await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, embed=embed)
         else:
             msg = _(
                 "{emoji} {time} **{author}** (`{a_id}`) edited a message "
@@ -1565,7 +1475,7 @@ class EventMixin:
                 before=before.content,
                 after=after.jump_url,
             )
-            await channel.send(msg[:2000], allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, msg)
 
     @commands.Cog.listener()
     async def on_guild_update(self, before: discord.Guild, after: discord.Guild) -> None:
@@ -1696,9 +1606,9 @@ class EventMixin:
             )
             if guild.icon:
                 embed.set_thumbnail(url=guild.icon)
-            await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, embed=embed)
         else:
-            await channel.send(msg, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, msg)
 
     @commands.Cog.listener()
     async def on_guild_emojis_update(
@@ -1889,9 +1799,9 @@ class EventMixin:
             )
             msg += _("\nReason ") + str(reason)
         if embed_links:
-            await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, embed=embed)
         else:
-            await channel.send(msg, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, msg)
 
     @commands.Cog.listener()
     async def on_voice_state_update(
@@ -2011,9 +1921,9 @@ class EventMixin:
             msg += _("Reason ") + reason + "\n"
             embed.add_field(name=_("Reason "), value=reason, inline=False)
         if embed_links:
-            await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, embed=embed)
         else:
-            await channel.send(msg, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, msg)
 
     @commands.Cog.listener()
     async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
@@ -2154,9 +2064,9 @@ class EventMixin:
             embed.add_field(name=_("Reason"), value=reason, inline=False)
         embed.add_field(name=_("Member ID"), value=box(str(after.id)))
         if embed_links:
-            await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, embed=embed)
         else:
-            await channel.send(msg, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, msg)
 
     @commands.Cog.listener()
     async def on_invite_create(self, invite: discord.Invite) -> None:
@@ -2175,20 +2085,7 @@ class EventMixin:
         if guild.me.is_timed_out():
             return
         if invite.code not in self.settings[guild.id]["invite_links"]:
-            created_at = getattr(
-                invite, "created_at", datetime.datetime.now(datetime.timezone.utc)
-            )
-            inviter = getattr(invite, "inviter", discord.Object(id=0))
-            channel = getattr(invite, "channel", discord.Object(id=0))
-            self.settings[guild.id]["invite_links"][invite.code] = {
-                "uses": getattr(invite, "uses", 0),
-                "max_age": getattr(invite, "max_age", None),
-                "created_at": created_at.timestamp(),
-                "max_uses": getattr(invite, "max_uses", None),
-                "temporary": getattr(invite, "temporary", False),
-                "inviter": getattr(inviter, "id", "Unknown"),
-                "channel": channel.id,
-            }
+            self.settings[guild.id]["invite_links"][invite.code] = invite_data(invite)
             await self.save(guild)
         if not self.settings[guild.id]["invite_created"]["enabled"]:
             return
@@ -2255,9 +2152,9 @@ class EventMixin:
         if not worth_updating:
             return
         if embed_links:
-            await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, embed=embed)
         else:
-            await channel.send(msg, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, msg)
 
     @commands.Cog.listener()
     async def on_invite_delete(self, invite: discord.Invite) -> None:
@@ -2271,6 +2168,7 @@ class EventMixin:
             return
         if guild.id not in self.settings:
             return
+        self.invite_tracker.forget(guild, invite.code)
         if await self.bot.cog_disabled_in_guild(self, guild):
             return
         if guild.me.is_timed_out():
@@ -2349,9 +2247,9 @@ class EventMixin:
         if not worth_updating:
             return
         if embed_links:
-            await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, embed=embed)
         else:
-            await channel.send(msg, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, msg)
 
     @commands.Cog.listener()
     async def on_thread_create(self, thread: discord.Thread) -> None:
@@ -2413,9 +2311,9 @@ class EventMixin:
             channel=thread.mention,
         )
         if embed_links:
-            await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, embed=embed)
         else:
-            await channel.send(msg, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, msg)
 
     @commands.Cog.listener()
     async def on_raw_thread_delete(self, payload: discord.RawThreadDeleteEvent):
@@ -2486,9 +2384,9 @@ class EventMixin:
             channel=f"#{description} ({payload.thread_id})",
         )
         if embed_links:
-            await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, embed=embed)
         else:
-            await channel.send(msg, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, msg)
 
     @commands.Cog.listener()
     async def on_thread_update(self, before: discord.Thread, after: discord.Thread) -> None:
@@ -2584,9 +2482,9 @@ class EventMixin:
         if not worth_updating:
             return
         if embed_links:
-            await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, embed=embed)
         else:
-            await channel.send(msg, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, msg)
 
     @commands.Cog.listener()
     async def on_guild_stickers_update(
@@ -2728,6 +2626,6 @@ class EventMixin:
             msg += _("Reason ") + reason + "\n"
             embed.add_field(name=_("Reason "), value=reason, inline=False)
         if embed_links:
-            await channel.send(embed=embed, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, embed=embed)
         else:
-            await channel.send(msg, allowed_mentions=self.allowed_mentions)
+            self.log_delivery.enqueue(channel, msg)
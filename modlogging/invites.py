@@ -0,0 +1,162 @@
+import asyncio
+import datetime
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import discord # type: ignore
+from red_commons.logging import getLogger # type: ignore
+
+logger = getLogger("red.beehive-cogs.ModLogging")
+
+JOIN_DEBOUNCE = 2.0  # Seconds a join waits for others before the burst's snapshot is taken
+DELETED_TTL = 60  # Seconds a deleted invite is still considered for joins
+
+
+def invite_data(invite: discord.Invite) -> Dict[str, Any]:
+    """The cached form of an invite, as stored in the `invite_links` setting."""
+    created_at = getattr(invite, "created_at", None) or datetime.datetime.now(
+        datetime.timezone.utc
+    )
+    channel = getattr(invite, "channel", discord.Object(id=0))
+    inviter = getattr(invite, "inviter", discord.Object(id=0))
+    return {
+        "uses": getattr(invite, "uses", 0),
+        "max_age": getattr(invite, "max_age", None),
+        "created_at": created_at.timestamp(),
+        "max_uses": getattr(invite, "max_uses", None),
+        "temporary": getattr(invite, "temporary", False),
+        "inviter": getattr(inviter, "id", "Unknown"),
+        "channel": getattr(channel, "id", "Unknown"),
+    }
+
+
+class JoinBurst:
+    """Joins waiting on the same invite snapshot."""
+
+    def __init__(self):
+        self.members = 0
+        self.result: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class InviteTracker:
+    """
+    Works out which invite members joined with from one shared snapshot per join burst.
+
+    The cog's `invite_links` setting is the cache of invite uses. `on_invite_create` adds to it
+    and `on_invite_delete` moves the code aside for a short while, since an invite that reached
+    its max uses is deleted by Discord right as the member joins. The first join in a guild
+    starts a burst; every join in the next `JOIN_DEBOUNCE` seconds shares it, and the burst
+    costs a single `guild.invites()` call (plus the vanity invite where there is one) whose
+    counts are diffed against the cache and then become the new cache. Snapshots in one guild
+    are serialized so each diff starts from the previous snapshot.
+    """
+
+    def __init__(self, cog):
+        self.cog = cog
+        self._bursts: Dict[int, JoinBurst] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+        # guild_id -> code -> (deleted at, cached data)
+        self._deleted: Dict[int, Dict[str, Tuple[float, Dict[str, Any]]]] = {}
+
+    def forget(self, guild: discord.Guild, code: str) -> None:
+        """Called when an invite is deleted."""
+        data = self.cog.settings[guild.id]["invite_links"].pop(code, None)
+        if data is not None:
+            self._deleted.setdefault(guild.id, {})[code] = (time.monotonic(), data)
+
+    async def snapshot(self, guild: discord.Guild) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Every current invite of `guild` in cached form, or None if they can't be fetched."""
+        invites = {}
+        try:
+            for invite in await guild.invites():
+                invites[invite.code] = invite_data(invite)
+            if "VANITY_URL" in guild.features:
+                vanity = await guild.vanity_invite()
+                if vanity is not None:
+                    invites[vanity.code] = invite_data(vanity)
+        except discord.HTTPException:
+            logger.error("Error saving invites for guild %s. Discord Server Error.", guild.id)
+            return None
+        except Exception:
+            logger.exception("Error saving invites for guild %s.", guild.id)
+            return None
+        return invites
+
+    async def refresh(self, guild: discord.Guild) -> Optional[List[Tuple[str, Dict[str, Any], int]]]:
+        """
+        Replace the cache with a fresh snapshot.
+
+        Returns the invites used since the last one as (code, data, new uses), most used first,
+        or None if the snapshot couldn't be taken and the cache was left alone.
+        """
+        lock = self._locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            invites = await self.snapshot(guild)
+            if invites is None:
+                return None
+            cached = self.cog.settings[guild.id]["invite_links"]
+            used = []
+            for code, data in invites.items():
+                before = cached.get(code, {}).get("uses")
+                # we can't get accurate information if the uses is None
+                if before is None or data["uses"] is None:
+                    continue
+                if data["uses"] > before:
+                    used.append((code, data, data["uses"] - before))
+
+            now = time.monotonic()
+            deleted = self._deleted.pop(guild.id, {})
+            # Invites that vanished without a delete event are also candidates
+            for code, data in cached.items():
+                if code not in invites:
+                    deleted.setdefault(code, (now, data))
+            for code, (deleted_at, data) in deleted.items():
+                if now - deleted_at > DELETED_TTL or code in invites:
+                    continue
+                if data["max_uses"] and data["uses"] is not None:
+                    if data["max_uses"] - data["uses"] == 1:
+                        # The invite link was on its last uses and subsequently
+                        # deleted so we're fairly sure this was the one used
+                        used.append((code, data, 1))
+
+            self.cog.settings[guild.id]["invite_links"] = invites
+            await self.cog.save(guild)
+        used.sort(key=lambda item: item[2], reverse=True)
+        return used
+
+    async def resync(self, guild: discord.Guild) -> bool:
+        """
+        Refresh the cache outside of a join burst, to catch drift such as missed invite events.
+
+        Skipped while a burst is waiting on its snapshot, since the resync would take the uses
+        its joins are about to be matched against. Returns whether the cache was refreshed.
+        """
+        if guild.id in self._bursts:
+            return False
+        return await self.refresh(guild) is not None
+
+    async def used_invites(self, member: discord.Member) -> List[Tuple[str, Dict[str, Any], int]]:
+        """The invites used by the burst `member` joined in."""
+        guild = member.guild
+        burst = self._bursts.get(guild.id)
+        if burst is None:
+            burst = self._bursts[guild.id] = JoinBurst()
+            asyncio.create_task(self._resolve(guild, burst))
+        burst.members += 1
+        return await asyncio.shield(burst.result)
+
+    async def _resolve(self, guild: discord.Guild, burst: JoinBurst) -> None:
+        try:
+            await asyncio.sleep(JOIN_DEBOUNCE)
+            # Joins from here on start the next burst
+            self._bursts.pop(guild.id, None)
+            used = await self.refresh(guild) or []
+            logger.trace("One invite snapshot for %s joins in %s", burst.members, guild.id)
+        except Exception:
+            logger.exception("Error resolving invites for guild %s.", guild.id)
+            used = []
+        finally:
+            if self._bursts.get(guild.id) is burst:
+                del self._bursts[guild.id]
+        if not burst.result.done():
+            burst.result.set_result(used)
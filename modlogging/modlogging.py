@@ -1,5 +1,4 @@
-from collections import deque
-from typing import Deque, Dict, Union
+from typing import Dict, Union
 
 import discord # type: ignore
 from red_commons.logging import getLogger # type: ignore
@@ -7,6 +6,9 @@ from redbot.core import Config, checks, commands, modlog # type: ignore
 from redbot.core.i18n import Translator, cog_i18n # type: ignore
 from redbot.core.utils.chat_formatting import humanize_list # type: ignore
 
+from .auditlog import AuditLogWatcher
+from .delivery import LogDelivery
+from .invites import InviteTracker
 from .eventmixin import CommandPrivs, EventChooser, EventMixin, MemberUpdateEnum
 from .settings import inv_settings
 
@@ -72,9 +74,12 @@ class ModLogging(EventMixin, commands.Cog):
         self.config.register_global(version="0.0.0")
         self.settings = {}
         self._ban_cache = {}
+        self._routes = {}
         self.invite_links_loop.start()
         self.allowed_mentions = discord.AllowedMentions(users=False, roles=False, everyone=False)
-        self.audit_log: Dict[int, Deque[discord.AuditLogEntry]] = {}
+        self.audit_watcher = AuditLogWatcher(bot)
+        self.invite_tracker = InviteTracker(self)
+        self.log_delivery = LogDelivery(self.allowed_mentions)
 
     def format_help_for_context(self, ctx: commands.Context):
         """
@@ -85,6 +90,7 @@ class ModLogging(EventMixin, commands.Cog):
 
     async def cog_unload(self):
         self.invite_links_loop.stop()
+        await self.log_delivery.close()
 
     async def red_delete_data_for_user(self, **kwargs):
         """
@@ -187,6 +193,7 @@ class ModLogging(EventMixin, commands.Cog):
             chans = ", ".join(c.mention for c in ignored_channels)
             msg += _("Ignored Channels") + ": " + chans
         await self.config.guild(ctx.guild).set(data)
+        self.invalidate_routes(guild)
         await ctx.maybe_send_embed(msg)
 
     @checks.admin_or_permissions(manage_channels=True)
@@ -204,6 +211,7 @@ class ModLogging(EventMixin, commands.Cog):
         async with self.config.guild(guild).all() as all_settings:
             for key, value in self.settings[guild.id].items():
                 all_settings[key] = value
+        self.invalidate_routes(guild)
 
     @_logging.command(name="settings")
     async def _show_logging_settings(self, ctx: commands.Context):
@@ -404,6 +412,32 @@ class ModLogging(EventMixin, commands.Cog):
         await self.save(ctx.guild)
         await self.modlog_settings(ctx)
 
+    @_logging.command(name="delivery")
+    async def _show_delivery_stats(self, ctx: commands.Context) -> None:
+        """
+        Show the log delivery queue for this server's logging channels.
+
+        Logs are batched per channel, up to 10 embeds per message.
+        """
+        stats = self.log_delivery.guild_stats(ctx.guild.id)
+        if not stats:
+            return await ctx.send(_("No logs have been delivered since the cog was loaded."))
+        msg = ""
+        for channel_id, data in stats.items():
+            msg += _(
+                "<#{channel}>: {depth} queued, {delivered} logs in {messages} messages, "
+                "{dropped} dropped, latency avg {avg:.1f}s / max {max:.1f}s\n"
+            ).format(
+                channel=channel_id,
+                depth=data["depth"],
+                delivered=data["delivered"],
+                messages=data["messages"],
+                dropped=data["dropped"],
+                avg=data["avg_latency"],
+                max=data["max_latency"],
+            )
+        await ctx.maybe_send_embed(msg)
+
     @_logging.group(name="delete")
     async def _delete(self, ctx: commands.Context) -> None:
         """
@@ -0,0 +1,69 @@
+import time
+from typing import Any, Dict, FrozenSet, Optional
+
+import discord # type: ignore
+
+ROUTES_TTL = 300  # Seconds before the core logging channel is looked up again
+
+DEFAULT_COLOURS = {
+    "message_edit": discord.Colour.orange(),
+    "message_delete": discord.Colour(0xff4545),
+    "user_change": discord.Colour.greyple(),
+    "role_change": discord.Colour.blue(),
+    "role_create": discord.Colour.blue(),
+    "role_delete": discord.Colour.dark_blue(),
+    "voice_change": discord.Colour.magenta(),
+    "user_join": discord.Colour.green(),
+    "user_left": discord.Colour.dark_green(),
+    "channel_change": discord.Colour.teal(),
+    "channel_create": discord.Colour.teal(),
+    "channel_delete": discord.Colour(0xff4545),
+    "guild_change": discord.Colour.blurple(),
+    "emoji_change": discord.Colour.gold(),
+    "stickers_change": discord.Colour.gold(),
+    "commands_used": discord.Colour(0xfffffe),
+    "invite_created": discord.Colour.blurple(),
+    "invite_deleted": discord.Colour(0xff4545),
+    "thread_change": discord.Colour.teal(),
+    "thread_create": discord.Colour.teal(),
+    "thread_delete": discord.Colour(0xff4545),
+}
+
+
+class EventRoute:
+    """Where and how one event is logged in a guild."""
+
+    __slots__ = ("channel_id", "colour", "custom_colour")
+
+    def __init__(self, event: str, settings: Dict[str, Any]):
+        self.channel_id: Optional[int] = settings.get("channel")
+        self.custom_colour = settings.get("colour") is not None
+        if self.custom_colour:
+            self.colour = discord.Colour(settings["colour"])
+        else:
+            self.colour = DEFAULT_COLOURS.get(event, discord.Colour.red())
+
+
+class GuildRoutes:
+    """
+    A guild's logging settings compiled for the event handlers.
+
+    Built from `ModLogging.settings` and thrown away whenever they are saved, so handlers
+    resolve the log channel, colour and ignored channels from memory instead of Config and
+    `bot.get_embed_colour`. The core logging channel can be changed outside this cog, so the
+    table is also rebuilt after `ROUTES_TTL` seconds.
+    """
+
+    def __init__(self, settings: Dict[str, Any], default_channel_id: Optional[int]):
+        self.built = time.monotonic()
+        self.default_channel_id = default_channel_id
+        self.ignored_channels: FrozenSet[int] = frozenset(settings.get("ignored_channels", []))
+        self.routes: Dict[str, EventRoute] = {
+            event: EventRoute(event, data)
+            for event, data in settings.items()
+            if isinstance(data, dict) and "enabled" in data
+        }
+
+    @property
+    def stale(self) -> bool:
+        return time.monotonic() - self.built > ROUTES_TTL
@@ -1,11 +1,19 @@
 from redbot.core import commands, Config  # type: ignore
+from redbot.core.data_manager import cog_data_path  # type: ignore
+from red_commons.logging import getLogger  # type: ignore
 import discord
 import aiohttp
 import asyncio
+import json
+import time
 from collections import Counter
 from datetime import datetime, timedelta
 
+logger = getLogger("red.beehive-cogs.OpenBanList")
+
 TIMEOUT_DURATION = 28 * 24 * 60 * 60  # 28 days in seconds (max Discord timeout)
+REFRESH_INTERVAL = 15 * 60  # How often the cached banlist is revalidated, in seconds
+LOAD_RETRY_DELAY = 60  # Seconds before a failed first load is retried from a lookup
 
 class OpenBanList(commands.Cog):
     """
@@ -25,18 +33,192 @@ class OpenBanList(commands.Cog):
                 "2": "kick",
                 "3": "timeout"
             },
-            "log_channel": None  # Default log channel is None
+            "log_channel": None,  # Default log channel is None
+            "applied_actions": {},  # {user_id: {"action": "ban" or "timeout", "until": unix time}} this cog applied
         }
         self.config.register_guild(**default_guild)
+        self.config.register_global(enforced_users=None)  # User ids actively listed as of the last enforcement pass
         self.banlist_url = "https://openbanlist.cc/data/banlist.json"
         self.session = aiohttp.ClientSession()
-        self.bot.loop.create_task(self.update_banlist_periodically())
+        # One cached copy of the banlist shared by every guild, revalidated with ETag/Last-Modified
+        self.cache_file = cog_data_path(self) / "banlist.json"
+        self.banlist_data = None  # Raw banlist as served, in list order
+        self.bans_by_user = {}  # {user_id: [(list position, ban_info), ...]}
+        self._etag = None
+        self._last_modified = None
+        self._refresh_lock = asyncio.Lock()
+        self._load_lock = asyncio.Lock()  # One first load however many lookups are waiting on it
+        self._load_retry_at = 0.0  # time.monotonic() before which lookups don't retry a failed first load
+        # Active bans as of the last enforcement pass, diffed against each new snapshot
+        self._enforced_bans = None  # Set of user ids, None until a pass has run
+        # Bans and timeouts this cog applied, so they can be undone or refreshed whatever the config says now
+        self._applied = {}  # {guild_id: {user_id: {"action": ..., "until": ...}}}
+        self._enforce_lock = asyncio.Lock()  # Passes over the whole list and single-guild passes don't overlap
+        self.enforcement_metrics = {
+            "passes": 0,
+            "last_pass_at": None,
+            "last_pass_seconds": 0.0,
+            "last_added": 0,
+            "last_removed": 0,
+            "last_actions": 0,
+            "actions": Counter(),
+            "errors": 0,
+            "last_error": None,  # (unix time, where, message)
+        }
+        self.refresh_task = self.bot.loop.create_task(self.refresh_banlist_periodically())
         self.timeout_task = self.bot.loop.create_task(self.timeout_enforcer())
 
     def cog_unload(self):
         self.bot.loop.create_task(self.session.close())
         if hasattr(self, "timeout_task"):
             self.timeout_task.cancel()
+        if hasattr(self, "refresh_task"):
+            self.refresh_task.cancel()
+
+    def _index_banlist(self, banlist_data):
+        """Store the banlist and index every entry by reported user id."""
+        bans_by_user = {}
+        for idx, ban_info in enumerate(banlist_data.values(), 1):
+            try:
+                user_id = int(ban_info.get("reported_id", 0))
+            except (TypeError, ValueError):
+                continue
+            bans_by_user.setdefault(user_id, []).append((idx, ban_info))
+        self.banlist_data = banlist_data
+        self.bans_by_user = bans_by_user
+
+    def _read_cache_file(self):
+        with open(self.cache_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_cache_file(self, payload):
+        tmp_file = self.cache_file.with_suffix(".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        tmp_file.replace(self.cache_file)
+
+    async def _load_cached_banlist(self):
+        """Warm the cache from the copy saved in the cog data folder, if there is one."""
+        loop = asyncio.get_running_loop()
+        try:
+            payload = await loop.run_in_executor(None, self._read_cache_file)
+        except (OSError, ValueError):
+            return
+        if not isinstance(payload.get("data"), dict):
+            return
+        self._etag = payload.get("etag")
+        self._last_modified = payload.get("last_modified")
+        self._index_banlist(payload["data"])
+
+    async def refresh_banlist(self):
+        """
+        Revalidate the cached banlist against the remote copy.
+
+        Sends If-None-Match/If-Modified-Since so an unchanged list costs a 304 and no download.
+        Returns True if the list changed.
+        """
+        async with self._refresh_lock:
+            if self.banlist_data is None:
+                await self._load_cached_banlist()
+            headers = {}
+            if self.banlist_data is not None:
+                if self._etag:
+                    headers["If-None-Match"] = self._etag
+                if self._last_modified:
+                    headers["If-Modified-Since"] = self._last_modified
+            try:
+                async with self.session.get(self.banlist_url, headers=headers) as response:
+                    if response.status != 200:
+                        return False
+                    banlist_data = await response.json(content_type=None)
+                    etag = response.headers.get("ETag")
+                    last_modified = response.headers.get("Last-Modified")
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                return False
+            if not isinstance(banlist_data, dict):
+                return False
+            self._etag = etag
+            self._last_modified = last_modified
+            self._index_banlist(banlist_data)
+            payload = {"etag": etag, "last_modified": last_modified, "data": banlist_data}
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self._write_cache_file, payload)
+            except OSError:
+                pass
+            return True
+
+    async def _ensure_banlist(self):
+        """
+        Load the banlist if nothing has been loaded yet.
+
+        Lookups arriving together, like a wave of joins on a cold start, share one load, and
+        after a failed load they go without until `LOAD_RETRY_DELAY` has passed.
+        """
+        if self.banlist_data is not None or time.monotonic() < self._load_retry_at:
+            return
+        async with self._load_lock:
+            # Whoever held the lock may already have loaded the list, or failed to
+            if self.banlist_data is not None or time.monotonic() < self._load_retry_at:
+                return
+            await self.refresh_banlist()
+            if self.banlist_data is None:
+                self._load_retry_at = time.monotonic() + LOAD_RETRY_DELAY
+
+    async def get_banlist(self):
+        """Return the cached banlist, loading it first if this is the first use. None if unavailable."""
+        await self._ensure_banlist()
+        return self.banlist_data
+
+    async def get_user_bans(self, user_id):
+        """Return every `(list position, ban_info)` for a user. Never touches the network once loaded."""
+        await self._ensure_banlist()
+        return self.bans_by_user.get(user_id, [])
+
+    async def refresh_banlist_periodically(self):
+        await self.bot.wait_until_ready()
+        await self._load_enforcement_state()
+        first_pass = True
+        while True:
+            try:
+                changed = await self.refresh_banlist()
+                # The first pass after startup enforces the whole list, later ones only what changed
+                if self.banlist_data is not None and (changed or first_pass):
+                    async with self._enforce_lock:
+                        await self.enforcement_pass(full=first_pass)
+                    first_pass = False
+            except Exception as e:
+                self._record_error("banlist refresh and enforcement", e)
+            await asyncio.sleep(REFRESH_INTERVAL)
+
+    def _record_error(self, where, error):
+        logger.exception("OpenBanlist %s failed", where)
+        self.enforcement_metrics["errors"] += 1
+        self.enforcement_metrics["last_error"] = (int(time.time()), where, f"{type(error).__name__}: {error}")
+
+    async def _load_enforcement_state(self):
+        """Restore the last enforced snapshot and the actions applied, so removals while offline are undone."""
+        enforced = await self.config.enforced_users()
+        if enforced is not None:
+            self._enforced_bans = set(enforced)
+        for guild_id, data in (await self.config.all_guilds()).items():
+            applied = {int(user_id): entry for user_id, entry in data.get("applied_actions", {}).items()}
+            # Anything recorded while this was loading is newer than the saved copy
+            applied.update(self._applied.get(guild_id, {}))
+            if applied:
+                self._applied[guild_id] = applied
+
+    def _record_action(self, guild_id, user_id, action, until=None):
+        """Remember a ban or timeout this cog applied."""
+        entry = {"action": action}
+        if until is not None:
+            entry["until"] = int(until.timestamp())
+        self._applied.setdefault(guild_id, {})[user_id] = entry
+
+    async def _save_applied(self, guild_id):
+        applied = self._applied.get(guild_id, {})
+        await self.config.guild_from_id(guild_id).applied_actions.set(
+            {str(user_id): entry for user_id, entry in applied.items()}
+        )
 
     @commands.guild_only()
     @commands.group(invoke_without_command=True)
@@ -53,9 +235,11 @@ class OpenBanList(commands.Cog):
     async def enable(self, ctx):
         """Enable the global banlist protection."""
         await self.config.guild(ctx.guild).enabled.set(True)
+        # Automatic passes only act on list changes, so catch up on everyone already listed
+        enforced = await self.enforce_guild_now(ctx.guild)
         embed = discord.Embed(
             title="Banlist enabled",
-            description="Global banlist protection has been enabled.",
+            description=f"Global banlist protection has been enabled.\nActions taken against currently listed members: **{enforced}**",
             color=0x2bbd8e
         )
         await ctx.send(embed=embed)
@@ -119,9 +303,13 @@ class OpenBanList(commands.Cog):
         actions[severity] = action
         await self.config.guild(ctx.guild).actions.set(actions)
         severity_map = {"1": "High", "2": "Medium", "3": "Low"}
+        description = f"Action for severity {severity} ({severity_map[severity]}) set to: {action}"
+        if await self.config.guild(ctx.guild).enabled():
+            enforced = await self.enforce_guild_now(ctx.guild)
+            description += f"\nActions taken against currently listed members: **{enforced}**"
         embed = discord.Embed(
             title="OpenBanlist action set",
-            description=f"Action for severity {severity} ({severity_map[severity]}) set to: {action}",
+            description=description,
             color=0x2bbd8e
         )
         await ctx.send(embed=embed)
@@ -146,153 +334,175 @@ class OpenBanList(commands.Cog):
         else:
             user_id = user.id
 
-        async with self.session.get(self.banlist_url) as response:
-            if response.status == 200:
-                banlist_data = await response.json()
-                # Find all bans for this user by reported_id
-                user_bans = []
-                banlist_items = list(banlist_data.items())
-                for idx, (ban_key, ban_info) in enumerate(banlist_items, 1):
-                    if int(ban_info.get("reported_id", 0)) == user_id:
-                        user_bans.append((idx, ban_info))
-                if not user_bans:
-                    embed = discord.Embed(
-                        title="OpenBanlist check",
-                        description=f"That user has no active bans or historical punishments on OpenBanlist.",
-                        color=0x2bbd8e
-                    )
-                    await ctx.send(embed=embed)
-                    return
+        if await self.get_banlist() is not None:
+            # Find all bans for this user by reported_id
+            user_bans = await self.get_user_bans(user_id)
+            if not user_bans:
+                embed = discord.Embed(
+                    title="OpenBanlist check",
+                    description=f"That user has no active bans or historical punishments on OpenBanlist.",
+                    color=0x2bbd8e
+                )
+                await ctx.send(embed=embed)
+                return
 
-                # Only consider bans that are still active (appeal_verdict is not "accepted")
-                active_bans = [ban_info for idx, ban_info in user_bans if ban_info.get("appeal_info", {}).get("appeal_verdict", "").lower() != "accepted"]
+            # Only consider bans that are still active (appeal_verdict is not "accepted")
+            active_bans = [ban_info for idx, ban_info in user_bans if ban_info.get("appeal_info", {}).get("appeal_verdict", "").lower() != "accepted"]
 
-                # If there are active bans, show the first one
+            # If there are active bans, show the first one
+            if active_bans:
+                active_ban = active_bans[0]
+                severity = str(active_ban.get("severity", "3"))
+                severity_map = {"1": "High", "2": "Medium", "3": "Low"}
+                embed = discord.Embed(
+                    title="OpenBanlist check",
+                    description=f"> Uh oh! <@{user_id}> is listed in the **[OpenBanlist](https://openbanlist.cc)**",
+                    color=0xff4545
+                )
+                embed.add_field(name="Banned for", value=active_ban.get("ban_reason", "No reason provided yet, check back soon"), inline=True)
+                embed.add_field(name="Context", value=active_ban.get("context", "No context provided"), inline=False)
+                embed.add_field(name="Severity", value=f"{severity} ({severity_map.get(severity, 'Unknown')})", inline=True)
+                # Process reporter name if available
+                reporter_id = active_ban.get('reporter_id', 'Unknown')
+                reporter_name = active_ban.get('reporter_name', None)
+                if reporter_name:
+                    reporter_display = f"{reporter_name} (<@{reporter_id}>)\n`{reporter_id}`"
+                else:
+                    reporter_display = f"<@{reporter_id}>\n`{reporter_id}`"
+                embed.add_field(name="Reported by", value=reporter_display, inline=True)
+                # Process approver name if available
+                approver_id = active_ban.get('approver_id', 'Unknown')
+                approver_name = active_ban.get('approver_name', None)
+                if approver_name:
+                    approver_display = f"{approver_name} (<@{approver_id}>)\n`{approver_id}`"
+                else:
+                    approver_display = f"<@{approver_id}>\n`{approver_id}`"
+                embed.add_field(name="Approved by", value=approver_display, inline=True)
+                appealable_status = ":white_check_mark: **Yes**" if active_ban.get("appealable", False) else ":x: **Not eligible**"
+                embed.add_field(name="Can be appealed?", value=appealable_status, inline=True)
+                if active_ban.get("appealed", False):
+                    appeal_info = active_ban.get("appeal_info", {})
+                    appeal_verdict = appeal_info.get("appeal_verdict", "")
+                    if not appeal_verdict:
+                        appeal_status = "Pending"
+                    elif appeal_verdict == "accepted":
+                        # If the appeal is accepted, this ban should not be considered active, so skip showing as active
+                        # Instead, fall through to the else block below
+                        active_bans = []
+                    elif appeal_verdict == "denied":
+                        appeal_status = "Denied"
+                    else:
+                        appeal_status = "Unknown"
+                    if active_bans:
+                        embed.add_field(name="Appeal status", value=appeal_status, inline=True)
+                        embed.add_field(name="Appeal verdict", value=appeal_verdict or "No verdict provided", inline=False)
+                        appeal_reason = appeal_info.get("appeal_reason", "")
+                        if appeal_reason:
+                            embed.add_field(name="Appeal reason", value=appeal_reason, inline=False)
                 if active_bans:
-                    active_ban = active_bans[0]
-                    severity = str(active_ban.get("severity", "3"))
-                    severity_map = {"1": "High", "2": "Medium", "3": "Low"}
-                    embed = discord.Embed(
-                        title="OpenBanlist check",
-                        description=f"> Uh oh! <@{user_id}> is listed in the **[OpenBanlist](https://openbanlist.cc)**",
-                        color=0xff4545
-                    )
-                    embed.add_field(name="Banned for", value=active_ban.get("ban_reason", "No reason provided yet, check back soon"), inline=True)
-                    embed.add_field(name="Context", value=active_ban.get("context", "No context provided"), inline=False)
-                    embed.add_field(name="Severity", value=f"{severity} ({severity_map.get(severity, 'Unknown')})", inline=True)
-                    # Process reporter name if available
-                    reporter_id = active_ban.get('reporter_id', 'Unknown')
-                    reporter_name = active_ban.get('reporter_name', None)
-                    if reporter_name:
-                        reporter_display = f"{reporter_name} (<@{reporter_id}>)\n`{reporter_id}`"
+                    evidence = active_ban.get("evidence", "")
+                    if evidence:
+                        embed.set_image(url=evidence)
+                    report_date = active_ban.get("report_date", "Unknown")
+                    ban_date = active_ban.get("ban_date", "Unknown")
+                    if report_date != "Unknown":
+                        embed.add_field(name="Reported on", value=f"<t:{report_date}:f>", inline=True)
                     else:
-                        reporter_display = f"<@{reporter_id}>\n`{reporter_id}`"
-                    embed.add_field(name="Reported by", value=reporter_display, inline=True)
-                    # Process approver name if available
-                    approver_id = active_ban.get('approver_id', 'Unknown')
-                    approver_name = active_ban.get('approver_name', None)
-                    if approver_name:
-                        approver_display = f"{approver_name} (<@{approver_id}>)\n`{approver_id}`"
+                        embed.add_field(name="Report date", value="Unknown", inline=True)
+                    if ban_date != "Unknown":
+                        embed.add_field(name="Added to database", value=f"<t:{ban_date}:f>", inline=True)
                     else:
-                        approver_display = f"<@{approver_id}>\n`{approver_id}`"
-                    embed.add_field(name="Approved by", value=approver_display, inline=True)
-                    appealable_status = ":white_check_mark: **Yes**" if active_ban.get("appealable", False) else ":x: **Not eligible**"
-                    embed.add_field(name="Can be appealed?", value=appealable_status, inline=True)
-                    if active_ban.get("appealed", False):
-                        appeal_info = active_ban.get("appeal_info", {})
-                        appeal_verdict = appeal_info.get("appeal_verdict", "")
-                        if not appeal_verdict:
-                            appeal_status = "Pending"
-                        elif appeal_verdict == "accepted":
-                            # If the appeal is accepted, this ban should not be considered active, so skip showing as active
-                            # Instead, fall through to the else block below
-                            active_bans = []
-                        elif appeal_verdict == "denied":
-                            appeal_status = "Denied"
-                        else:
-                            appeal_status = "Unknown"
-                        if active_bans:
-                            embed.add_field(name="Appeal status", value=appeal_status, inline=True)
-                            embed.add_field(name="Appeal verdict", value=appeal_verdict or "No verdict provided", inline=False)
-                            appeal_reason = appeal_info.get("appeal_reason", "")
-                            if appeal_reason:
-                                embed.add_field(name="Appeal reason", value=appeal_reason, inline=False)
-                    if active_bans:
-                        evidence = active_ban.get("evidence", "")
-                        if evidence:
-                            embed.set_image(url=evidence)
-                        report_date = active_ban.get("report_date", "Unknown")
-                        ban_date = active_ban.get("ban_date", "Unknown")
-                        if report_date != "Unknown":
-                            embed.add_field(name="Reported on", value=f"<t:{report_date}:f>", inline=True)
-                        else:
-                            embed.add_field(name="Report date", value="Unknown", inline=True)
-                        if ban_date != "Unknown":
-                            embed.add_field(name="Added to database", value=f"<t:{ban_date}:f>", inline=True)
-                        else:
-                            embed.add_field(name="Ban date", value="Unknown", inline=True)
-                        await ctx.send(embed=embed)
-                        return  # Only send the active ban embed if still valid
+                        embed.add_field(name="Ban date", value="Unknown", inline=True)
+                    await ctx.send(embed=embed)
+                    return  # Only send the active ban embed if still valid
 
-                # If we get here, either there are no active bans, or the only ban(s) have an accepted appeal
-                embed = discord.Embed(
-                    title="OpenBanlist check",
-                    description=f"<@{user_id}> is **not currently banned** but has a punishment history on **[OpenBanlist](https://openbanlist.cc)**",
-                    color=discord.Color.orange()
+            # If we get here, either there are no active bans, or the only ban(s) have an accepted appeal
+            embed = discord.Embed(
+                title="OpenBanlist check",
+                description=f"<@{user_id}> is **not currently banned** but has a punishment history on **[OpenBanlist](https://openbanlist.cc)**",
+                color=discord.Color.orange()
+            )
+            # Add a single field for prior bans as per instructions
+            prior_bans_lines = []
+            for idx, ban_info in user_bans:
+                reason = ban_info.get("ban_reason", "No reason provided")
+                ban_date = ban_info.get("ban_date", None)
+                severity = str(ban_info.get("severity", "3"))
+                severity_map = {"1": "High", "2": "Medium", "3": "Low"}
+                if ban_date and ban_date != "Unknown":
+                    try:
+                        # Discord dynamic timestamp
+                        date_str = f"<t:{int(ban_date)}:f>"
+                    except Exception:
+                        date_str = str(ban_date)
+                else:
+                    date_str = "Unknown"
+                prior_bans_lines.append(f"`#{idx}` for **{reason}** `({severity_map.get(severity, 'Unknown')})` on **{date_str}**")
+            if prior_bans_lines:
+                embed.add_field(
+                    name="Prior bans",
+                    value="\n".join(prior_bans_lines),
+                    inline=False
                 )
-                # Add a single field for prior bans as per instructions
-                prior_bans_lines = []
-                for idx, ban_info in user_bans:
-                    reason = ban_info.get("ban_reason", "No reason provided")
-                    ban_date = ban_info.get("ban_date", None)
-                    severity = str(ban_info.get("severity", "3"))
-                    severity_map = {"1": "High", "2": "Medium", "3": "Low"}
-                    if ban_date and ban_date != "Unknown":
-                        try:
-                            # Discord dynamic timestamp
-                            date_str = f"<t:{int(ban_date)}:f>"
-                        except Exception:
-                            date_str = str(ban_date)
-                    else:
-                        date_str = "Unknown"
-                    prior_bans_lines.append(f"`#{idx}` for **{reason}** `({severity_map.get(severity, 'Unknown')})` on **{date_str}**")
-                if prior_bans_lines:
-                    embed.add_field(
-                        name="Prior bans",
-                        value="\n".join(prior_bans_lines),
-                        inline=False
-                    )
-                await ctx.send(embed=embed)
+            await ctx.send(embed=embed)
 
     @banlist.command()
     async def stats(self, ctx):
         """Show statistics about the banlist."""
-        async with self.session.get(self.banlist_url) as response:
-            if response.status == 200:
-                banlist_data = await response.json()
-                total_banned = len(banlist_data)
-                ban_reasons = [ban_info.get("ban_reason", "No reason provided") for ban_info in banlist_data.values()]
-                reason_counts = Counter(ban_reasons)
-                top_reasons = reason_counts.most_common(5)
-
-                # Count by severity
-                severity_counts = Counter(str(ban_info.get("severity", "3")) for ban_info in banlist_data.values())
-                severity_map = {"1": "High", "2": "Medium", "3": "Low"}
+        banlist_data = await self.get_banlist()
+        if banlist_data is not None:
+            total_banned = len(banlist_data)
+            ban_reasons = [ban_info.get("ban_reason", "No reason provided") for ban_info in banlist_data.values()]
+            reason_counts = Counter(ban_reasons)
+            top_reasons = reason_counts.most_common(5)
 
-                embed = discord.Embed(
-                    title="OpenBanlist stats",
-                    description=f"There are **{total_banned}** active global bans",
-                    color=0xfffffe
+            # Count by severity
+            severity_counts = Counter(str(ban_info.get("severity", "3")) for ban_info in banlist_data.values())
+            severity_map = {"1": "High", "2": "Medium", "3": "Low"}
+
+            embed = discord.Embed(
+                title="OpenBanlist stats",
+                description=f"There are **{total_banned}** active global bans",
+                color=0xfffffe
+            )
+            for reason, count in top_reasons:
+                embed.add_field(name=reason, value=f"**{count}** users", inline=False)
+            for sev in ("1", "2", "3"):
+                embed.add_field(
+                    name=f"Severity {sev} ({severity_map[sev]})",
+                    value=f"**{severity_counts.get(sev, 0)}** bans",
+                    inline=True
                 )
-                for reason, count in top_reasons:
-                    embed.add_field(name=reason, value=f"**{count}** users", inline=False)
-                for sev in ("1", "2", "3"):
-                    embed.add_field(
-                        name=f"Severity {sev} ({severity_map[sev]})",
-                        value=f"**{severity_counts.get(sev, 0)}** bans",
-                        inline=True
-                    )
-                await ctx.send(embed=embed)
+            await ctx.send(embed=embed)
+
+    @commands.is_owner()
+    @banlist.command()
+    async def enforcement(self, ctx):
+        """Show metrics for the automatic banlist enforcement passes."""
+        metrics = self.enforcement_metrics
+        embed = discord.Embed(title="OpenBanlist enforcement", color=0xfffffe)
+        embed.add_field(name="Passes run", value=str(metrics["passes"]), inline=True)
+        last_pass_at = metrics["last_pass_at"]
+        embed.add_field(name="Last pass", value=f"<t:{last_pass_at}:R>" if last_pass_at else "Never", inline=True)
+        embed.add_field(name="Last pass duration", value=f"{metrics['last_pass_seconds'] * 1000:.1f} ms", inline=True)
+        embed.add_field(name="Last pass changes", value=f"**{metrics['last_added']}** added, **{metrics['last_removed']}** removed", inline=True)
+        embed.add_field(name="Last pass actions", value=str(metrics["last_actions"]), inline=True)
+        tracked = Counter(entry["action"] for applied in self._applied.values() for entry in applied.values())
+        embed.add_field(name="Tracked bans", value=str(tracked["ban"]), inline=True)
+        embed.add_field(name="Tracked timeouts", value=str(tracked["timeout"]), inline=True)
+        totals = "\n".join(f"{action}: **{count}**" for action, count in metrics["actions"].most_common())
+        embed.add_field(name="Actions since load", value=totals or "None", inline=False)
+        last_error = metrics["last_error"]
+        if last_error:
+            error_at, where, message = last_error
+            embed.add_field(
+                name=f"Errors since load: {metrics['errors']}",
+                value=f"Last in {where} <t:{error_at}:R>\n`{message[:900]}`",
+                inline=False
+            )
+        else:
+            embed.add_field(name="Errors since load", value="0", inline=False)
+        await ctx.send(embed=embed)
 
     @commands.admin_or_permissions(manage_guild=True)
     @banlist.command(name="scan")
@@ -326,13 +536,9 @@ class OpenBanList(commands.Cog):
 
         await ctx.send("🔍 Scanning server for users on the OpenBanlist...")
 
-        async with self.session.get(self.banlist_url) as response:
-            if response.status != 200:
-                await ctx.send("Failed to fetch the banlist. Please try again later.")
-                return
-            banlist_data = await response.json()
-            # Build a dict by reported_id for fast lookup
-            ban_ids = {int(ban_info.get("reported_id", 0)): ban_info for ban_info in banlist_data.values()}
+        if await self.get_banlist() is None:
+            await ctx.send("Failed to fetch the banlist. Please try again later.")
+            return
 
         found = []
         failed = []
@@ -340,12 +546,8 @@ class OpenBanList(commands.Cog):
         for member in guild.members:
             if member.bot:
                 continue
-            ban_info = ban_ids.get(member.id)
+            ban_info = self.active_ban(member.id)
             if ban_info:
-                # Skip if appeal_verdict is accepted
-                appeal_info = ban_info.get("appeal_info", {})
-                if appeal_info.get("appeal_verdict", "").lower() == "accepted":
-                    continue
                 severity = str(ban_info.get("severity", "3"))
                 action = actions.get(severity, "none")
                 try:
@@ -374,6 +576,7 @@ class OpenBanList(commands.Cog):
                         except discord.Forbidden:
                             pass
                         await member.ban(reason=f"Active ban detected on OpenBanlist (manual scan, severity {severity})")
+                        self._record_action(guild.id, member.id, "ban")
                         action_taken = "banned"
                     elif action == "timeout":
                         try:
@@ -387,7 +590,9 @@ class OpenBanList(commands.Cog):
                         except discord.Forbidden:
                             pass
                         try:
-                            await member.timeout(until=discord.utils.utcnow() + timedelta(seconds=TIMEOUT_DURATION), reason=f"Active ban detected on OpenBanlist (manual scan, severity {severity})")
+                            until = discord.utils.utcnow() + timedelta(seconds=TIMEOUT_DURATION)
+                            await member.timeout(until=until, reason=f"Active ban detected on OpenBanlist (manual scan, severity {severity})")
+                            self._record_action(guild.id, member.id, "timeout", until)
                             action_taken = "timed out"
                         except Exception:
                             action_taken = "failed to timeout"
@@ -456,6 +661,8 @@ class OpenBanList(commands.Cog):
                         embed.add_field(name="Ban date", value="Unknown", inline=False)
                     await log_channel.send(embed=embed)
 
+        await self._save_applied(guild.id)
+
         summary_embed = discord.Embed(
             title="OpenBanlist scan complete",
             color=0x2bbd8e if found or failed else 0xfffffe
@@ -477,93 +684,176 @@ class OpenBanList(commands.Cog):
             )
         await ctx.send(embed=summary_embed)
 
-    async def update_banlist_periodically(self):
-        while True:
-            await self.update_banlist()
-            await asyncio.sleep(86400)  # 24 hours
-
-    async def update_banlist(self):
-        async with self.session.get(self.banlist_url) as response:
-            if response.status == 200:
-                banlist_data = await response.json()
-                for guild in self.bot.guilds:
-                    if await self.config.guild(guild).enabled():
-                        await self.enforce_banlist(guild, banlist_data)
-
-    async def enforce_banlist(self, guild, banlist_data):
+    def active_ban(self, user_id):
+        """Return the first ban for a user whose appeal hasn't been accepted, or None."""
+        for idx, ban_info in self.bans_by_user.get(user_id, []):
+            if ban_info.get("appeal_info", {}).get("appeal_verdict", "").lower() != "accepted":
+                return ban_info
+        return None
+
+    def active_bans(self):
+        """Return `{user_id: ban_info}` for every user with an active ban."""
+        active = {}
+        for user_id in self.bans_by_user:
+            ban_info = self.active_ban(user_id)
+            if ban_info:
+                active[user_id] = ban_info
+        return active
+
+    async def enforcement_pass(self, full=False):
+        """
+        Enforce the difference between the last enforced banlist and the current one.
+
+        Newly listed users are looked up in each guild's member cache and actioned, or every listed
+        user when `full` is set. Bans and timeouts this cog applied to users who are no longer listed
+        (removed or appeal accepted) are lifted, including ones that failed to lift on an earlier pass.
+        The cost of a pass follows list churn instead of member count.
+        """
+        start = time.perf_counter()
+        active = self.active_bans()
+        previous = self._enforced_bans or set()
+        added = list(active) if full else [user_id for user_id in active if user_id not in previous]
+        removed = [user_id for user_id in previous if user_id not in active]
+        actions_issued = Counter()
+
+        for guild in self.bot.guilds:
+            before = dict(self._applied.get(guild.id, {}))
+            if added and await self.config.guild(guild).enabled():
+                actions_issued.update(await self._enforce_guild(guild, added, active))
+            for user_id in [user_id for user_id in before if user_id not in active]:
+                actions_issued[await self._revert_action(guild, user_id)] += 1
+            if self._applied.get(guild.id, {}) != before:
+                await self._save_applied(guild.id)
+
+        if self._enforced_bans != set(active):
+            self._enforced_bans = set(active)
+            await self.config.enforced_users.set(list(self._enforced_bans))
+        actions_issued.pop("none", None)
+        metrics = self.enforcement_metrics
+        metrics["passes"] += 1
+        metrics["last_pass_at"] = int(time.time())
+        metrics["last_pass_seconds"] = time.perf_counter() - start
+        metrics["last_added"] = len(added)
+        metrics["last_removed"] = len(removed)
+        metrics["last_actions"] = sum(actions_issued.values())
+        metrics["actions"].update(actions_issued)
+
+    async def enforce_guild_now(self, guild):
+        """Enforce the whole list in one guild, for when it's enabled or its actions change. Returns the number of actions taken."""
+        if await self.get_banlist() is None:
+            return 0
+        async with self._enforce_lock:
+            active = self.active_bans()
+            before = dict(self._applied.get(guild.id, {}))
+            actions_issued = await self._enforce_guild(guild, list(active), active)
+            if self._applied.get(guild.id, {}) != before:
+                await self._save_applied(guild.id)
+        actions_issued.pop("none", None)
+        self.enforcement_metrics["actions"].update(actions_issued)
+        return sum(actions_issued.values())
+
+    async def _enforce_guild(self, guild, user_ids, active):
+        """Apply the guild's configured actions to the listed users among its members. Returns a Counter of what was done."""
+        actions_issued = Counter()
         actions = await self.config.guild(guild).actions()
         if all(a == "none" for a in actions.values()):
-            return
+            return actions_issued
+        for user_id in user_ids:
+            member = guild.get_member(user_id)
+            if member is None or member.bot:
+                continue
+            actions_issued[await self._apply_action(member, active[user_id], actions)] += 1
+        return actions_issued
 
-        # Build a dict by reported_id for fast lookup
-        ban_ids = {int(ban_info.get("reported_id", 0)): ban_info for ban_info in banlist_data.values()}
-        severity_map = {"1": "High", "2": "Medium", "3": "Low"}
+    async def _apply_action(self, member, ban_info, actions):
+        """Apply the guild's configured action for a listed member. Returns what was done."""
+        severity = str(ban_info.get("severity", "3"))
+        action = actions.get(severity, "none")
+        applied = self._applied.get(member.guild.id, {})
+        if action == "timeout" and applied.get(member.id, {}).get("action") == "timeout" and member.is_timed_out():
+            return "none"  # Already timed out by this cog, the timeout enforcer keeps it going
+        try:
+            if action == "kick":
+                await member.kick(reason=f"Active ban detected on OpenBanlist (severity {severity})")
+                applied.pop(member.id, None)
+                return "kick"
+            elif action == "ban":
+                await member.ban(reason=f"Active ban detected on OpenBanlist (severity {severity})")
+                self._record_action(member.guild.id, member.id, "ban")
+                return "ban"
+            elif action == "timeout":
+                until = discord.utils.utcnow() + timedelta(seconds=TIMEOUT_DURATION)
+                await member.timeout(until=until, reason=f"Active ban detected on OpenBanlist (severity {severity})")
+                self._record_action(member.guild.id, member.id, "timeout", until)
+                return "timeout"
+        except discord.HTTPException:
+            return "failed"
+        return "none"
 
-        for member in guild.members:
-            ban_info = ban_ids.get(member.id)
-            if ban_info:
-                appeal_info = ban_info.get("appeal_info", {})
-                if appeal_info.get("appeal_verdict", "").lower() == "accepted":
-                    continue
-                severity = str(ban_info.get("severity", "3"))
-                action = actions.get(severity, "none")
+    async def _revert_action(self, guild, user_id):
+        """Undo the ban or timeout this cog applied to a user who is no longer listed. Returns what was done."""
+        applied = self._applied.get(guild.id, {})
+        action = applied.get(user_id, {}).get("action")
+        try:
+            if action == "ban":
                 try:
-                    if action == "kick":
-                        await member.kick(reason=f"Active ban detected on OpenBanlist (severity {severity})")
-                    elif action == "ban":
-                        await member.ban(reason=f"Active ban detected on OpenBanlist (severity {severity})")
-                    elif action == "timeout":
-                        try:
-                            await member.timeout(until=discord.utils.utcnow() + timedelta(seconds=TIMEOUT_DURATION), reason=f"Active ban detected on OpenBanlist (severity {severity})")
-                        except Exception:
-                            pass
-                except discord.Forbidden:
-                    pass
+                    ban_entry = await guild.fetch_ban(discord.Object(id=user_id))
+                except discord.NotFound:
+                    applied.pop(user_id, None)
+                    return "none"
+                # Leave it alone if a moderator has since banned them for something else
+                if not (ban_entry.reason or "").startswith("Active ban detected on OpenBanlist"):
+                    applied.pop(user_id, None)
+                    return "none"
+                await guild.unban(discord.Object(id=user_id), reason="No longer actively listed on OpenBanlist")
+                applied.pop(user_id, None)
+                return "unban"
+            elif action == "timeout":
+                member = guild.get_member(user_id)
+                if member is None or not member.is_timed_out():
+                    applied.pop(user_id, None)
+                    return "none"
+                await member.timeout(None, reason="No longer actively listed on OpenBanlist")
+                applied.pop(user_id, None)
+                return "timeout lifted"
+        except discord.HTTPException:
+            # Kept, so the next pass tries again
+            return "failed"
+        applied.pop(user_id, None)
+        return "none"
 
     async def timeout_enforcer(self):
+        """Keep timeouts this cog applied from expiring while the member is still listed."""
         await self.bot.wait_until_ready()
         while not self.bot.is_closed():
             try:
-                for guild in self.bot.guilds:
-                    enabled = await self.config.guild(guild).enabled()
-                    if not enabled:
+                now = time.time()
+                for guild_id, applied in list(self._applied.items()):
+                    guild = self.bot.get_guild(guild_id)
+                    if guild is None:
                         continue
-                    actions = await self.config.guild(guild).actions()
-                    if all(a == "none" for a in actions.values()):
-                        continue
-                    log_channel_id = await self.config.guild(guild).log_channel()
-                    log_channel = guild.get_channel(log_channel_id) if log_channel_id else None
-
-                    async with self.session.get(self.banlist_url) as response:
-                        if response.status != 200:
+                    changed = False
+                    for member_id, entry in list(applied.items()):
+                        if entry["action"] != "timeout" or self.active_ban(member_id) is None:
+                            continue  # Timeouts of users no longer listed are lifted by the enforcement pass
+                        member = guild.get_member(member_id)
+                        if member is None:
+                            applied.pop(member_id, None)
+                            changed = True
                             continue
-                        banlist_data = await response.json()
-                        ban_ids = {int(ban_info.get("reported_id", 0)): ban_info for ban_info in banlist_data.values()}
-                        severity_map = {"1": "High", "2": "Medium", "3": "Low"}
-                        for member in guild.members:
-                            if member.bot:
-                                continue
-                            ban_info = ban_ids.get(member.id)
-                            if not ban_info:
-                                continue
-                            appeal_info = ban_info.get("appeal_info", {})
-                            if appeal_info.get("appeal_verdict", "").lower() == "accepted":
-                                continue
-                            severity = str(ban_info.get("severity", "3"))
-                            action = actions.get(severity, "none")
-                            if action == "timeout":
-                                # Only re-timeout if not already timed out for the max duration
-                                try:
-                                    if hasattr(member, "timed_out_until") and member.timed_out_until:
-                                        # If timeout is expiring in less than 1 day, re-apply
-                                        if (member.timed_out_until - discord.utils.utcnow()).total_seconds() < 24 * 60 * 60:
-                                            await member.timeout(until=discord.utils.utcnow() + timedelta(seconds=TIMEOUT_DURATION), reason="OpenBanlist timeout enforcement")
-                                    else:
-                                        await member.timeout(until=discord.utils.utcnow() + timedelta(seconds=TIMEOUT_DURATION), reason="OpenBanlist timeout enforcement")
-                                except Exception:
-                                    pass
-            except Exception:
-                pass
+                        # If timeout is expiring in less than 1 day, re-apply
+                        if entry.get("until", 0) - now < 24 * 60 * 60:
+                            new_until = discord.utils.utcnow() + timedelta(seconds=TIMEOUT_DURATION)
+                            try:
+                                await member.timeout(until=new_until, reason="OpenBanlist timeout enforcement")
+                                self._record_action(guild_id, member_id, "timeout", new_until)
+                                changed = True
+                            except discord.HTTPException:
+                                pass
+                    if changed:
+                        await self._save_applied(guild_id)
+            except Exception as e:
+                self._record_error("timeout enforcement", e)
             await asyncio.sleep(60 * 60)  # Run every hour
 
     @commands.Cog.listener()
@@ -572,179 +862,178 @@ class OpenBanList(commands.Cog):
         if not await self.config.guild(guild).enabled():
             return
 
-        async with self.session.get(self.banlist_url) as response:
-            if response.status == 200:
-                banlist_data = await response.json()
-                log_channel_id = await self.config.guild(guild).log_channel()
-                log_channel = guild.get_channel(log_channel_id)
-
-                # Find all bans for this member, if any, by reported_id
-                user_bans = []
-                banlist_items = list(banlist_data.items())
-                for idx, (ban_key, ban_info) in enumerate(banlist_items, 1):
-                    if int(ban_info.get("reported_id", 0)) == member.id:
-                        user_bans.append((idx, ban_info))
-                # Only consider bans that are still active (appeal_verdict is not "accepted")
-                active_bans = [ban_info for idx, ban_info in user_bans if ban_info.get("appeal_info", {}).get("appeal_verdict", "").lower() != "accepted"]
+        if await self.get_banlist() is not None:
+            log_channel_id = await self.config.guild(guild).log_channel()
+            log_channel = guild.get_channel(log_channel_id)
 
-                severity_map = {"1": "High", "2": "Medium", "3": "Low"}
-                actions = await self.config.guild(guild).actions()
+            # Find all bans for this member, if any, by reported_id (indexed, no network)
+            user_bans = await self.get_user_bans(member.id)
+            # Only consider bans that are still active (appeal_verdict is not "accepted")
+            active_bans = [ban_info for idx, ban_info in user_bans if ban_info.get("appeal_info", {}).get("appeal_verdict", "").lower() != "accepted"]
 
-                # If there are active bans, process as before
-                if user_bans:
-                    if active_bans:
-                        # There is at least one active ban
-                        active_ban = active_bans[0]
-                        severity = str(active_ban.get("severity", "3"))
-                        action = actions.get(severity, "none")
-                        try:
-                            if action == "kick":
-                                try:
-                                    embed = discord.Embed(
-                                        title="You're unable to join this server",
-                                        description="You have been removed from the server due to an active ban on OpenBanlist.",
-                                        color=0xff4545
-                                    )
-                                    embed.add_field(name="Severity", value=f"{severity} ({severity_map.get(severity, 'Unknown')})", inline=True)
-                                    embed.add_field(name="Appeal", value="To appeal, please visit [openbanlist.cc/appeal](https://openbanlist.cc/appeal).", inline=False)
-                                    await member.send(embed=embed)
-                                except discord.Forbidden:
-                                    pass
-                                await member.kick(reason=f"Active ban detected on OpenBanlist (severity {severity})")
-                                action_taken = "kicked"
-                            elif action == "ban":
-                                try:
-                                    embed = discord.Embed(
-                                        title="You're unable to join this server",
-                                        description="You have been banned from the server due to an active ban on OpenBanlist.",
-                                        color=0xff4545
-                                    )
-                                    embed.add_field(name="Severity", value=f"{severity} ({severity_map.get(severity, 'Unknown')})", inline=True)
-                                    embed.add_field(name="Appeal", value="To appeal, please visit [openbanlist.cc/appeal](https://openbanlist.cc/appeal).", inline=False)
-                                    await member.send(embed=embed)
-                                except discord.Forbidden:
-                                    pass
-                                await member.ban(reason=f"Active ban detected on OpenBanlist (severity {severity})")
-                                action_taken = "banned"
-                            elif action == "timeout":
-                                try:
-                                    embed = discord.Embed(
-                                        title="You have been timed out in this server",
-                                        description="You have been timed out due to an active ban on OpenBanlist. You will not be able to interact in this server.",
-                                        color=0xffa500
-                                    )
-                                    embed.add_field(name="Severity", value=f"{severity} ({severity_map.get(severity, 'Unknown')})", inline=True)
-                                    embed.add_field(name="Appeal", value="To appeal, please visit [openbanlist.cc/appeal](https://openbanlist.cc/appeal).", inline=False)
-                                    await member.send(embed=embed)
-                                except discord.Forbidden:
-                                    pass
-                                try:
-                                    await member.timeout(until=discord.utils.utcnow() + timedelta(seconds=TIMEOUT_DURATION), reason=f"Active ban detected on OpenBanlist (severity {severity})")
-                                    action_taken = "timed out"
-                                except Exception:
-                                    action_taken = "failed to timeout"
-                            else:
-                                action_taken = "none"
-                        except discord.Forbidden:
-                            action_taken = "failed due to permissions"
+            severity_map = {"1": "High", "2": "Medium", "3": "Low"}
+            actions = await self.config.guild(guild).actions()
+
+            # If there are active bans, process as before
+            if user_bans:
+                if active_bans:
+                    # There is at least one active ban
+                    active_ban = active_bans[0]
+                    severity = str(active_ban.get("severity", "3"))
+                    action = actions.get(severity, "none")
+                    try:
+                        if action == "kick":
+                            try:
+                                embed = discord.Embed(
+                                    title="You're unable to join this server",
+                                    description="You have been removed from the server due to an active ban on OpenBanlist.",
+                                    color=0xff4545
+                                )
+                                embed.add_field(name="Severity", value=f"{severity} ({severity_map.get(severity, 'Unknown')})", inline=True)
+                                embed.add_field(name="Appeal", value="To appeal, please visit [openbanlist.cc/appeal](https://openbanlist.cc/appeal).", inline=False)
+                                await member.send(embed=embed)
+                            except discord.Forbidden:
+                                pass
+                            await member.kick(reason=f"Active ban detected on OpenBanlist (severity {severity})")
+                            action_taken = "kicked"
+                        elif action == "ban":
+                            try:
+                                embed = discord.Embed(
+                                    title="You're unable to join this server",
+                                    description="You have been banned from the server due to an active ban on OpenBanlist.",
+                                    color=0xff4545
+                                )
+                                embed.add_field(name="Severity", value=f"{severity} ({severity_map.get(severity, 'Unknown')})", inline=True)
+                                embed.add_field(name="Appeal", value="To appeal, please visit [openbanlist.cc/appeal](https://openbanlist.cc/appeal).", inline=False)
+                                await member.send(embed=embed)
+                            except discord.Forbidden:
+                                pass
+                            await member.ban(reason=f"Active ban detected on OpenBanlist (severity {severity})")
+                            self._record_action(guild.id, member.id, "ban")
+                            await self._save_applied(guild.id)
+                            action_taken = "banned"
+                        elif action == "timeout":
+                            try:
+                                embed = discord.Embed(
+                                    title="You have been timed out in this server",
+                                    description="You have been timed out due to an active ban on OpenBanlist. You will not be able to interact in this server.",
+                                    color=0xffa500
+                                )
+                                embed.add_field(name="Severity", value=f"{severity} ({severity_map.get(severity, 'Unknown')})", inline=True)
+                                embed.add_field(name="Appeal", value="To appeal, please visit [openbanlist.cc/appeal](https://openbanlist.cc/appeal).", inline=False)
+                                await member.send(embed=embed)
+                            except discord.Forbidden:
+                                pass
+                            try:
+                                until = discord.utils.utcnow() + timedelta(seconds=TIMEOUT_DURATION)
+                                await member.timeout(until=until, reason=f"Active ban detected on OpenBanlist (severity {severity})")
+                                self._record_action(guild.id, member.id, "timeout", until)
+                                await self._save_applied(guild.id)
+                                action_taken = "timed out"
+                            except Exception:
+                                action_taken = "failed to timeout"
+                        else:
+                            action_taken = "none"
+                    except discord.Forbidden:
+                        action_taken = "failed due to permissions"
 
-                        if log_channel:
-                            embed = discord.Embed(
-                                title="Banlist match found",
-                                description=f"{member.mention} ({member.id}) joined and is actively listed on OpenBanlist.",
-                                color=0xff4545
-                            )
-                            embed.add_field(name="Action taken", value=action_taken, inline=False)
-                            embed.add_field(name="Ban reason", value=active_ban.get("ban_reason", "No reason provided"), inline=False)
-                            embed.add_field(name="Context", value=active_ban.get("context", "No context provided"), inline=False)
-                            embed.add_field(name="Severity", value=f"{severity} ({severity_map.get(severity, 'Unknown')})", inline=True)
-                            # Process reporter name if available
-                            reporter_id = active_ban.get("reporter_id", "Unknown")
-                            reporter_name = active_ban.get("reporter_name", None)
-                            if reporter_name:
-                                reporter_display = f"{reporter_name} (<@{reporter_id}>)"
-                            else:
-                                reporter_display = f"<@{reporter_id}>"
-                            embed.add_field(name="Reporter", value=reporter_display, inline=False)
-                            approver_id = active_ban.get("approver_id", "Unknown")
-                            approver_name = active_ban.get("approver_name", None)
-                            if approver_name:
-                                approver_display = f"{approver_name} (<@{approver_id}>)"
-                            else:
-                                approver_display = f"<@{approver_id}>"
-                            embed.add_field(name="Approver", value=approver_display, inline=False)
-                            embed.add_field(name="Appealable", value=str(active_ban.get("appealable", False)), inline=False)
-                            if active_ban.get("appealed", False):
-                                appeal_info = active_ban.get("appeal_info", {})
-                                appeal_verdict = appeal_info.get("appeal_verdict", "")
-                                if not appeal_verdict:
-                                    appeal_status = "Pending"
-                                elif appeal_verdict == "accepted":
-                                    # If the appeal is accepted, this ban should not be considered active, so skip showing as active
-                                    # Instead, fall through to the else block below
-                                    active_bans = []
-                                elif appeal_verdict == "denied":
-                                    appeal_status = "Denied"
-                                else:
-                                    appeal_status = "Unknown"
-                                if active_bans:
-                                    embed.add_field(name="Appeal status", value=appeal_status, inline=True)
-                                    embed.add_field(name="Appeal verdict", value=appeal_verdict or "No verdict provided", inline=False)
-                                    appeal_reason = appeal_info.get("appeal_reason", "")
-                                    if appeal_reason:
-                                        embed.add_field(name="Appeal reason", value=appeal_reason, inline=False)
-                            if active_bans:
-                                evidence = active_ban.get("evidence", "")
-                                if evidence:
-                                    embed.set_image(url=evidence)
-                                report_date = active_ban.get("report_date", "Unknown")
-                                ban_date = active_ban.get("ban_date", "Unknown")
-                                if report_date != "Unknown":
-                                    embed.add_field(name="Report date", value=f"<t:{report_date}:F>", inline=False)
-                                else:
-                                    embed.add_field(name="Report date", value="Unknown", inline=False)
-                                if ban_date != "Unknown":
-                                    embed.add_field(name="Ban date", value=f"<t:{ban_date}:F>", inline=False)
-                                else:
-                                    embed.add_field(name="Ban date", value="Unknown", inline=False)
-                                await log_channel.send(embed=embed)
-                                return  # Only send the active ban embed if still valid
-                    # If we get here, either there are no active bans, or the only ban(s) have an accepted appeal
                     if log_channel:
                         embed = discord.Embed(
-                            title="User join screened",
-                            description=f"**{member.mention}** ({member.id}) joined the server and has a punishment history on OpenBanlist",
-                            color=discord.Color.orange()
+                            title="Banlist match found",
+                            description=f"{member.mention} ({member.id}) joined and is actively listed on OpenBanlist.",
+                            color=0xff4545
                         )
-                        # Add a single field for prior bans as per instructions
-                        prior_bans_lines = []
-                        for idx, ban_info in user_bans:
-                            reason = ban_info.get("ban_reason", "No reason provided")
-                            ban_date = ban_info.get("ban_date", None)
-                            severity = str(ban_info.get("severity", "3"))
-                            if ban_date and ban_date != "Unknown":
-                                try:
-                                    # ban_date is a unix timestamp, so use Discord dynamic timestamp
-                                    date_str = f"<t:{int(ban_date)}:F>"
-                                except Exception:
-                                    date_str = str(ban_date)
+                        embed.add_field(name="Action taken", value=action_taken, inline=False)
+                        embed.add_field(name="Ban reason", value=active_ban.get("ban_reason", "No reason provided"), inline=False)
+                        embed.add_field(name="Context", value=active_ban.get("context", "No context provided"), inline=False)
+                        embed.add_field(name="Severity", value=f"{severity} ({severity_map.get(severity, 'Unknown')})", inline=True)
+                        # Process reporter name if available
+                        reporter_id = active_ban.get("reporter_id", "Unknown")
+                        reporter_name = active_ban.get("reporter_name", None)
+                        if reporter_name:
+                            reporter_display = f"{reporter_name} (<@{reporter_id}>)"
+                        else:
+                            reporter_display = f"<@{reporter_id}>"
+                        embed.add_field(name="Reporter", value=reporter_display, inline=False)
+                        approver_id = active_ban.get("approver_id", "Unknown")
+                        approver_name = active_ban.get("approver_name", None)
+                        if approver_name:
+                            approver_display = f"{approver_name} (<@{approver_id}>)"
+                        else:
+                            approver_display = f"<@{approver_id}>"
+                        embed.add_field(name="Approver", value=approver_display, inline=False)
+                        embed.add_field(name="Appealable", value=str(active_ban.get("appealable", False)), inline=False)
+                        if active_ban.get("appealed", False):
+                            appeal_info = active_ban.get("appeal_info", {})
+                            appeal_verdict = appeal_info.get("appeal_verdict", "")
+                            if not appeal_verdict:
+                                appeal_status = "Pending"
+                            elif appeal_verdict == "accepted":
+                                # If the appeal is accepted, this ban should not be considered active, so skip showing as active
+                                # Instead, fall through to the else block below
+                                active_bans = []
+                            elif appeal_verdict == "denied":
+                                appeal_status = "Denied"
                             else:
-                                date_str = "Unknown"
-                            prior_bans_lines.append(f"`#{idx}` for **{reason}** (Severity {severity_map.get(severity, 'Unknown')}) on **{date_str}**")
-                        if prior_bans_lines:
-                            embed.add_field(
-                                name="Prior bans",
-                                value="\n".join(prior_bans_lines),
-                                inline=False
-                            )
-                        embed.set_footer(text="Powered by OpenBanlist, a BeeHive service | openbanlist.cc")
-                        await log_channel.send(embed=embed)
-                else:
-                    if log_channel:
-                        embed = discord.Embed(
-                            title="User join screened",
-                            description=f"**{member.mention}** ({member.id}) joined the server and passed all banlist checks",
-                            color=0x2bbd8e
+                                appeal_status = "Unknown"
+                            if active_bans:
+                                embed.add_field(name="Appeal status", value=appeal_status, inline=True)
+                                embed.add_field(name="Appeal verdict", value=appeal_verdict or "No verdict provided", inline=False)
+                                appeal_reason = appeal_info.get("appeal_reason", "")
+                                if appeal_reason:
+                                    embed.add_field(name="Appeal reason", value=appeal_reason, inline=False)
+                        if active_bans:
+                            evidence = active_ban.get("evidence", "")
+                            if evidence:
+                                embed.set_image(url=evidence)
+                            report_date = active_ban.get("report_date", "Unknown")
+                            ban_date = active_ban.get("ban_date", "Unknown")
+                            if report_date != "Unknown":
+                                embed.add_field(name="Report date", value=f"<t:{report_date}:F>", inline=False)
+                            else:
+                                embed.add_field(name="Report date", value="Unknown", inline=False)
+                            if ban_date != "Unknown":
+                                embed.add_field(name="Ban date", value=f"<t:{ban_date}:F>", inline=False)
+                            else:
+                                embed.add_field(name="Ban date", value="Unknown", inline=False)
+                            await log_channel.send(embed=embed)
+                            return  # Only send the active ban embed if still valid
+                # If we get here, either there are no active bans, or the only ban(s) have an accepted appeal
+                if log_channel:
+                    embed = discord.Embed(
+                        title="User join screened",
+                        description=f"**{member.mention}** ({member.id}) joined the server and has a punishment history on OpenBanlist",
+                        color=discord.Color.orange()
+                    )
+                    # Add a single field for prior bans as per instructions
+                    prior_bans_lines = []
+                    for idx, ban_info in user_bans:
+                        reason = ban_info.get("ban_reason", "No reason provided")
+                        ban_date = ban_info.get("ban_date", None)
+                        severity = str(ban_info.get("severity", "3"))
+                        if ban_date and ban_date != "Unknown":
+                            try:
+                                # ban_date is a unix timestamp, so use Discord dynamic timestamp
+                                date_str = f"<t:{int(ban_date)}:F>"
+                            except Exception:
+                                date_str = str(ban_date)
+                        else:
+                            date_str = "Unknown"
+                        prior_bans_lines.append(f"`#{idx}` for **{reason}** (Severity {severity_map.get(severity, 'Unknown')}) on **{date_str}**")
+                    if prior_bans_lines:
+                        embed.add_field(
+                            name="Prior bans",
+                            value="\n".join(prior_bans_lines),
+                            inline=False
                         )
-                        embed.set_footer(text="Powered by OpenBanlist, a BeeHive service | openbanlist.cc")
-                        await log_channel.send(embed=embed)
+                    embed.set_footer(text="Powered by OpenBanlist, a BeeHive service | openbanlist.cc")
+                    await log_channel.send(embed=embed)
+            else:
+                if log_channel:
+                    embed = discord.Embed(
+                        title="User join screened",
+                        description=f"**{member.mention}** ({member.id}) joined the server and passed all banlist checks",
+                        color=0x2bbd8e
+                    )
+                    embed.set_footer(text="Powered by OpenBanlist, a BeeHive service | openbanlist.cc")
+                    await log_channel.send(embed=embed)
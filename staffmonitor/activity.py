@@ -0,0 +1,254 @@
+import asyncio
+import json
+import sqlite3
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+from red_commons.logging import getLogger
+
+log = getLogger("red.beehive.staffmonitor")
+
+DAY = 86400
+FLUSH_SIZE = 500  # Buffered events that trigger a write before the next periodic flush
+MAX_PENDING = 20000  # Buffered events kept at most while the database can't be written
+RAW_LIMIT = 1000  # Raw events kept per member and kind
+RETENTION = {  # Days raw events of each kind are kept; the daily counters are kept for good
+    "punishments": 365,
+    "interactions": 30,
+    "voice_sessions": 90,
+    "command_usage": 90,
+}
+KINDS = tuple(RETENTION)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    guild_id INTEGER NOT NULL,
+    member_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    ts REAL NOT NULL,
+    target_id INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_member ON events (guild_id, member_id, kind, ts);
+CREATE INDEX IF NOT EXISTS events_target ON events (guild_id, target_id) WHERE target_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS events_kind ON events (kind, ts);
+CREATE TABLE IF NOT EXISTS daily (
+    guild_id INTEGER NOT NULL,
+    member_id INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (guild_id, member_id, day, metric)
+) WITHOUT ROWID;
+"""
+
+
+def entry_time(entry):
+    """Unix time of a stored entry, from its (naive UTC) ISO timestamp."""
+    iso = entry.get("timestamp") or entry.get("leave_time")
+    try:
+        moment = datetime.fromisoformat(iso)
+    except (TypeError, ValueError):
+        return time.time()
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def entry_metric(kind, entry):
+    """The (metric, value) an entry adds to its member's daily counters."""
+    if kind == "interactions":
+        return entry.get("type", "message"), 1
+    if kind == "voice_sessions":
+        return "voice_seconds", entry.get("duration", 0)
+    if kind == "command_usage":
+        return f"command:{entry.get('command', 'unknown')}", 1
+    return f"punishment:{entry.get('action', 'unknown')}", 1
+
+
+class RollingCounter:
+    """Counts events per key over the last `window` seconds, in amortized O(1) per event."""
+
+    def __init__(self, window, limit=1000):
+        self.window = window
+        self.limit = limit
+        self._times = {}  # {key: deque of timestamps, oldest first}
+
+    def add(self, key, timestamp):
+        times = self._times.get(key)
+        if times is None:
+            times = self._times[key] = deque(maxlen=self.limit)
+        times.append(timestamp)
+        return self.count(key, timestamp)
+
+    def count(self, key, now):
+        times = self._times.get(key)
+        if times is None:
+            return 0
+        cutoff = now - self.window
+        while times and times[0] <= cutoff:
+            times.popleft()
+        if not times:
+            del self._times[key]
+            return 0
+        return len(times)
+
+
+class ActivityStore:
+    """
+    Staff activity kept in SQLite in the cog's data folder.
+
+    Every event is written twice: as a raw row, kept for the kind's `RETENTION` and at most
+    `RAW_LIMIT` per member, and as an increment of its member's per-day counter for the event's
+    metric, which is what the profile totals read. Events are buffered in memory and written in
+    one transaction per flush, and every database call runs in a thread, one at a time.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._db = None
+        self._lock = asyncio.Lock()
+        self._events = []  # [(guild_id, member_id, kind, ts, target_id, data)]
+        self._daily = {}  # {(guild_id, member_id, day, metric): value}
+        self._flush_task = None
+
+    async def _call(self, func, *args):
+        async with self._lock:
+            return await asyncio.to_thread(func, *args)
+
+    async def open(self):
+        def connect():
+            db = sqlite3.connect(str(self.path), check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(SCHEMA)
+            return db
+
+        self._db = await self._call(connect)
+
+    async def close(self):
+        if self._db is None:
+            return
+        try:
+            await self.flush()
+        finally:
+            await self._call(self._db.close)
+            self._db = None
+
+    def record(self, guild_id, member_id, kind, entry, ts=None):
+        """Buffer one event; punishments are counted for the staff member who issued them."""
+        ts = time.time() if ts is None else ts
+        target_id = entry.get("target_id") if kind == "punishments" else None
+        self._events.append((guild_id, member_id, kind, ts, target_id, json.dumps(entry)))
+        metric, value = entry_metric(kind, entry)
+        key = (guild_id, member_id, int(ts // DAY) * DAY, metric)
+        self._daily[key] = self._daily.get(key, 0) + value
+        if len(self._events) >= FLUSH_SIZE and self._db is not None and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self.flush())
+            self._flush_task.add_done_callback(self._flushed)
+
+    def _flushed(self, task):
+        self._flush_task = None
+        if not task.cancelled() and task.exception() is not None:
+            log.error("Error writing staff activity", exc_info=task.exception())
+
+    async def flush(self):
+        if not self._events and not self._daily:
+            return
+        events, daily = self._events, self._daily
+        self._events, self._daily = [], {}
+        try:
+            await self._call(self._write, events, daily)
+        except Exception:
+            # Keep the events for the next flush, dropping the oldest if it has been failing for long
+            self._events = (events + self._events)[-MAX_PENDING:]
+            for key, value in daily.items():
+                self._daily[key] = self._daily.get(key, 0) + value
+            raise
+
+    def _write(self, events, daily):
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO events (guild_id, member_id, kind, ts, target_id, data) VALUES (?, ?, ?, ?, ?, ?)",
+                events,
+            )
+            self._db.executemany(
+                "INSERT INTO daily (guild_id, member_id, day, metric, value) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (guild_id, member_id, day, metric) DO UPDATE SET value = value + excluded.value",
+                [(*key, value) for key, value in daily.items()],
+            )
+
+    async def history(self, guild_id, member_id, kind, limit=None, include_targeted=True):
+        """
+        Raw entries of one kind for a member, oldest first.
+
+        For punishments this includes the ones the member received unless `include_targeted`
+        is False.
+        """
+        await self.flush()
+        if kind == "punishments" and include_targeted:
+            where, params = "guild_id = ? AND kind = ? AND (member_id = ? OR target_id = ?)", (guild_id, kind, member_id, member_id)
+        else:
+            where, params = "guild_id = ? AND kind = ? AND member_id = ?", (guild_id, kind, member_id)
+        query = f"SELECT data FROM events WHERE {where} ORDER BY ts DESC, id DESC"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+
+        def read():
+            return [json.loads(data) for (data,) in self._db.execute(query, params)]
+
+        rows = await self._call(read)
+        rows.reverse()
+        return rows
+
+    async def totals(self, guild_id, member_id, since=None):
+        """{metric: total} from a member's daily counters, optionally from the day of `since` on."""
+        await self.flush()
+        query = "SELECT metric, SUM(value) FROM daily WHERE guild_id = ? AND member_id = ?"
+        params = [guild_id, member_id]
+        if since is not None:
+            query += " AND day >= ?"
+            params.append(int(since // DAY) * DAY)
+        query += " GROUP BY metric"
+
+        def read():
+            return dict(self._db.execute(query, params).fetchall())
+
+        return await self._call(read)
+
+    async def recent(self, kind, since):
+        """[(guild_id, member_id, ts, entry)] of one kind since a unix time, oldest first."""
+        await self.flush()
+
+        def read():
+            rows = self._db.execute(
+                "SELECT guild_id, member_id, ts, data FROM events WHERE kind = ? AND ts >= ? ORDER BY ts",
+                (kind, since),
+            )
+            return [(guild_id, member_id, ts, json.loads(data)) for guild_id, member_id, ts, data in rows]
+
+        return await self._call(read)
+
+    async def prune(self):
+        """Drop raw events past their retention or beyond the per-member limit. Returns rows deleted."""
+        await self.flush()
+        now = time.time()
+
+        def delete():
+            deleted = 0
+            with self._db:
+                for kind, days in RETENTION.items():
+                    deleted += self._db.execute(
+                        "DELETE FROM events WHERE kind = ? AND ts < ?", (kind, now - days * DAY)
+                    ).rowcount
+                deleted += self._db.execute(
+                    "DELETE FROM events WHERE id IN (SELECT id FROM ("
+                    "SELECT id, ROW_NUMBER() OVER (PARTITION BY guild_id, member_id, kind ORDER BY ts DESC, id DESC) AS n "
+                    "FROM events) WHERE n > ?)",
+                    (RAW_LIMIT,),
+                ).rowcount
+            return deleted
+
+        return await self._call(delete)
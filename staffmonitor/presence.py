@@ -0,0 +1,124 @@
+import heapq
+
+AFK_TIMEOUT = 1800  # Seconds without activity before a staff member counts as AFK
+
+
+class StaffIndex:
+    """
+    Which members of each guild are staff, kept current from member and role events.
+
+    A guild is indexed from its cached members the first time it's needed. With staff roles
+    configured the index maps each staff role to the members holding it; without any, staff
+    are the members allowed to kick or ban, as before.
+    """
+
+    def __init__(self):
+        self.staff_roles = {}  # {guild_id: frozenset of role ids}, empty when staff are picked by permissions
+        self.role_members = {}  # {guild_id: {role_id: set of member ids}}
+        self.moderators = {}  # {guild_id: set of member ids}, used when no staff roles are set
+
+    def indexed(self, guild_id):
+        return guild_id in self.staff_roles
+
+    def set_guild(self, guild_id, staff_roles, members):
+        """Index a guild from (member_id, role_ids, moderator) for each of its members."""
+        self.staff_roles[guild_id] = frozenset(staff_roles)
+        self.role_members[guild_id] = {role_id: set() for role_id in staff_roles}
+        self.moderators[guild_id] = set()
+        for member_id, role_ids, moderator in members:
+            self.update_member(guild_id, member_id, role_ids, moderator)
+
+    def forget(self, guild_id):
+        self.staff_roles.pop(guild_id, None)
+        self.role_members.pop(guild_id, None)
+        self.moderators.pop(guild_id, None)
+
+    def update_member(self, guild_id, member_id, role_ids, moderator):
+        """Record a member's current roles and permissions, returns whether they're staff."""
+        staff_roles = self.staff_roles.get(guild_id)
+        if staff_roles is None:
+            return False
+        if not staff_roles:
+            if moderator:
+                self.moderators[guild_id].add(member_id)
+            else:
+                self.moderators[guild_id].discard(member_id)
+            return moderator
+        role_ids = set(role_ids)
+        staff = False
+        for role_id, members in self.role_members[guild_id].items():
+            if role_id in role_ids:
+                members.add(member_id)
+                staff = True
+            else:
+                members.discard(member_id)
+        return staff
+
+    def remove_member(self, guild_id, member_id):
+        self.moderators.get(guild_id, set()).discard(member_id)
+        for members in self.role_members.get(guild_id, {}).values():
+            members.discard(member_id)
+
+    def is_staff(self, guild_id, member_id):
+        if not self.staff_roles.get(guild_id):
+            return member_id in self.moderators.get(guild_id, ())
+        return any(member_id in members for members in self.role_members[guild_id].values())
+
+    def members(self, guild_id):
+        """Ids of every staff member of a guild."""
+        if not self.staff_roles.get(guild_id):
+            return set(self.moderators.get(guild_id, ()))
+        return set().union(*self.role_members[guild_id].values())
+
+
+class AfkTracker:
+    """
+    Last activity of each staff member, with a heap of the moments they'd go AFK.
+
+    Each tracked member has at most one heap entry. Activity only moves their last-active
+    time; when an entry comes due and the member has been active since, it is pushed back to
+    the new deadline instead. Checking for AFK members therefore only touches the entries that
+    came due, not every staff member.
+    """
+
+    def __init__(self, timeout=AFK_TIMEOUT):
+        self.timeout = timeout
+        self.last_active = {}  # {(guild_id, member_id): unix time}
+        self.afk = set()  # (guild_id, member_id) currently AFK
+        self._heap = []  # [(deadline, (guild_id, member_id))]
+        self._scheduled = set()  # Keys with an entry in the heap
+
+    def touch(self, key, timestamp):
+        """Record activity, returns True if the member was AFK until now."""
+        was_afk = key in self.afk
+        self.afk.discard(key)
+        if timestamp >= self.last_active.get(key, 0):
+            self.last_active[key] = timestamp
+        if key not in self._scheduled:
+            heapq.heappush(self._heap, (self.last_active[key] + self.timeout, key))
+            self._scheduled.add(key)
+        return was_afk
+
+    def forget(self, key):
+        # Its heap entry is skipped when it comes due
+        self.last_active.pop(key, None)
+        self.afk.discard(key)
+
+    def expired(self, now):
+        """Return the keys that went AFK since the last call."""
+        gone = []
+        while self._heap and self._heap[0][0] <= now:
+            _deadline, key = heapq.heappop(self._heap)
+            last_active = self.last_active.get(key)
+            if last_active is None:
+                self._scheduled.discard(key)
+                continue
+            deadline = last_active + self.timeout
+            if deadline > now:
+                heapq.heappush(self._heap, (deadline, key))
+                continue
+            self._scheduled.discard(key)
+            if key not in self.afk:
+                self.afk.add(key)
+                gone.append(key)
+        return gone
@@ -1,14 +1,20 @@
 import discord
+from discord.ext import tasks
 from red_commons.logging import getLogger
 from redbot.core import commands, Config, checks
 from redbot.core.bot import Red
+from redbot.core.data_manager import cog_data_path
 from redbot.core.utils.chat_formatting import humanize_list, humanize_number, pagify
 from redbot.core.utils.menus import menu, DEFAULT_CONTROLS
-from datetime import datetime, timedelta
+from datetime import datetime
 import asyncio
 import csv
 import io
 import json
+import time
+
+from .activity import KINDS, ActivityStore, RollingCounter, entry_time
+from .presence import AfkTracker, StaffIndex
 
 log = getLogger("red.beehive.staffmonitor")
 
@@ -28,6 +34,7 @@ DEFAULT_GUILD = {
 }
 
 DEFAULT_MEMBER = {
+    # Legacy activity lists, moved into the activity store on load
     "punishments": [],
     "interactions": [],
     "voice_sessions": [],
@@ -53,20 +60,107 @@ class StaffMonitor(commands.Cog):
         self.config = Config.get_conf(self, identifier=0xBEE123456789, force_registration=True)
         self.config.register_guild(**DEFAULT_GUILD)
         self.config.register_member(**DEFAULT_MEMBER)
+        self.config.register_global(activity_migrated=False)
         self._voice_states = {}  # member_id: (channel_id, join_time)
+        self.activity = ActivityStore(cog_data_path(self) / "activity.sqlite3")
+        # Punishments per (guild, staff, action) in the last 10 minutes and per (guild, staff) in the last hour
+        self._mass_actions = RollingCounter(600)
+        self._recent_actions = RollingCounter(3600)
+        self.staff_index = StaffIndex()
+        self.afk_tracker = AfkTracker()
+        self._dirty_presence = set()  # (guild_id, member_id) whose last_active/afk need saving
         self._afk_check_task = self.bot.loop.create_task(self.afk_check_loop())
 
-    def cog_unload(self):
+    async def cog_load(self):
+        await self.activity.open()
+        try:
+            await self._migrate_activity()
+        except Exception as e:
+            log.error("Error migrating staff activity: %s", e)
+        # Rebuild the alert windows so a reload doesn't reset them
+        since = time.time() - 3600
+        for guild_id, staff_id, ts, entry in await self.activity.recent("punishments", since):
+            self._count_punishment(guild_id, staff_id, entry["action"], ts)
+        self.flush_activity_loop.start()
+        self.prune_activity_loop.start()
+        # Seed the AFK deadlines from the saved last activity
+        for guild_id, members in (await self.config.all_members()).items():
+            for member_id, data in members.items():
+                if not data.get("last_active"):
+                    continue
+                key = (guild_id, member_id)
+                self.afk_tracker.touch(key, entry_time({"timestamp": data["last_active"]}))
+                if data.get("afk"):
+                    self.afk_tracker.afk.add(key)
+
+    async def cog_unload(self):
         self._afk_check_task.cancel()
+        self.flush_activity_loop.cancel()
+        self.prune_activity_loop.cancel()
+        try:
+            await self._save_presence()
+        except Exception as e:
+            log.error("Error saving staff presence: %s", e)
+        await self.activity.close()
+
+    async def _migrate_activity(self):
+        """Move the per-member Config activity lists into the activity store, once."""
+        if await self.config.activity_migrated():
+            return
+        all_members = await self.config.all_members()
+        for guild_id, members in all_members.items():
+            for member_id, data in members.items():
+                for kind in KINDS:
+                    for entry in data.get(kind, []):
+                        # Punishments were stored for both sides, keep the staff member's copy
+                        if kind == "punishments" and entry.get("staff_id") != member_id:
+                            continue
+                        self.activity.record(guild_id, member_id, kind, entry, ts=entry_time(entry))
+            await self.activity.flush()
+        await self.activity.prune()
+        await self.config.activity_migrated.set(True)
+        for guild_id, members in all_members.items():
+            for member_id in members:
+                member_config = self.config.member_from_ids(guild_id, member_id)
+                for kind in KINDS:
+                    await member_config.get_attr(kind).clear()
+
+    @tasks.loop(seconds=10)
+    async def flush_activity_loop(self):
+        try:
+            await self.activity.flush()
+        except Exception as e:
+            log.error("Error writing staff activity: %s", e)
+
+    @tasks.loop(hours=1)
+    async def prune_activity_loop(self):
+        try:
+            await self.activity.prune()
+        except Exception as e:
+            log.error("Error pruning staff activity: %s", e)
 
     # --- Utility Functions ---
 
     async def is_staff(self, member: discord.Member, guild: discord.Guild = None):
         guild = guild or member.guild
+        if not self.staff_index.indexed(guild.id):
+            await self._index_guild(guild)
+        if isinstance(member, discord.Member):
+            # The member object is current, so refresh the index from it while we're here
+            return self.staff_index.update_member(guild.id, member.id, *self._staff_attributes(member))
+        return self.staff_index.is_staff(guild.id, member.id)
+
+    @staticmethod
+    def _staff_attributes(member: discord.Member):
+        """The (role ids, moderator) the staff index needs for a member."""
+        permissions = member.guild_permissions
+        return [r.id for r in member.roles], permissions.kick_members or permissions.ban_members
+
+    async def _index_guild(self, guild: discord.Guild):
         staff_roles = await self.config.guild(guild).staff_roles()
-        if not staff_roles:
-            return member.guild_permissions.kick_members or member.guild_permissions.ban_members
-        return any(r.id in staff_roles for r in member.roles)
+        self.staff_index.set_guild(
+            guild.id, staff_roles, ((m.id, *self._staff_attributes(m)) for m in guild.members)
+        )
 
     async def get_mod_channels(self, guild: discord.Guild):
         chans = await self.config.guild(guild).mod_channels()
@@ -90,14 +184,18 @@ class StaffMonitor(commands.Cog):
             "reason": reason or "",
             "timestamp": now,
         }
-        async with self.config.member(target).punishments() as punishments:
-            punishments.append(entry)
-        async with self.config.member(staff).punishments() as staff_punishments:
-            staff_punishments.append(entry)
+        # Stored once under the staff member, history lookups find it for the target as well
+        self.activity.record(guild.id, staff.id, "punishments", entry)
         # Alert if needed
         await self.check_alerts(guild, staff, action)
 
+    def _count_punishment(self, guild_id: int, staff_id: int, action: str, timestamp: float):
+        """Add a punishment to the alert windows, returns (same action in 10 minutes, any in the last hour)."""
+        mass = self._mass_actions.add((guild_id, staff_id, action), timestamp) if action in ("ban", "kick") else 0
+        return mass, self._recent_actions.add((guild_id, staff_id), timestamp)
+
     async def check_alerts(self, guild: discord.Guild, staff: discord.Member, action: str):
+        mass, recent = self._count_punishment(guild.id, staff.id, action, time.time())
         alerts = await self.config.guild(guild).alerts()
         alert_channel_id = alerts.get("alert_channel")
         if not alert_channel_id:
@@ -107,28 +205,17 @@ class StaffMonitor(commands.Cog):
             return
         # Mass ban/kick detection
         if action in ("ban", "kick"):
-            async with self.config.member(staff).punishments() as staff_punishments:
-                recent = [
-                    p for p in staff_punishments
-                    if p["action"] == action and
-                    datetime.fromisoformat(p["timestamp"]) > datetime.utcnow() - timedelta(minutes=10)
-                ]
-                threshold = alerts.get("mass_ban_threshold", 3)
-                if len(recent) >= threshold:
-                    await alert_channel.send(
-                        f":warning: **{staff.mention}** has performed {len(recent)} `{action}` actions in the last 10 minutes!"
-                    )
-        # Excessive punishments
-        async with self.config.member(staff).punishments() as staff_punishments:
-            recent = [
-                p for p in staff_punishments
-                if datetime.fromisoformat(p["timestamp"]) > datetime.utcnow() - timedelta(hours=1)
-            ]
-            threshold = alerts.get("excessive_punish_threshold", 5)
-            if len(recent) >= threshold:
+            threshold = alerts.get("mass_ban_threshold", 3)
+            if mass >= threshold:
                 await alert_channel.send(
-                    f":warning: **{staff.mention}** has issued {len(recent)} punishments in the last hour!"
+                    f":warning: **{staff.mention}** has performed {mass} `{action}` actions in the last 10 minutes!"
                 )
+        # Excessive punishments
+        threshold = alerts.get("excessive_punish_threshold", 5)
+        if recent >= threshold:
+            await alert_channel.send(
+                f":warning: **{staff.mention}** has issued {recent} punishments in the last hour!"
+            )
 
     # --- Interaction History ---
 
@@ -147,10 +234,9 @@ class StaffMonitor(commands.Cog):
             "timestamp": datetime.utcnow().isoformat(),
             "message_id": message.id,
         }
-        async with self.config.member(message.author).interactions() as interactions:
-            interactions.append(entry)
+        self.activity.record(message.guild.id, message.author.id, "interactions", entry)
         # Update last active
-        await self.config.member(message.author).last_active.set(datetime.utcnow().isoformat())
+        self._touch_presence(message.author)
 
     @commands.Cog.listener()
     async def on_message_edit(self, before, after):
@@ -167,8 +253,7 @@ class StaffMonitor(commands.Cog):
             "timestamp": datetime.utcnow().isoformat(),
             "message_id": after.id,
         }
-        async with self.config.member(after.author).interactions() as interactions:
-            interactions.append(entry)
+        self.activity.record(after.guild.id, after.author.id, "interactions", entry)
 
     @commands.Cog.listener()
     async def on_message_delete(self, message):
@@ -184,8 +269,7 @@ class StaffMonitor(commands.Cog):
             "timestamp": datetime.utcnow().isoformat(),
             "message_id": message.id,
         }
-        async with self.config.member(message.author).interactions() as interactions:
-            interactions.append(entry)
+        self.activity.record(message.guild.id, message.author.id, "interactions", entry)
 
     # --- Voice/Activity Tracking ---
 
@@ -210,8 +294,7 @@ class StaffMonitor(commands.Cog):
                     "leave_time": now.isoformat(),
                     "duration": duration,
                 }
-                async with self.config.member(member).voice_sessions() as sessions:
-                    sessions.append(entry)
+                self.activity.record(member.guild.id, member.id, "voice_sessions", entry)
         elif before.channel != after.channel:
             # Switched channels
             join_info = self._voice_states.pop(member.id, None)
@@ -225,26 +308,60 @@ class StaffMonitor(commands.Cog):
                     "leave_time": now.isoformat(),
                     "duration": duration,
                 }
-                async with self.config.member(member).voice_sessions() as sessions:
-                    sessions.append(entry)
+                self.activity.record(member.guild.id, member.id, "voice_sessions", entry)
             self._voice_states[member.id] = (after.channel.id, now)
 
+    # --- AFK Tracking ---
+
+    def _touch_presence(self, member: discord.Member):
+        key = (member.guild.id, member.id)
+        self.afk_tracker.touch(key, time.time())
+        self._dirty_presence.add(key)
+
+    async def _save_presence(self):
+        dirty, self._dirty_presence = self._dirty_presence, set()
+        for key in dirty:
+            last_active = self.afk_tracker.last_active.get(key)
+            if last_active is None:
+                continue
+            member_config = self.config.member_from_ids(*key)
+            await member_config.last_active.set(datetime.utcfromtimestamp(last_active).isoformat())
+            await member_config.afk.set(key in self.afk_tracker.afk)
+
     async def afk_check_loop(self):
         await self.bot.wait_until_ready()
         while True:
             try:
-                for guild in self.bot.guilds:
-                    for member in guild.members:
-                        if not await self.is_staff(member, guild):
-                            continue
-                        last_active = await self.config.member(member).last_active()
-                        if last_active:
-                            last_active_dt = datetime.fromisoformat(last_active)
-                            idle = (datetime.utcnow() - last_active_dt).total_seconds() > 1800
-                            await self.config.member(member).afk.set(idle)
+                # Only staff whose AFK deadline has passed are looked at
+                self._dirty_presence.update(self.afk_tracker.expired(time.time()))
+                await self._save_presence()
             except Exception as e:
                 log.error("AFK check error: %s", e)
-            await asyncio.sleep(600)
+            await asyncio.sleep(60)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if not self.staff_index.indexed(after.guild.id):
+            return
+        if before.roles == after.roles:
+            return
+        if not self.staff_index.update_member(after.guild.id, after.id, *self._staff_attributes(after)):
+            self.afk_tracker.forget((after.guild.id, after.id))
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        self.staff_index.remove_member(member.guild.id, member.id)
+        self.afk_tracker.forget((member.guild.id, member.id))
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        # Without staff roles, staff are picked by permissions, so reindex when a role's permissions change
+        if before.permissions != after.permissions and not self.staff_index.staff_roles.get(after.guild.id):
+            self.staff_index.forget(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.staff_index.forget(guild.id)
 
     # --- Command Usage Analytics ---
 
@@ -260,10 +377,9 @@ class StaffMonitor(commands.Cog):
             "channel_id": ctx.channel.id,
             "channel_name": str(ctx.channel),
         }
-        async with self.config.member(ctx.author).command_usage() as usage:
-            usage.append(entry)
+        self.activity.record(ctx.guild.id, ctx.author.id, "command_usage", entry)
         # Update last active
-        await self.config.member(ctx.author).last_active.set(datetime.utcnow().isoformat())
+        self._touch_presence(ctx.author)
 
     # --- Master Command Group: staff ---
 
@@ -367,23 +483,22 @@ class StaffMonitor(commands.Cog):
             await ctx.send("That user is not a staff member.")
             return
 
+        # Totals come from the daily counters, only the latest punishments are read raw
+        totals = await self.activity.totals(ctx.guild.id, member.id)
+
         # Gather punishments
-        punishments = await self.config.member(member).punishments()
-        punishments_count = len(punishments)
-        last_punishments = punishments[-5:] if punishments else []
+        punishments_count = int(sum(v for k, v in totals.items() if k.startswith("punishment:")))
+        last_punishments = await self.activity.history(
+            ctx.guild.id, member.id, "punishments", limit=5, include_targeted=False
+        )
 
         # Gather activity
-        voice_sessions = await self.config.member(member).voice_sessions()
-        total_voice = sum(s["duration"] for s in voice_sessions)
+        total_voice = totals.get("voice_seconds", 0)
         total_voice_minutes = int(total_voice // 60)
-        interactions = await self.config.member(member).interactions()
-        total_text = len([i for i in interactions if i["type"] == "message"])
+        total_text = int(totals.get("message", 0))
 
         # Gather command usage
-        command_usage = await self.config.member(member).command_usage()
-        command_counter = {}
-        for u in command_usage:
-            command_counter[u["command"]] = command_counter.get(u["command"], 0) + 1
+        command_counter = {k.split(":", 1)[1]: int(v) for k, v in totals.items() if k.startswith("command:")}
         top_commands = sorted(command_counter.items(), key=lambda x: x[1], reverse=True)[:5]
 
         # Gather feedback
@@ -429,28 +544,23 @@ class StaffMonitor(commands.Cog):
     async def staff_stats_export(self, ctx, member: discord.Member = None, format: str = "csv"):
         """Export staff logs to CSV or JSON."""
         if member:
-            data = {
-                "punishments": await self.config.member(member).punishments(),
-                "interactions": await self.config.member(member).interactions(),
-                "voice_sessions": await self.config.member(member).voice_sessions(),
-                "command_usage": await self.config.member(member).command_usage(),
+            data = {kind: await self.activity.history(ctx.guild.id, member.id, kind) for kind in KINDS}
+            data.update({
                 "notes": await self.config.member(member).notes(),
                 "feedback": await self.config.member(member).feedback(),
-            }
+            })
             filename = f"{member.id}_stafflogs.{format}"
         else:
             data = {}
-            for m in ctx.guild.members:
-                if not await self.is_staff(m, ctx.guild):
-                    continue
-                data[m.id] = {
-                    "punishments": await self.config.member(m).punishments(),
-                    "interactions": await self.config.member(m).interactions(),
-                    "voice_sessions": await self.config.member(m).voice_sessions(),
-                    "command_usage": await self.config.member(m).command_usage(),
-                    "notes": await self.config.member(m).notes(),
-                    "feedback": await self.config.member(m).feedback(),
-                }
+            if not self.staff_index.indexed(ctx.guild.id):
+                await self._index_guild(ctx.guild)
+            for member_id in sorted(self.staff_index.members(ctx.guild.id)):
+                member_config = self.config.member_from_ids(ctx.guild.id, member_id)
+                data[member_id] = {kind: await self.activity.history(ctx.guild.id, member_id, kind) for kind in KINDS}
+                data[member_id].update({
+                    "notes": await member_config.notes(),
+                    "feedback": await member_config.feedback(),
+                })
             filename = f"{ctx.guild.id}_stafflogs.{format}"
         if format.lower() == "csv":
             buf = io.StringIO()
@@ -497,6 +607,7 @@ class StaffMonitor(commands.Cog):
         """Set staff roles for monitoring."""
         ids = [r.id for r in roles]
         await self.config.guild(ctx.guild).staff_roles.set(ids)
+        self.staff_index.forget(ctx.guild.id)
         await ctx.send(f"Staff roles set: {', '.join(r.mention for r in roles)}")
 
     @staff_set.command(name="privacyroles")
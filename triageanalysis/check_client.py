@@ -0,0 +1,207 @@
+"""Exercise the async tria.ge client against a local stub server.
+
+Run from the repository root with ``python triageanalysis/check_client.py``.
+The stub serves the endpoints the cog uses with added latency, and answers
+some requests with 503 and 429 to exercise the retries. A batch of
+concurrent scans (submit, poll until reported, fetch the overview) runs
+alongside search, event streaming and sample downloads while a ticker
+measures event loop lag; the script checks every call returns what the old
+synchronous client did and that the loop never stalls. Not loaded by Red.
+"""
+import asyncio
+import importlib.util
+import json
+import sys
+import time
+import types
+from io import BytesIO
+from pathlib import Path
+
+from aiohttp import web
+
+HERE = Path(__file__).resolve().parent
+SCANS = 50
+LATENCY = 0.05  # Seconds the stub takes to answer each request
+MAX_LAG = 0.05  # Longest the event loop may go without running the ticker
+
+
+def load_client():
+    # Import client.py as part of the package without running __init__.py, which needs Red
+    package = types.ModuleType("triageanalysis")
+    package.__path__ = [str(HERE)]
+    sys.modules["triageanalysis"] = package
+    spec = importlib.util.spec_from_file_location("triageanalysis.client", HERE / "client.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class Stub:
+    def __init__(self):
+        self.polls = {}  # {sample id: status polls answered}
+        self.requests = 0
+        self.submissions = 0
+        self.flaky = 0
+
+    async def delay(self, request):
+        self.requests += 1
+        assert request.headers["Authorization"] == "Bearer token"
+        await asyncio.sleep(LATENCY)
+
+    async def submit(self, request):
+        await self.delay(request)
+        if request.content_type == "multipart/form-data":
+            body = await request.read()
+            assert b'name="_json"' in body and b"MZ" in body
+        else:
+            assert (await request.json())["kind"] == "url"
+        self.submissions += 1
+        # Every fifth submission is throttled, which writes retry
+        if self.submissions % 5 == 0:
+            self.flaky += 1
+            return web.json_response({"error": "RATE_LIMITED", "message": "slow down"}, status=429, headers={"Retry-After": "0"})
+        sample_id = f"231019-{len(self.polls):04d}"
+        self.polls[sample_id] = 0
+        return web.json_response({"id": sample_id, "status": "pending", "kind": "file"})
+
+    async def sample(self, request):
+        await self.delay(request)
+        sample_id = request.match_info["id"]
+        if sample_id not in self.polls:
+            return web.json_response({"error": "NOT_FOUND", "message": "no such sample"}, status=404)
+        self.polls[sample_id] += 1
+        # Every third poll fails once with a 503, which reads retry
+        if self.polls[sample_id] % 3 == 0:
+            self.flaky += 1
+            return web.Response(status=503)
+        status = "reported" if self.polls[sample_id] >= 4 else "running"
+        return web.json_response({"id": sample_id, "status": status})
+
+    async def overview(self, request):
+        await self.delay(request)
+        return web.json_response({
+            "sample": {"id": request.match_info["id"], "score": 8},
+            "analysis": {"score": 8, "family": ["stub"]},
+            "tasks": [{"name": "behavioral1", "platform": "windows10-2004_x64"}],
+        })
+
+    async def search(self, request):
+        await self.delay(request)
+        offset = int(request.query.get("offset", 0))
+        limit = int(request.query["limit"])
+        assert request.query["query"] == "family:stub tag:a b"
+        data = [{"id": f"result-{i}", "status": "reported"} for i in range(offset, min(offset + limit, 25))]
+        return web.json_response({"data": data, "next": str(offset + limit) if offset + limit < 25 else None})
+
+    async def file(self, request):
+        await self.delay(request)
+        return web.Response(body=b"MZ" + bytes(range(256)) * 64)
+
+    async def events(self, request):
+        await self.delay(request)
+        response = web.StreamResponse()
+        await response.prepare(request)
+        try:
+            for i in range(20):
+                await response.write(json.dumps({"event": i}).encode() + b"\n")
+                await asyncio.sleep(0.01)
+            await response.write_eof()
+        except ConnectionResetError:
+            pass  # The client stopped reading early and closed the stream
+        return response
+
+
+async def tick(lags, stop):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.005)
+        lags.append(time.perf_counter() - started - 0.005)
+
+
+async def scan(client, n):
+    data = await client.submit_sample_file(f"sample{n}.exe", BytesIO(b"MZ\x90\x00" * 1024))
+    sample_id = data["id"]
+    while (await client.sample_by_id(sample_id))["status"] != "reported":
+        await asyncio.sleep(0.05)
+    return await client.overview_report(sample_id)
+
+
+async def run():
+    triage = load_client()
+    triage.BACKOFF = 0.01
+    stub = Stub()
+    app = web.Application()
+    app.router.add_post("/v0/samples", stub.submit)
+    app.router.add_get("/v0/samples/{id}", stub.sample)
+    app.router.add_get("/v1/samples/{id}/overview.json", stub.overview)
+    app.router.add_get("/v0/search", stub.search)
+    app.router.add_get("/v0/samples/{id}/sample", stub.file)
+    app.router.add_get("/v0/samples/{id}/events", stub.events)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    failures = []
+
+    def check(ok, message):
+        print(("ok   " if ok else "FAIL ") + message)
+        if not ok:
+            failures.append(message)
+
+    session = triage.new_session()
+    client = triage.Client("token", f"http://127.0.0.1:{port}", session=session)
+    lags = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(tick(lags, stop))
+    started = time.perf_counter()
+    try:
+        overviews, results, events, file_bytes, url = await asyncio.gather(
+            asyncio.gather(*(scan(client, n) for n in range(SCANS))),
+            collect(client.search("family:stub tag:a b", max=25)),
+            collect(client.sample_events("231019-0000"), limit=10),
+            client.get_sample_file("231019-0000"),
+            client.submit_sample_url("http://example.com"),
+        )
+        try:
+            await client.sample_by_id("missing")
+            error = None
+        except triage.ServerError as e:
+            error = e
+    finally:
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await ticker
+        await session.close()
+        await runner.cleanup()
+
+    check(len(overviews) == SCANS and all(o["analysis"]["score"] == 8 for o in overviews), f"{SCANS} concurrent scans returned overview dicts")
+    check([r["id"] for r in results] == [f"result-{i}" for i in range(25)], "search paginated through 25 results")
+    check(events == [{"event": i} for i in range(10)], "sample_events yielded decoded events")
+    check(isinstance(file_bytes, bytes) and file_bytes.startswith(b"MZ") and len(file_bytes) == 2 + 256 * 64, "get_sample_file returned the sample bytes")
+    check(isinstance(url, dict) and url["status"] == "pending", "submit_sample_url returned the sample dict")
+    check(error is not None and error.status == 404 and str(error) == "triage: 404 NOT_FOUND: no such sample", "errors raise ServerError with the API's message")
+    check(stub.flaky > 0, f"{stub.flaky} injected 429/503 responses were retried")
+    worst = max(lags) if lags else 0.0
+    check(worst < MAX_LAG, f"event loop lag stayed low, max {worst * 1000:.1f}ms over {len(lags)} ticks")
+    print(f"{stub.requests} requests in {elapsed:.2f}s")
+    return 1 if failures else 0
+
+
+async def collect(iterator, limit=None):
+    items = []
+    try:
+        async for item in iterator:
+            items.append(item)
+            if limit is not None and len(items) >= limit:
+                break
+    finally:
+        if hasattr(iterator, "aclose"):
+            await iterator.aclose()
+    return items
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(run()))
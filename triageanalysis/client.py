@@ -0,0 +1,335 @@
+# Portions of this code copyright (C) 2020-2023 Hatching B.V
+# All rights reserved.
+
+import asyncio
+import binascii
+import json
+import os
+import platform
+import random
+from io import BytesIO
+from urllib.parse import quote
+
+import aiohttp
+
+from .__version__ import __version__
+from .pagination import Paginator
+
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=60, connect=10)
+UPLOAD_TIMEOUT = aiohttp.ClientTimeout(total=300, connect=10)
+# Event streams stay open while a sample runs, so only a stalled read times out
+STREAM_TIMEOUT = aiohttp.ClientTimeout(total=None, connect=10, sock_read=120)
+RETRIES = 3  # Extra attempts for requests that failed in a way worth retrying
+BACKOFF = 0.5  # Seconds before the first retry, doubled for each one after
+RETRY_STATUSES = {429, 502, 503, 504}
+
+
+def new_session(limit=20):
+    """A session for sharing between clients, with its own bounded connection pool."""
+    return aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=limit), trust_env=True)
+
+
+class Client:
+    """
+    Async tria.ge API client.
+
+    Methods return the same values as the original synchronous client, but are coroutines;
+    the paginated listings, `kernel_report` and `sample_events` are async iterators. Pass a
+    shared `session` to reuse its connection pool, otherwise the client opens its own and
+    `close` should be awaited when done with it.
+
+    Requests time out instead of hanging. Reads are retried with exponential backoff when the
+    connection fails or the API answers 429/502/503/504, honouring Retry-After; writes are only
+    retried on 429, since the API rejected those without acting on them.
+    """
+
+    def __init__(self, token, root_url='https://api.tria.ge', session=None):
+        self.token = token
+        self.root_url = root_url.rstrip('/')
+        self._session = session
+        self._owns_session = session is None
+
+    @property
+    def session(self):
+        if self._session is None or self._session.closed:
+            self._session = new_session()
+            self._owns_session = True
+        return self._session
+
+    async def close(self):
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _headers(self, headers=None):
+        return {
+            "Authorization": f"Bearer {self.token}",
+            "User-Agent": f"Python/{platform.python_version()} "
+                          f"Triage Python Client/{__version__}",
+            **(headers or {})
+        }
+
+    async def _send(self, method, path, data=None, headers=None, timeout=REQUEST_TIMEOUT):
+        """Send a request with retries and return the response, which the caller must release."""
+        attempt = 0
+        while True:
+            retry_after = None
+            try:
+                response = await self.session.request(
+                    method, self.root_url + path, data=data, headers=self._headers(headers), timeout=timeout
+                )
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if method != 'GET' or attempt >= RETRIES:
+                    raise
+            else:
+                retryable = response.status == 429 or (method == 'GET' and response.status in RETRY_STATUSES)
+                if not retryable or attempt >= RETRIES:
+                    return response
+                retry_after = response.headers.get("Retry-After")
+                response.release()
+            delay = BACKOFF * 2 ** attempt * (1 + random.random() / 2)
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, min(int(retry_after), 60))
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    async def _raise_for_status(response):
+        if response.status >= 400:
+            body = await response.read()
+            raise ServerError(response.status, body)
+
+    async def _req_file(self, method, path):
+        response = await self._send(method, path)
+        async with response:
+            await self._raise_for_status(response)
+            return await response.read()
+
+    async def _req_json(self, method, path, data=None):
+        if data is None:
+            response = await self._send(method, path)
+        else:
+            response = await self._send(method, path, json.dumps(data),
+                headers={'Content-Type': 'application/json'})
+        async with response:
+            await self._raise_for_status(response)
+            return json.loads(await response.read())
+
+    async def submit_sample_file(self, filename, file, interactive=False, profiles=None, password=None, timeout=150, network="internet", escape_filename=True, tags=None):
+        if profiles is None:
+            profiles = []
+
+        d = {
+            'kind': 'file',
+            'interactive': interactive,
+            'profiles': profiles,
+            'defaults': {
+                'timeout': timeout,
+                'network': network
+            }
+        }
+        if tags:
+            d['user_tags'] = tags
+
+        if escape_filename:
+            filename = filename.replace('"', '\\"')
+        if password:
+            d['password'] = password
+        body, content_type = encode_multipart_formdata({
+            '_json': json.dumps(d),
+            'file': (filename, file),
+        })
+        response = await self._send('POST', '/v0/samples', body.getvalue(),
+            headers={"Content-Type": content_type}, timeout=UPLOAD_TIMEOUT
+        )
+        async with response:
+            await self._raise_for_status(response)
+            return json.loads(await response.read())
+
+    async def submit_sample_url(self, url, interactive=False, profiles=None):
+        if profiles is None:
+            profiles = []
+        return await self._req_json('POST', '/v0/samples', {
+            'kind': 'url',
+            'url': url,
+            'interactive': interactive,
+            'profiles': profiles,
+        })
+
+    async def set_sample_profile(self, sample_id, profiles):
+        return await self._req_json('POST', '/v0/samples/%s/profile' % sample_id, {
+            'auto': False,
+            'profiles': profiles,
+        })
+
+    async def set_sample_profile_automatically(self, sample_id, pick=None):
+        if pick is None:
+            pick = []
+        return await self._req_json('POST', '/v0/samples/%s/profile' % sample_id, {
+            'auto': True,
+            'pick': pick,
+        })
+
+    def org_samples(self, max=20):
+        return Paginator(self, '/v0/samples?subset=org', max)
+
+    def owned_samples(self, max=20):
+        return Paginator(self, '/v0/samples?subset=owned', max)
+
+    def public_samples(self, max=20):
+        return Paginator(self, '/v0/samples?subset=public', max)
+
+    async def sample_by_id(self, sample_id):
+        return await self._req_json('GET', '/v0/samples/{0}'.format(sample_id))
+
+    async def get_sample_file(self, sample_id):
+        return await self._req_file("GET", "/v0/samples/{0}/sample".format(sample_id))
+
+    async def delete_sample(self, sample_id):
+        return await self._req_json('DELETE', '/v0/samples/{0}'.format(sample_id))
+
+    def search(self, query, max=20):
+        params = quote(query)
+        return Paginator(self, '/v0/search?query={0}'.format(params), max)
+
+    async def static_report(self, sample_id):
+        return await self._req_json(
+            'GET', '/v0/samples/{0}/reports/static'.format(sample_id)
+        )
+
+    async def overview_report(self, sample_id):
+        return await self._req_json(
+            'GET', '/v1/samples/{0}/overview.json'.format(sample_id)
+        )
+
+    async def kernel_report(self, sample_id, task_id):
+        overview = await self.overview_report(sample_id)
+        for t in overview.get("tasks", []):
+            if t.get("name") == task_id:
+                task = t
+                break
+        else:
+            raise ValueError("Task does not exist")
+
+        log_file = None
+        platform = task.get("platform") or task.get("os")
+        if "windows" in platform:
+            log_file = "onemon"
+        elif "linux" in platform or "ubuntu" in platform:
+            log_file = "stahp"
+        elif "macos" in platform:
+            log_file = "bigmac"
+        elif "android" in platform:
+            log_file = "droidy"
+        else:
+            raise ValueError("Platform not supported")
+
+        response = await self._send(
+            'GET', '/v0/samples/{0}/{1}/logs/{2}.json'.format(
+                sample_id, task_id, log_file), timeout=STREAM_TIMEOUT
+        )
+        async with response:
+            await self._raise_for_status(response)
+            async for entry in response.content:
+                if entry.strip() == b"":
+                    break
+                yield json.loads(entry)
+
+    async def task_report(self, sample_id, task_id):
+        return await self._req_json(
+            'GET', '/v0/samples/{0}/{1}/report_triage.json'.format(
+                sample_id, task_id)
+        )
+
+    async def sample_task_file(self, sample_id, task_id, filename):
+        return await self._req_file(
+            "GET", "/v0/samples/{0}/{1}/{2}".format(
+                sample_id, task_id, filename)
+        )
+
+    async def sample_archive_tar(self, sample_id):
+        return await self._req_file(
+            "GET", "/v0/samples/{0}/archive".format(sample_id)
+        )
+
+    async def sample_archive_zip(self, sample_id):
+        return await self._req_file(
+            "GET", "/v0/samples/{0}/archive.zip".format(sample_id)
+        )
+
+    async def create_profile(self, name, tags, network, timeout):
+        return await self._req_json("POST", "/v0/profiles", data={
+            "name": name,
+            "tags": tags,
+            "network": network,
+            "timeout": timeout
+        })
+
+    async def delete_profile(self, profile_id):
+        return await self._req_json('DELETE', '/v0/profiles/{0}'.format(profile_id))
+
+    def profiles(self, max=20):
+        return Paginator(self, '/v0/profiles', max)
+
+    async def sample_events(self, sample_id):
+        response = await self._send("GET", "/v0/samples/"+sample_id+"/events", timeout=STREAM_TIMEOUT)
+        async with response:
+            await self._raise_for_status(response)
+            async for line in response.content:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+def PrivateClient(token, session=None):
+    return Client(token, "https://private.tria.ge/api", session=session)
+
+
+class ServerError(Exception):
+    def __init__(self, status, body=b""):
+        try:
+            b = json.loads(body)
+        except (TypeError, ValueError):
+            b = {}
+        if not isinstance(b, dict):
+            b = {}
+
+        self.status = status
+        self.kind = b.get("error", "")
+        self.message = b.get("message", "")
+
+    def __str__(self):
+        return 'triage: {0} {1}: {2}'.format(
+            self.status, self.kind, self.message)
+
+
+def encode_multipart_formdata(fields):
+    boundary = binascii.hexlify(os.urandom(16)).decode('ascii')
+
+    body = BytesIO()
+    for field, value in fields.items(): # (name, file)
+        if isinstance(value, tuple):
+            filename, file = value
+            body.write('--{boundary}\r\nContent-Disposition: form-data; '
+                       'filename="{filename}"; name=\"{field}\"\r\n\r\n'
+                .format(boundary=boundary, field=field, filename=filename)
+                .encode('utf-8'))
+            b = file.read()
+            if isinstance(b, str):  # If the file was opened in text mode
+                b = b.encode('ascii')
+            body.write(b)
+            body.write(b'\r\n')
+        else:
+            body.write('--{boundary}\r\nContent-Disposition: form-data;'
+                       'name="{field}"\r\n\r\n{value}\r\n'
+                .format(boundary=boundary, field=field, value=value)
+                .encode('utf-8'))
+    body.write('--{0}--\r\n'.format(boundary).encode('utf-8'))
+    body.seek(0)
+
+    return body, "multipart/form-data; boundary=" + boundary
@@ -12,10 +12,10 @@ class Paginator:
         self._max = int(max)
         self._counter = 0
 
-    def __iter__(self):
+    def __aiter__(self):
         return self
 
-    def _fetch_next_page(self):
+    async def _fetch_next_page(self):
         if '?' in self._path:
             path = self._path + '&'
         else:
@@ -28,7 +28,7 @@ class Paginator:
         if self._offset is not None:
             path = path + '&offset={0}'.format(self._offset)
 
-        resp = self._client._req_json('GET', path)
+        resp = await self._client._req_json('GET', path)
 
         if resp.get('next'):
             self._offset = resp['next']
@@ -40,15 +40,15 @@ class Paginator:
 
         return len(self._current_page) > 0
 
-    def __next__(self):
+    async def __anext__(self):
         if self._counter == self._max:
-            raise StopIteration
+            raise StopAsyncIteration
 
         if len(self._current_page) == 0:
             if self._eof:
-                raise StopIteration
-            if not self._fetch_next_page():
-                raise StopIteration
+                raise StopAsyncIteration
+            if not await self._fetch_next_page():
+                raise StopAsyncIteration
 
         self._counter += 1
         return self._current_page.pop(0)
@@ -8,15 +8,9 @@ from redbot.core.bot import Red
 from redbot.core.utils.chat_formatting import box, pagify, humanize_list
 
 from io import BytesIO
-from .pagination import Paginator
-from .__version__ import __version__
-from requests import Request, Session, exceptions, utils
+from .client import Client, new_session
 
-import binascii
-import urllib3
 import json
-import os
-import platform
 import asyncio
 import aiohttp
 
@@ -28,8 +22,6 @@ import datetime
 import re
 import pytz
 
-urllib3.disable_warnings()
-
 class TriageAnalysis(commands.Cog):
     """
     Triage Analysis - Interact with the Triage API from Discord.
@@ -46,6 +38,11 @@ class TriageAnalysis(commands.Cog):
             "autoscan_log_channel": None,  # Channel ID for logging autoscan events
         }
         self.config.register_guild(**default_guild)
+        self.session = None  # Shared by every guild's client, so scans reuse one connection pool
+
+    async def cog_unload(self):
+        if self.session is not None:
+            await self.session.close()
 
     async def get_client(self, guild):
         # Use the triage api_key stored in Red's shared API tokens
@@ -53,7 +50,9 @@ class TriageAnalysis(commands.Cog):
         token = api_key.get("api_key")
         if not token:
             raise RuntimeError("Triage API key not set. Use `[p]set api triage api_key,<token>` to set it")
-        return Client(token)
+        if self.session is None or self.session.closed:
+            self.session = new_session()
+        return Client(token, session=self.session)
 
     @commands.group()
     async def triage(self, ctx):
@@ -232,7 +231,7 @@ class TriageAnalysis(commands.Cog):
         """
         try:
             client = await self.get_client(ctx.guild)
-            data = client.submit_sample_url(url)
+            data = await client.submit_sample_url(url)
             embed = discord.Embed(
                 title="URL submitted",
                 description=f"Sample submitted!\n**ID:** `{data.get('id')}`\n**Status:** `{data.get('status')}`",
@@ -256,7 +255,7 @@ class TriageAnalysis(commands.Cog):
         """
         try:
             client = await self.get_client(ctx.guild)
-            data = client.sample_by_id(sample_id)
+            data = await client.sample_by_id(sample_id)
             embed = discord.Embed(
                 title=f"Sample Info: {sample_id}",
                 description="See below for JSON details.",
@@ -284,8 +283,8 @@ class TriageAnalysis(commands.Cog):
             client = await self.get_client(ctx.guild)
             paginator = client.search(query)
             results = []
-            for i, sample in enumerate(paginator):
-                if i >= 10:
+            async for sample in paginator:
+                if len(results) >= 10:
                     break
                 results.append(f"`{sample.get('id', 'N/A')}`: {sample.get('status', 'N/A')}")
             embed = discord.Embed(
@@ -311,7 +310,7 @@ class TriageAnalysis(commands.Cog):
         """
         try:
             client = await self.get_client(ctx.guild)
-            data = client.static_report(sample_id)
+            data = await client.static_report(sample_id)
             embed = discord.Embed(
                 title=f"Static Report: {sample_id}",
                 color=discord.Color.blue()
@@ -336,7 +335,7 @@ class TriageAnalysis(commands.Cog):
         """
         try:
             client = await self.get_client(ctx.guild)
-            data = client.overview_report(sample_id)
+            data = await client.overview_report(sample_id)
             embed = discord.Embed(
                 title=f"Overview Report: {sample_id}",
                 color=discord.Color.blue()
@@ -366,7 +365,7 @@ class TriageAnalysis(commands.Cog):
 
         try:
             client = await self.get_client(ctx.guild)
-            file_bytes = client.get_sample_file(sample_id)
+            file_bytes = await client.get_sample_file(sample_id)
             password = generate_password()
             zip_buffer = BytesIO()
             with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
@@ -451,10 +450,14 @@ class TriageAnalysis(commands.Cog):
             client = await self.get_client(ctx.guild)
             events = client.sample_events(sample_id)
             lines = []
-            for i, event in enumerate(events):
-                if i >= 10:
-                    break
-                lines.append(json.dumps(event))
+            try:
+                async for event in events:
+                    lines.append(json.dumps(event))
+                    if len(lines) >= 10:
+                        break
+            finally:
+                # Closes the event stream now instead of leaving it open until garbage collection
+                await events.aclose()
             embed = discord.Embed(
                 title=f"Sample Events: {sample_id}",
                 color=discord.Color.blue()
@@ -494,7 +497,7 @@ class TriageAnalysis(commands.Cog):
             file_bytes = await attachment.read()
             filename = attachment.filename
             # Use BytesIO for file-like object
-            data = client.submit_sample_file(filename, BytesIO(file_bytes))
+            data = await client.submit_sample_file(filename, BytesIO(file_bytes))
             embed = discord.Embed(
                 title="File submitted",
                 description=f"Sample submitted!\n**ID:** `{data.get('id')}`\n**Status:** `{data.get('status')}`",
@@ -535,7 +538,7 @@ class TriageAnalysis(commands.Cog):
                 color=0xfffffe
             )
             await ctx.send(embed=embed)
-            data = client.submit_sample_file(filename, BytesIO(file_bytes))
+            data = await client.submit_sample_file(filename, BytesIO(file_bytes))
             sample_id = data.get("id")
 
             # Delete the file from chat after upload
@@ -566,7 +569,7 @@ class TriageAnalysis(commands.Cog):
             status = None
             async with ctx.typing():
                 while waited < max_wait:
-                    sample_info = client.sample_by_id(sample_id)
+                    sample_info = await client.sample_by_id(sample_id)
                     status = sample_info.get("status")
                     if status in ("reported", "failed", "finished", "complete"):
                         break
@@ -584,7 +587,7 @@ class TriageAnalysis(commands.Cog):
 
             # Try to get overview report
             try:
-                overview = client.overview_report(sample_id)
+                overview = await client.overview_report(sample_id)
             except Exception as e:
                 embed = discord.Embed(
                     title="The overview wasn't available",
@@ -852,7 +855,7 @@ class TriageAnalysis(commands.Cog):
                     notify_msg = await log_channel.send(embed=embed)
                 except Exception:
                     notify_msg = None
-            data = client.submit_sample_file(filename, BytesIO(file_bytes))
+            data = await client.submit_sample_file(filename, BytesIO(file_bytes))
             sample_id = data.get("id")
             if not sample_id:
                 if notify_msg:
@@ -870,7 +873,7 @@ class TriageAnalysis(commands.Cog):
             waited = 0
             status = None
             while waited < max_wait:
-                sample_info = client.sample_by_id(sample_id)
+                sample_info = await client.sample_by_id(sample_id)
                 status = sample_info.get("status")
                 if status in ("reported", "failed", "finished", "complete"):
                     break
@@ -889,7 +892,7 @@ class TriageAnalysis(commands.Cog):
 
             # Get overview report
             try:
-                overview = client.overview_report(sample_id)
+                overview = await client.overview_report(sample_id)
             except Exception as e:
                 if notify_msg:
                     embed = discord.Embed(
@@ -979,266 +982,3 @@ class TriageAnalysis(commands.Cog):
                 except Exception:
                     pass
             # If no log channel, be absolutely silent
-
-# --- Below is the original Client and helpers, unchanged except for moving into the cog file ---
-
-class Client:
-    def __init__(self, token, root_url='https://api.tria.ge'):
-        self.token = token
-        self.root_url = root_url.rstrip('/')
-
-    def _new_request(self, method, path, j=None, b=None, headers=None):
-        if headers is None:
-            headers = {}
-
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "User-Agent": f"Python/{platform.python_version()} "
-                          f"Triage Python Client/{__version__}",
-            **headers
-        }
-        if j:
-            return Request(method, self.root_url + path, data=json.dumps(j), headers=headers)
-        return Request(method, self.root_url + path, data=b, headers=headers)
-
-    def _req_file(self, method, path):
-        r = self._new_request(method, path)
-        with Session() as s:
-            settings = s.merge_environment_settings(r.url, {}, None, False, None)
-            return s.send(r.prepare(), **settings).content
-
-    def _req_json(self, method, path, data=None):
-        if data is None:
-            r = self._new_request(method, path, data)
-        else:
-            r = self._new_request(method, path, data,
-                headers={'Content-Type': 'application/json'})
-
-        try:
-            with Session() as s:
-                settings = s.merge_environment_settings(r.url, {}, None, False, None)
-                res = s.send(r.prepare(), **settings)
-                res.raise_for_status()
-                return res.json()
-        except exceptions.HTTPError as err:
-            raise ServerError(err)
-
-    def submit_sample_file(self, filename, file, interactive=False, profiles=None, password=None, timeout=150, network="internet", escape_filename=True, tags=None):
-        if profiles is None:
-            profiles = []
-
-        d = {
-            'kind': 'file',
-            'interactive': interactive,
-            'profiles': profiles,
-            'defaults': {
-                'timeout': timeout,
-                'network': network
-            }
-        }
-        if tags:
-            d['user_tags'] = tags
-
-        if escape_filename:
-            filename = filename.replace('"', '\\"')
-        if password:
-            d['password'] = password
-        body, content_type = encode_multipart_formdata({
-            '_json': json.dumps(d),
-            'file': (filename, file),
-        })
-        r = self._new_request('POST', '/v0/samples', b=body,
-            headers={"Content-Type": content_type}
-        )
-        try:
-            with Session() as s:
-                settings = s.merge_environment_settings(r.url, {}, None, False, None)
-                res = s.send(r.prepare(), **settings)
-                res.raise_for_status()
-                return res.json()
-        except exceptions.HTTPError as err:
-            raise ServerError(err)
-
-    def submit_sample_url(self, url, interactive=False, profiles=None):
-        if profiles is None:
-            profiles = []
-        return self._req_json('POST', '/v0/samples', {
-            'kind': 'url',
-            'url': url,
-            'interactive': interactive,
-            'profiles': profiles,
-        })
-
-    def set_sample_profile(self, sample_id, profiles):
-        return self._req_json('POST', '/v0/samples/%s/profile' % sample_id, {
-            'auto': False,
-            'profiles': profiles,
-        })
-
-    def set_sample_profile_automatically(self, sample_id, pick=None):
-        if pick is None:
-            pick = []
-        return self._req_json('POST', '/v0/samples/%s/profile' % sample_id, {
-            'auto': True,
-            'pick': pick,
-        })
-
-    def org_samples(self, max=20):
-        return Paginator(self, '/v0/samples?subset=org', max)
-
-    def owned_samples(self, max=20):
-        return Paginator(self, '/v0/samples?subset=owned', max)
-
-    def public_samples(self, max=20):
-        return Paginator(self, '/v0/samples?subset=public', max)
-
-    def sample_by_id(self, sample_id):
-        return self._req_json('GET', '/v0/samples/{0}'.format(sample_id))
-
-    def get_sample_file(self, sample_id):
-        return self._req_file("GET", "/v0/samples/{0}/sample".format(sample_id))
-
-    def delete_sample(self, sample_id):
-        return self._req_json('DELETE', '/v0/samples/{0}'.format(sample_id))
-
-    def search(self, query, max=20):
-        params = utils.quote(query)
-        return Paginator(self, '/v0/search?query={0}'.format(params), max)
-
-    def static_report(self, sample_id):
-        return self._req_json(
-            'GET', '/v0/samples/{0}/reports/static'.format(sample_id)
-        )
-
-    def overview_report(self, sample_id):
-        return self._req_json(
-            'GET', '/v1/samples/{0}/overview.json'.format(sample_id)
-        )
-
-    def kernel_report(self, sample_id, task_id):
-        overview = self.overview_report(sample_id)
-        for t in overview.get("tasks", []):
-            if t.get("name") == task_id:
-                task = t
-                break
-        else:
-            raise ValueError("Task does not exist")
-
-        log_file = None
-        platform = task.get("platform") or task.get("os")
-        if "windows" in platform:
-            log_file = "onemon"
-        elif "linux" in platform or "ubuntu" in platform:
-            log_file = "stahp"
-        elif "macos" in platform:
-            log_file = "bigmac"
-        elif "android" in platform:
-            log_file = "droidy"
-        else:
-            raise ValueError("Platform not supported")
-
-        r = self._new_request(
-            'GET', '/v0/samples/{0}/{1}/logs/{2}.json'.format(
-                sample_id, task_id, log_file)
-        )
-
-        with Session() as s:
-            settings = s.merge_environment_settings(r.url, {}, None, False, None)
-            res = s.send(r.prepare(), **settings)
-            res.raise_for_status()
-            for entry in res.content.split(b"\n"):
-                if entry.strip() == b"":
-                    break
-                yield json.loads(entry)
-
-    def task_report(self, sample_id, task_id):
-        return self._req_json(
-            'GET', '/v0/samples/{0}/{1}/report_triage.json'.format(
-                sample_id, task_id)
-        )
-
-    def sample_task_file(self, sample_id, task_id, filename):
-        return self._req_file(
-            "GET", "/v0/samples/{0}/{1}/{2}".format(
-                sample_id, task_id, filename)
-        )
-
-    def sample_archive_tar(self, sample_id):
-        return self._req_file(
-            "GET", "/v0/samples/{0}/archive".format(sample_id)
-        )
-
-    def sample_archive_zip(self, sample_id):
-        return self._req_file(
-            "GET", "/v0/samples/{0}/archive.zip".format(sample_id)
-        )
-
-    def create_profile(self, name, tags, network, timeout):
-        return self._req_json("POST", "/v0/profiles", data={
-            "name": name,
-            "tags": tags,
-            "network": network,
-            "timeout": timeout
-        })
-
-    def delete_profile(self, profile_id):
-        return self._req_json('DELETE', '/v0/profiles/{0}'.format(profile_id))
-
-    def profiles(self, max=20):
-        return Paginator(self, '/v0/profiles', max)
-
-    def sample_events(self, sample_id):
-        events = self._new_request("GET", "/v0/samples/"+sample_id+"/events")
-        with Session() as s:
-            settings = s.merge_environment_settings(events.url, {}, None, False, None)
-            if 'stream' in settings:
-                del settings['stream']
-            res = s.send(events.prepare(), stream=True, **settings)
-            for line in res.iter_lines():
-                if line:
-                    yield json.loads(line)
-
-def PrivateClient(token):
-    return Client(token, "https://private.tria.ge/api")
-
-class ServerError(Exception):
-    def __init__(self, err):
-        try:
-            b = err.response.json()
-        except json.JSONDecodeError:
-            b = {}
-
-        self.status = err.response.status_code
-        self.kind = b.get("error", "")
-        self.message = b.get("message", "")
-
-    def __str__(self):
-        return 'triage: {0} {1}: {2}'.format(
-            self.status, self.kind, self.message)
-
-
-def encode_multipart_formdata(fields):
-    boundary = binascii.hexlify(os.urandom(16)).decode('ascii')
-
-    body = BytesIO()
-    for field, value in fields.items(): # (name, file)
-        if isinstance(value, tuple):
-            filename, file = value
-            body.write('--{boundary}\r\nContent-Disposition: form-data; '
-                       'filename="{filename}"; name=\"{field}\"\r\n\r\n'
-                .format(boundary=boundary, field=field, filename=filename)
-                .encode('utf-8'))
-            b = file.read()
-            if isinstance(b, str):  # If the file was opened in text mode
-                b = b.encode('ascii')
-            body.write(b)
-            body.write(b'\r\n')
-        else:
-            body.write('--{boundary}\r\nContent-Disposition: form-data;'
-                       'name="{field}"\r\n\r\n{value}\r\n'
-                .format(boundary=boundary, field=field, value=value)
-                .encode('utf-8'))
-    body.write('--{0}--\r\n'.format(boundary).encode('utf-8'))
-    body.seek(0)
-
-    return body, "multipart/form-data; boundary=" + boundary
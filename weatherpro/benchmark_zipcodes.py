@@ -0,0 +1,86 @@
+"""Compare the zip code index against parsing zipcodes.csv into a dict.
+
+Run from the repository root with ``python weatherpro/benchmark_zipcodes.py``.
+Each loader runs in a fresh interpreter so its memory can be measured on its
+own; the script reports load time, resident memory added by the load, and
+lookup throughput, and checks both loaders return the same coordinates for
+every zip code. Not loaded by Red.
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+MEASURE = r"""
+import csv, json, random, sys, time
+sys.path.insert(0, {here!r})
+from zipcodes import ZipCodes, read_csv
+
+def rss_kb():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+data_dir = {data!r}
+codes = [code for code, _lat, _lng in read_csv(data_dir + "/zipcodes.csv")]
+random.seed(1)
+queries = [random.choice(codes) for _ in range(100000)] + ["00000", "abcde", ""] * 1000
+before = rss_kb()
+start = time.perf_counter()
+if {mode!r} == "csv":
+    # What WeatherPro.__init__ did before the index
+    with open(data_dir + "/zipcodes.csv") as zip_code_file:
+        csv_reader = csv.reader(zip_code_file)
+        zip_codes = {{row[0]: (row[1], row[2]) for i, row in enumerate(csv_reader) if i != 0}}
+else:
+    zip_codes = ZipCodes(data_dir)
+loaded = time.perf_counter()
+first = zip_codes.get(codes[0])
+first_lookup = time.perf_counter()
+after_load = rss_kb()
+start_lookups = time.perf_counter()
+for code in queries:
+    zip_codes.get(code)
+lookups = time.perf_counter() - start_lookups
+result = {{code: [value.strip() for value in zip_codes[code]] for code in codes}}
+print(json.dumps({{
+    "load_ms": (loaded - start) * 1000,
+    "first_lookup_ms": (first_lookup - loaded) * 1000,
+    "rss_kb": after_load - before,
+    "lookups_per_s": len(queries) / lookups,
+    "coordinates": result,
+}}))
+"""
+
+
+def measure(mode):
+    code = MEASURE.format(here=str(HERE), data=str(HERE / "data"), mode=mode)
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main():
+    if not (HERE / "data" / "zipcodes.bin").exists():
+        print("data/zipcodes.bin is missing, build it with python weatherpro/zipcodes.py")
+        return 1
+    results = {mode: measure(mode) for mode in ("csv", "index")}
+    print(f"{'loader':<8}{'load':>12}{'first lookup':>15}{'RSS added':>12}{'lookups/s':>14}")
+    for mode, result in results.items():
+        print(
+            f"{mode:<8}{result['load_ms']:>10.2f}ms{result['first_lookup_ms']:>13.3f}ms"
+            f"{result['rss_kb'] / 1024:>10.1f}MB{result['lookups_per_s']:>14,.0f}"
+        )
+    mismatched = [
+        code for code, (lat, lng) in results["csv"]["coordinates"].items()
+        if [float(lat), float(lng)] != [float(v) for v in results["index"]["coordinates"][code]]
+    ]
+    print(f"{len(results['csv']['coordinates'])} zip codes compared, {len(mismatched)} mismatched")
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+
+OPEN_METEO_TTL = 900  # Open-Meteo publishes current conditions every 15 minutes
+NWS_FORECAST_TTL = 1800  # NWS gridpoint forecasts are reissued at most every half hour or so
+CACHE_SIZE = 1000  # Locations kept per cache
+LATENCY_SAMPLES = 200
+
+
+def location_key(latitude, longitude, precision=2):
+    """Round a location for caching; two decimals is about a kilometre, finer than the models' grids."""
+    return round(float(latitude), precision), round(float(longitude), precision)
+
+
+class ForecastCache:
+    """
+    Shared cache of upstream weather responses, keyed by quantized location.
+
+    Entries expire at the end of the `ttl`-second wall-clock window they were fetched in, so
+    the cache turns over when the upstream model does instead of serving a stale copy for a
+    full ttl after an update. Concurrent misses for the same key share one upstream request.
+    Only successful responses are cached. Hit rate and upstream latency are kept for `stats`.
+    """
+
+    def __init__(self, ttl, max_entries=CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # {key: (expires, (status, data))}, least recently used first
+        self._inflight = {}  # {key: asyncio.Future}
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get(self, key, fetch, *args):
+        """Return (status, data) for `key`, calling `await fetch(*args)` on a miss."""
+        now = time.time()
+        cached = self._entries.get(key)
+        if cached is not None and cached[0] > now:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return cached[1]
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        started = time.monotonic()
+        try:
+            result = await fetch(*args)
+        except BaseException as e:
+            if isinstance(e, Exception):
+                future.set_exception(e)
+                future.exception()  # Retrieved here in case nobody else was waiting
+            else:
+                future.cancel()
+            raise
+        finally:
+            del self._inflight[key]
+        self._latencies.append(time.monotonic() - started)
+        future.set_result(result)
+
+        status, data = result
+        if status == 200 and data:
+            self._entries[key] = ((now // self.ttl + 1) * self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def stats(self):
+        lookups = self.hits + self.misses + self.coalesced
+        latencies = sorted(self._latencies)
+        return {
+            "entries": len(self._entries),
+            "lookups": lookups,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            "coalesced": self.coalesced,
+            "latency_avg": sum(latencies) / len(latencies) if latencies else None,
+            "latency_p95": latencies[int(len(latencies) * 0.95)] if latencies else None,
+        }
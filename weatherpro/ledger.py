@@ -0,0 +1,77 @@
+import heapq
+import time
+from datetime import datetime
+
+DEFAULT_TTL = 2 * 86400  # Seconds an alert without a usable expiry is remembered
+EXPIRY_GRACE = 3600  # NWS can keep listing an alert for a while after it expires
+MAX_ALERTS = 10000  # Alerts remembered at most, the soonest to expire are dropped first
+
+
+def alert_expiry(properties, now=None):
+    """Unix time after which an NWS alert can't be listed again, from its expires/ends fields."""
+    now = time.time() if now is None else now
+    times = []
+    for field in ("expires", "ends"):
+        try:
+            times.append(datetime.fromisoformat(properties[field]).timestamp())
+        except (KeyError, TypeError, ValueError):
+            continue
+    return max(times) if times else now + DEFAULT_TTL
+
+
+class AlertLedger:
+    """
+    Which users each NWS alert has been sent to, keyed by alert id.
+
+    Every alert is kept until its expiry plus `EXPIRY_GRACE`, tracked with a heap so pruning
+    only looks at the alerts that are due. Checking and recording a delivery are O(1), and the
+    ledger's size follows the number of live alerts rather than growing with every alert sent.
+    """
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self._alerts = {}  # {alert_id: [expires, set of user ids]}
+        self._heap = []  # [(expires, alert_id)], entries whose expiry has since moved are skipped
+
+    def __len__(self):
+        return len(self._alerts)
+
+    @classmethod
+    def from_dict(cls, data, clock=time.time):
+        ledger = cls(clock)
+        for alert_id, (expires, user_ids) in data.items():
+            for user_id in user_ids:
+                ledger.record(alert_id, int(user_id), expires)
+        ledger.prune()
+        return ledger
+
+    def to_dict(self):
+        return {alert_id: [expires, sorted(user_ids)] for alert_id, (expires, user_ids) in self._alerts.items()}
+
+    def sent(self, alert_id, user_id):
+        entry = self._alerts.get(alert_id)
+        return entry is not None and user_id in entry[1]
+
+    def record(self, alert_id, user_id, expires):
+        entry = self._alerts.get(alert_id)
+        if entry is None:
+            entry = self._alerts[alert_id] = [expires, set()]
+            heapq.heappush(self._heap, (expires, alert_id))
+        elif expires > entry[0]:
+            entry[0] = expires
+            heapq.heappush(self._heap, (expires, alert_id))
+        entry[1].add(user_id)
+        self.prune()
+
+    def prune(self, now=None):
+        """Forget alerts past their expiry, and the soonest to expire beyond `MAX_ALERTS`."""
+        cutoff = (self.clock() if now is None else now) - EXPIRY_GRACE
+        while self._heap and (self._heap[0][0] <= cutoff or len(self._alerts) > MAX_ALERTS):
+            expires, alert_id = heapq.heappop(self._heap)
+            entry = self._alerts.get(alert_id)
+            if entry is not None and entry[0] == expires:
+                del self._alerts[alert_id]
+        # Stale entries left behind by moved expiries are dropped when the heap gets lopsided
+        if len(self._heap) > 2 * len(self._alerts) + 64:
+            self._heap = [(entry[0], alert_id) for alert_id, entry in self._alerts.items()]
+            heapq.heapify(self._heap)
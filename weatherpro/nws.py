@@ -0,0 +1,88 @@
+import asyncio
+from collections import OrderedDict
+
+import aiohttp  # type: ignore
+from red_commons.logging import getLogger  # type: ignore
+
+log = getLogger("red.beehive.weatherpro")
+
+NWS_CONCURRENCY = 8  # Requests to api.weather.gov in flight at once
+CACHE_SIZE = 4000  # Responses kept for conditional requests
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30)
+
+
+def point_key(latitude, longitude):
+    """The NWS point for a location; it resolves points to four decimals, so nearby zip codes share one."""
+    return f"{float(latitude):.4f},{float(longitude):.4f}"
+
+
+class NWSPoller:
+    """
+    Fetches api.weather.gov resources for the alert loops.
+
+    Each distinct URL is fetched once per call to `fetch_all`, at most `NWS_CONCURRENCY` at a
+    time, however many subscribers share it. Responses that came with an ETag or
+    Last-Modified header are kept, and later requests for the same URL are made conditional,
+    so unchanged alerts and forecasts come back as an empty 304. Forecast URLs looked up from
+    /points are kept for good, since a point's forecast grid doesn't change.
+    """
+
+    def __init__(self, session, concurrency=NWS_CONCURRENCY, cache_size=CACHE_SIZE):
+        self.session = session
+        self.cache_size = cache_size
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._cache = OrderedDict()  # {url: (conditional request headers, data)}, least recently used first
+        self._forecast_urls = {}  # {point: forecast url}
+        self.stats = {"requests": 0, "not_modified": 0, "errors": 0}
+
+    async def get_json(self, url):
+        """Return the JSON at `url`, or None if the request didn't succeed."""
+        cached = self._cache.get(url)
+        headers = dict(cached[0]) if cached else {}
+        async with self._semaphore:
+            self.stats["requests"] += 1
+            async with self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT) as response:
+                if response.status == 304 and cached:
+                    self.stats["not_modified"] += 1
+                    self._cache.move_to_end(url)
+                    return cached[1]
+                if response.status != 200:
+                    self.stats["errors"] += 1
+                    return None
+                data = await response.json()
+                validators = {}
+                if response.headers.get("ETag"):
+                    validators["If-None-Match"] = response.headers["ETag"]
+                if response.headers.get("Last-Modified"):
+                    validators["If-Modified-Since"] = response.headers["Last-Modified"]
+        if validators:
+            self._cache[url] = (validators, data)
+            self._cache.move_to_end(url)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.pop(url, None)
+        return data
+
+    async def _fetch(self, url):
+        try:
+            return url, await self.get_json(url)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            self.stats["errors"] += 1
+            log.warning("Error fetching %s: %s", url, e)
+            return url, None
+
+    async def fetch_all(self, urls):
+        """Fetch each distinct URL once, returns {url: data or None}."""
+        return dict(await asyncio.gather(*(self._fetch(url) for url in set(urls))))
+
+    async def forecast_urls(self, points):
+        """Return {point: forecast url} for the points whose forecast grid could be found."""
+        missing = [point for point in set(points) if point not in self._forecast_urls]
+        responses = await self.fetch_all(f"https://api.weather.gov/points/{point}" for point in missing)
+        for point in missing:
+            data = responses.get(f"https://api.weather.gov/points/{point}") or {}
+            forecast_url = data.get("properties", {}).get("forecast")
+            if forecast_url:
+                self._forecast_urls[point] = forecast_url
+        return {point: self._forecast_urls[point] for point in points if point in self._forecast_urls}
@@ -1,10 +1,18 @@
 import discord #type: ignore
 import aiohttp #type: ignore
 import asyncio
-import csv
+import time
 from datetime import datetime
 from redbot.core import commands, Config #type: ignore
 from redbot.core.data_manager import bundled_data_path #type: ignore
+from red_commons.logging import getLogger #type: ignore
+
+from .cache import NWS_FORECAST_TTL, OPEN_METEO_TTL, ForecastCache, location_key
+from .ledger import DEFAULT_TTL, AlertLedger, alert_expiry
+from .nws import NWSPoller, point_key
+from .zipcodes import ZipCodes
+
+log = getLogger("red.beehive.weatherpro")
 
 class Weather(commands.Cog):
     """It's beautiful out there"""
@@ -12,17 +20,22 @@ class Weather(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.session = aiohttp.ClientSession()
+        self.nws = NWSPoller(self.session)
+        self.alert_ledger = None  # AlertLedger, loaded by the severe alerts task
+        self.open_meteo_cache = ForecastCache(OPEN_METEO_TTL)
+        self.nws_forecast_cache = ForecastCache(NWS_FORECAST_TTL)
         self.config = Config.get_conf(self, identifier=1234567890)
         default_user = {
             "zip_code": None,
             "severealerts": False,
             "freezealerts": False,
             "heatalerts": False,
-            "sent_alerts": [],
+            "sent_alerts": [],  # Legacy, moved into the global alert ledger
         }
         self.config.register_user(**default_user)
         default_global = {
             "total_alerts_sent": 0,
+            "sent_alert_ledger": {},
             "total_heat_alerts_sent": 0,
             "total_freeze_alerts_sent": 0,
             "nowcasts_fetched": 0,
@@ -44,14 +57,8 @@ class Weather(commands.Cog):
             "highest_rainfall_date": None,
         }
         self.config.register_global(**default_global)
-        data_dir = bundled_data_path(self)
-        with (data_dir / "zipcodes.csv").open(mode="r") as zip_code_file:
-            csv_reader = csv.reader(zip_code_file)
-            self.zip_codes = {
-                row[0]: (row[1], row[2])
-                for i, row in enumerate(csv_reader)
-                if i != 0
-            }
+        # Memory-mapped on first lookup instead of parsing zipcodes.csv on every load
+        self.zip_codes = ZipCodes(bundled_data_path(self))
         
     def cog_load(self):
         self.bot.loop.create_task(self.start_severe_alerts_task())
@@ -60,6 +67,14 @@ class Weather(commands.Cog):
 
     def cog_unload(self):
         self.bot.loop.create_task(self.session.close())
+        self.zip_codes.close()
+
+    async def _fetch_json(self, url):
+        """GET a URL for the forecast caches, returns (status, data or None)."""
+        async with self.session.get(url) as response:
+            if response.status != 200:
+                return response.status, None
+            return response.status, await response.json()
 
     def fahrenheit_to_celsius(self, f):
         result = round((f - 32) * 5.0 / 9.0, 1)
@@ -77,60 +92,6 @@ class Weather(commands.Cog):
         millimeters = inches * 25.4
         return f"{millimeters:.1f}"
     
-    async def check_weather_alerts(self):
-        """Check for weather alerts and DM users if any severe or extreme warnings are issued"""
-        all_users = await self.config.all_users()
-        users_with_alerts = [user_id for user_id, data in all_users.items() if data.get("severealerts")]
-
-        for user_id in users_with_alerts:
-            user_data = await self.config.user_from_id(user_id).all()
-            zip_code = user_data.get("zip_code")
-            if not zip_code or zip_code not in self.zip_codes:
-                continue
-
-            latitude, longitude = self.zip_codes[zip_code]
-            alerts_url = f"https://api.weather.gov/alerts/active?point={latitude.strip()},{longitude.strip()}"
-
-            async with self.session.get(alerts_url) as response:
-                if response.status != 200:
-                    continue
-
-                data = await response.json()
-                alerts = data.get('features', [])
-                severe_alerts = [alert for alert in alerts if alert['properties']['severity'] in ['Severe', 'Extreme']]
-
-                if severe_alerts:
-                    user = self.bot.get_user(user_id)
-                    if user:
-                        sent_alerts = user_data.get("sent_alerts", [])
-                        new_alerts = [alert for alert in severe_alerts if alert['id'] not in sent_alerts]
-
-                        if new_alerts:
-                            for alert in new_alerts:
-                                embed = discord.Embed(
-                                    title=alert['properties']['event'],
-                                    description=f"{'An' if alert['properties']['event'][0].lower() in 'aeiou' else 'A'} **{alert['properties']['event']}** was issued at **<t:{int(datetime.fromisoformat(alert['properties']['sent']).timestamp())}:F>** for your location and is in effect until **<t:{int(datetime.fromisoformat(alert['properties']['expires']).timestamp())}:F>**.",
-                                    color=0xff4545
-                                )
-                                if 'instruction' in alert['properties']:
-                                    instruction = alert['properties']['instruction'].replace('\n', ' ').strip()
-                                    embed.add_field(name="Instruction", value=instruction, inline=False)
-                                if 'severity' in alert['properties']:
-                                    embed.add_field(name="Severity", value=alert['properties']['severity'], inline=True)
-                                if 'urgency' in alert['properties']:
-                                    embed.add_field(name="Urgency", value=alert['properties']['urgency'], inline=True)
-                                if 'certainty' in alert['properties']:
-                                    embed.add_field(name="Certainty", value=alert['properties']['certainty'], inline=True)
-                                if 'senderName' in alert['properties']:
-                                    embed.set_footer(text=f"Issued by {alert['properties']['senderName']}")
-
-                                await user.send(embed=embed)
-                                sent_alerts.append(alert['id'])
-
-                            await self.config.user_from_id(user_id).sent_alerts.set(sent_alerts)
-                            total_alerts_sent = await self.config.total_alerts_sent()
-                            await self.config.total_alerts_sent.set(total_alerts_sent + len(new_alerts))
-
     @commands.group()
     async def weather(self, ctx):
         """Fetch current and upcoming conditions, search and explore hundreds of weather-focused words, check alert statistics across the country, and fetch information on observation stations and radar installations"""
@@ -151,79 +112,72 @@ class Weather(commands.Cog):
             return
         
         latitude, longitude = self.zip_codes[zip_code]
-        points_url = f"https://api.weather.gov/points/{latitude.strip()},{longitude.strip()}"
-        
-        # Fetch weather data using the latitude and longitude
-        async with self.session.get(points_url) as response:
-            if response.status != 200:
-                await ctx.send(f"Failed to fetch the weather data. Status Code: {response.status}")
-                return
+        point = point_key(latitude, longitude)
 
-            data = await response.json()
-            forecast_url = data.get('properties', {}).get('forecast')
-            if not forecast_url:
-                await ctx.send(f"Failed to retrieve forecast URL.")
-                return
-            
-            async with self.session.get(forecast_url) as forecast_response:
-                if forecast_response.status != 200:
-                    await ctx.send(f"Failed to fetch the forecast data.")
-                    return
-                
-                forecast_data = await forecast_response.json()
-                periods = forecast_data.get('properties', {}).get('periods', [])
-                if not periods:
-                    await ctx.send(f"Failed to retrieve forecast periods.")
-                    return
+        # The forecast grid for a point is looked up once, then its forecast is shared through the cache
+        forecast_url = (await self.nws.forecast_urls([point])).get(point)
+        if not forecast_url:
+            await ctx.send(f"Failed to retrieve forecast URL.")
+            return
+
+        status, forecast_data = await self.nws_forecast_cache.get(forecast_url, self._fetch_json, forecast_url)
+        if status != 200:
+            await ctx.send(f"Failed to fetch the forecast data.")
+            return
+
+        periods = forecast_data.get('properties', {}).get('periods', [])
+        if not periods:
+            await ctx.send(f"Failed to retrieve forecast periods.")
+            return
                 
-                embeds = []
+        embeds = []
                 
-                for period in periods[:10]:  # Create a page for each of the next 10 forecast periods
-                    name = period.get('name', 'N/A')
-                    detailed_forecast = period.get('detailedForecast', 'No detailed forecast available.')
-                    temperature = period.get('temperature', 'N/A')
-                    if temperature != 'N/A':
-                        temperature = f"{temperature}°F"
-                    wind_speed = period.get('windSpeed', 'N/A')
-                    wind_direction = period.get('windDirection', 'N/A')
+        for period in periods[:10]:  # Create a page for each of the next 10 forecast periods
+            name = period.get('name', 'N/A')
+            detailed_forecast = period.get('detailedForecast', 'No detailed forecast available.')
+            temperature = period.get('temperature', 'N/A')
+            if temperature != 'N/A':
+                temperature = f"{temperature}°F"
+            wind_speed = period.get('windSpeed', 'N/A')
+            wind_direction = period.get('windDirection', 'N/A')
                     
-                    embed = discord.Embed(
-                        title=f"Weather forecast for {name}",
-                        description=f"{detailed_forecast}",
-                        color=0xfffffe
-                    )
-                    embed.add_field(name="Temperature", value=temperature)
-                    embed.add_field(name="Wind speed", value=wind_speed)
-                    embed.add_field(name="Wind direction", value=wind_direction)
+            embed = discord.Embed(
+                title=f"Weather forecast for {name}",
+                description=f"{detailed_forecast}",
+                color=0xfffffe
+            )
+            embed.add_field(name="Temperature", value=temperature)
+            embed.add_field(name="Wind speed", value=wind_speed)
+            embed.add_field(name="Wind direction", value=wind_direction)
                     
-                    embeds.append(embed)
+            embeds.append(embed)
                 
-                message = await ctx.send(embed=embeds[0])
-                forecasts_fetched = await self.config.forecasts_fetched()
-                await self.config.forecasts_fetched.set(forecasts_fetched + 1)
-                page = 0
-                await message.add_reaction("⬅️")
-                await message.add_reaction("❌")
-                await message.add_reaction("➡️")
+        message = await ctx.send(embed=embeds[0])
+        forecasts_fetched = await self.config.forecasts_fetched()
+        await self.config.forecasts_fetched.set(forecasts_fetched + 1)
+        page = 0
+        await message.add_reaction("⬅️")
+        await message.add_reaction("❌")
+        await message.add_reaction("➡️")
 
-                def check(reaction, user):
-                    return user == ctx.author and str(reaction.emoji) in ["⬅️", "➡️", "❌"] and reaction.message.id == message.id
+        def check(reaction, user):
+            return user == ctx.author and str(reaction.emoji) in ["⬅️", "➡️", "❌"] and reaction.message.id == message.id
 
-                while True:
-                    try:
-                        reaction, user = await self.bot.wait_for("reaction_add", timeout=60.0, check=check)
-                        if str(reaction.emoji) == "➡️":
-                            page = (page + 1) % len(embeds)
-                        elif str(reaction.emoji) == "⬅️":
-                            page = (page - 1) % len(embeds)
-                        elif str(reaction.emoji) == "❌":
-                            await message.delete()
-                            break
+        while True:
+            try:
+                reaction, user = await self.bot.wait_for("reaction_add", timeout=60.0, check=check)
+                if str(reaction.emoji) == "➡️":
+                    page = (page + 1) % len(embeds)
+                elif str(reaction.emoji) == "⬅️":
+                    page = (page - 1) % len(embeds)
+                elif str(reaction.emoji) == "❌":
+                    await message.delete()
+                    break
                         
-                        await message.edit(embed=embeds[page])
-                        await message.remove_reaction(reaction, user)
-                    except asyncio.TimeoutError:
-                        break
+                await message.edit(embed=embeds[page])
+                await message.remove_reaction(reaction, user)
+            except asyncio.TimeoutError:
+                break
 
     @weather.command(name="stats")
     async def stats(self, ctx):
@@ -259,6 +213,33 @@ class Weather(commands.Cog):
 
             await ctx.send(embed=usage)
 
+    @commands.is_owner()
+    @weather.command(name="cache")
+    async def cache(self, ctx):
+        """Show how the shared forecast caches and alert polling are performing"""
+        embed = discord.Embed(title="Weather cache statistics", color=0xfffffe)
+        for name, forecast_cache in (("Open-Meteo conditions", self.open_meteo_cache), ("NWS forecasts", self.nws_forecast_cache)):
+            stats = forecast_cache.stats()
+            latency = "N/A"
+            if stats["latency_avg"] is not None:
+                latency = f"{stats['latency_avg'] * 1000:.0f} ms avg • {stats['latency_p95'] * 1000:.0f} ms p95"
+            embed.add_field(
+                name=name,
+                value=(
+                    f"**{stats['hit_rate']:.0%}** hit rate over {stats['lookups']} lookups\n"
+                    f"{stats['coalesced']} coalesced • {stats['entries']} locations cached\n"
+                    f"Upstream: {latency}"
+                ),
+                inline=False,
+            )
+        nws_stats = self.nws.stats
+        embed.add_field(
+            name="NWS alert polling",
+            value=f"{nws_stats['requests']} requests • {nws_stats['not_modified']} not modified • {nws_stats['errors']} errors",
+            inline=False,
+        )
+        await ctx.send(embed=embed)
+
     @weather.command(name="records")
     async def records(self, ctx):
         """Show historical weather records"""
@@ -321,7 +302,9 @@ class Weather(commands.Cog):
                 await ctx.send(embed=embed, view=view)
                 return
             
-            latitude, longitude = self.zip_codes[zip_code]
+            location = self.zip_codes[zip_code]
+            # Rounded so nearby zip codes share one cached Open-Meteo response
+            latitude, longitude = location_key(*location)
             
             # Fetch current weather data using the latitude and longitude
             url = "https://api.open-meteo.com/v1/forecast"
@@ -341,288 +324,287 @@ class Weather(commands.Cog):
             queryString = "&".join(f"{key}={value}" for key, value in params.items())
             weather_url = f"{url}?{queryString}"
             
-            async with self.session.get(weather_url) as response:
-                if response.status != 200:
-                    await ctx.send(f"Failed to fetch the weather data. URL: {weather_url}, Status Code: {response.status}")
-                    return
+            status, data = await self.open_meteo_cache.get((latitude, longitude), self._fetch_json, weather_url)
+            if status != 200:
+                await ctx.send(f"Failed to fetch the weather data. URL: {weather_url}, Status Code: {status}")
+                return
 
-                data = await response.json()
-                if not data:
-                    await ctx.send(f"Failed to retrieve current weather data. URL: {weather_url}, Data: {data}")
-                    return
+            if not data:
+                await ctx.send(f"Failed to retrieve current weather data. URL: {weather_url}, Data: {data}")
+                return
                 
-                current = data.get('current', {})
-                hourly = data.get('hourly', {})
-                minutely_15 = data.get('minutely_15', {})
+            current = data.get('current', {})
+            hourly = data.get('hourly', {})
+            minutely_15 = data.get('minutely_15', {})
                 
-                embed = discord.Embed(
-                    title=f"Current conditions",
-                    color=0xfffffe
-                )
-                temperature = current.get('temperature_2m', 'N/A')
-                embed.add_field(name="Temperature", value=f"**{temperature}°F** • {self.fahrenheit_to_celsius(temperature)}°C")
-                embed.add_field(name="Feels like", value=f"**{current.get('apparent_temperature', 'N/A')}°F** • {self.fahrenheit_to_celsius(current.get('apparent_temperature', 'N/A'))}°C")
-
-                ground_temp = hourly.get('soil_temperature_0cm', 'N/A')
-                if isinstance(ground_temp, list) and ground_temp:
-                    ground_temp = ground_temp[0]
-                embed.add_field(name="Ground temperature", value=f"**{ground_temp}°F** • {self.fahrenheit_to_celsius(ground_temp)}°C")
-
-                wind_direction = current.get('wind_direction_10m', 'N/A')
-                if wind_direction != 'N/A':
-                    if (wind_direction >= 0 and wind_direction <= 22.5) or (wind_direction > 337.5 and wind_direction <= 360):
-                        wind_direction_str = 'North'
-                    elif wind_direction > 22.5 and wind_direction <= 67.5:
-                        wind_direction_str = 'Northeast'
-                    elif wind_direction > 67.5 and wind_direction <= 112.5:
-                        wind_direction_str = 'East'
-                    elif wind_direction > 112.5 and wind_direction <= 157.5:
-                        wind_direction_str = 'Southeast'
-                    elif wind_direction > 157.5 and wind_direction <= 202.5:
-                        wind_direction_str = 'South'
-                    elif wind_direction > 202.5 and wind_direction <= 247.5:
-                        wind_direction_str = 'Southwest'
-                    elif wind_direction > 247.5 and wind_direction <= 292.5:
-                        wind_direction_str = 'West'
-                    else:
-                        wind_direction_str = 'Northwest'
+            embed = discord.Embed(
+                title=f"Current conditions",
+                color=0xfffffe
+            )
+            temperature = current.get('temperature_2m', 'N/A')
+            embed.add_field(name="Temperature", value=f"**{temperature}°F** • {self.fahrenheit_to_celsius(temperature)}°C")
+            embed.add_field(name="Feels like", value=f"**{current.get('apparent_temperature', 'N/A')}°F** • {self.fahrenheit_to_celsius(current.get('apparent_temperature', 'N/A'))}°C")
+
+            ground_temp = hourly.get('soil_temperature_0cm', 'N/A')
+            if isinstance(ground_temp, list) and ground_temp:
+                ground_temp = ground_temp[0]
+            embed.add_field(name="Ground temperature", value=f"**{ground_temp}°F** • {self.fahrenheit_to_celsius(ground_temp)}°C")
+
+            wind_direction = current.get('wind_direction_10m', 'N/A')
+            if wind_direction != 'N/A':
+                if (wind_direction >= 0 and wind_direction <= 22.5) or (wind_direction > 337.5 and wind_direction <= 360):
+                    wind_direction_str = 'North'
+                elif wind_direction > 22.5 and wind_direction <= 67.5:
+                    wind_direction_str = 'Northeast'
+                elif wind_direction > 67.5 and wind_direction <= 112.5:
+                    wind_direction_str = 'East'
+                elif wind_direction > 112.5 and wind_direction <= 157.5:
+                    wind_direction_str = 'Southeast'
+                elif wind_direction > 157.5 and wind_direction <= 202.5:
+                    wind_direction_str = 'South'
+                elif wind_direction > 202.5 and wind_direction <= 247.5:
+                    wind_direction_str = 'Southwest'
+                elif wind_direction > 247.5 and wind_direction <= 292.5:
+                    wind_direction_str = 'West'
                 else:
-                    wind_direction_str = 'N/A'
-                embed.add_field(name="Wind direction", value=wind_direction_str)
-
-                wind_speed = current.get('wind_speed_10m', 'N/A')
-                if wind_speed != 'N/A':
-                    wind_speed_knots = self.mph_to_knots(wind_speed)
-                    embed.add_field(name="Wind speed", value=f"**{wind_speed} mph** • {wind_speed_knots} kts")
-
-                wind_gusts = current.get('wind_gusts_10m', 'N/A')
-                if wind_gusts != 'N/A':
-                    wind_gusts_knots = self.mph_to_knots(wind_gusts)
-                    embed.add_field(name="Wind gusts", value=f"**{wind_gusts} mph** • {wind_gusts_knots} kts")
+                    wind_direction_str = 'Northwest'
+            else:
+                wind_direction_str = 'N/A'
+            embed.add_field(name="Wind direction", value=wind_direction_str)
+
+            wind_speed = current.get('wind_speed_10m', 'N/A')
+            if wind_speed != 'N/A':
+                wind_speed_knots = self.mph_to_knots(wind_speed)
+                embed.add_field(name="Wind speed", value=f"**{wind_speed} mph** • {wind_speed_knots} kts")
+
+            wind_gusts = current.get('wind_gusts_10m', 'N/A')
+            if wind_gusts != 'N/A':
+                wind_gusts_knots = self.mph_to_knots(wind_gusts)
+                embed.add_field(name="Wind gusts", value=f"**{wind_gusts} mph** • {wind_gusts_knots} kts")
                 
-                embed.add_field(name="Humidity", value=f"{current.get('relative_humidity_2m', 'N/A')}%")
+            embed.add_field(name="Humidity", value=f"{current.get('relative_humidity_2m', 'N/A')}%")
                 
-                precipitation = current.get('precipitation', 'N/A')
-                if precipitation != 'N/A' and precipitation != 0.0:
-                    embed.add_field(name="Precipitation", value=f"{precipitation} inches")
+            precipitation = current.get('precipitation', 'N/A')
+            if precipitation != 'N/A' and precipitation != 0.0:
+                embed.add_field(name="Precipitation", value=f"{precipitation} inches")
                 
-                rain = current.get('rain', 'N/A')
-                if rain != 'N/A' and rain != 0.0:
-                    embed.add_field(name="Rain", value=f"{rain} inches")
+            rain = current.get('rain', 'N/A')
+            if rain != 'N/A' and rain != 0.0:
+                embed.add_field(name="Rain", value=f"{rain} inches")
                 
-                showers = current.get('showers', 'N/A')
-                if showers != 'N/A' and showers != 0.0:
-                    embed.add_field(name="Showers", value=f"{showers} inches")
+            showers = current.get('showers', 'N/A')
+            if showers != 'N/A' and showers != 0.0:
+                embed.add_field(name="Showers", value=f"{showers} inches")
                 
-                snowfall = current.get('snowfall', 'N/A')
-                if snowfall != 'N/A' and snowfall != 0.0:
-                    embed.add_field(name="Snowfall", value=f"{snowfall} inches")
+            snowfall = current.get('snowfall', 'N/A')
+            if snowfall != 'N/A' and snowfall != 0.0:
+                embed.add_field(name="Snowfall", value=f"{snowfall} inches")
                 
-                embed.add_field(name="Cloud cover", value=f"{current.get('cloud_cover', 'N/A')}%")
-
-                visibility = minutely_15.get('visibility', [0])
-                if isinstance(visibility, list) and visibility:
-                    visibility_value_miles = visibility[0] / 5280
-                    visibility_value_meters = float(self.miles_to_meters(visibility_value_miles))
-                    if visibility_value_meters < 1000:
-                        visibility_str = f"{visibility_value_meters:.1f} m"
-                    else:
-                        visibility_value_km = visibility_value_meters / 1000
-                        visibility_str = f"{visibility_value_km:.1f} km"
+            embed.add_field(name="Cloud cover", value=f"{current.get('cloud_cover', 'N/A')}%")
+
+            visibility = minutely_15.get('visibility', [0])
+            if isinstance(visibility, list) and visibility:
+                visibility_value_miles = visibility[0] / 5280
+                visibility_value_meters = float(self.miles_to_meters(visibility_value_miles))
+                if visibility_value_meters < 1000:
+                    visibility_str = f"{visibility_value_meters:.1f} m"
                 else:
-                    visibility_value_miles = 0
-                    visibility_str = "0.0 miles"
-                embed.add_field(name="Visibility", value=f"{visibility_value_miles:.2f} mi • {visibility_str}")
-
-                embed.add_field(name="Pressure (MSL)", value=f"{current.get('pressure_msl', 'N/A')} hPa")
-                embed.add_field(name="Surface pressure", value=f"{current.get('surface_pressure', 'N/A')} hPa")
+                    visibility_value_km = visibility_value_meters / 1000
+                    visibility_str = f"{visibility_value_km:.1f} km"
+            else:
+                visibility_value_miles = 0
+                visibility_str = "0.0 miles"
+            embed.add_field(name="Visibility", value=f"{visibility_value_miles:.2f} mi • {visibility_str}")
+
+            embed.add_field(name="Pressure (MSL)", value=f"{current.get('pressure_msl', 'N/A')} hPa")
+            embed.add_field(name="Surface pressure", value=f"{current.get('surface_pressure', 'N/A')} hPa")
                 
-                lightning_potential = minutely_15.get('lightning_potential', [None])
-                if isinstance(lightning_potential, list) and lightning_potential:
-                    lightning_potential = lightning_potential[0]
-                if lightning_potential is None or lightning_potential == 0:
-                    lightning_potential_str = 'None'
-                elif lightning_potential < 500:
-                    lightning_potential_str = 'Low'
-                elif lightning_potential < 1000:
-                    lightning_potential_str = 'Medium'
-                elif lightning_potential < 2000:
-                    lightning_potential_str = 'High'
-                else:
-                    lightning_potential_str = 'Extreme'
-                embed.add_field(name="Lightning potential", value=f"{lightning_potential_str}")
+            lightning_potential = minutely_15.get('lightning_potential', [None])
+            if isinstance(lightning_potential, list) and lightning_potential:
+                lightning_potential = lightning_potential[0]
+            if lightning_potential is None or lightning_potential == 0:
+                lightning_potential_str = 'None'
+            elif lightning_potential < 500:
+                lightning_potential_str = 'Low'
+            elif lightning_potential < 1000:
+                lightning_potential_str = 'Medium'
+            elif lightning_potential < 2000:
+                lightning_potential_str = 'High'
+            else:
+                lightning_potential_str = 'Extreme'
+            embed.add_field(name="Lightning potential", value=f"{lightning_potential_str}")
                 
-                # Fetch severe and extreme weather alerts
-                alerts_url = f"https://api.weather.gov/alerts/active?point={latitude.strip()},{longitude.strip()}"
-                active_alerts_list = []
-                async with self.session.get(alerts_url) as alerts_response:
-                    try:
-                        alerts_response.raise_for_status()
-                        alerts_data = await alerts_response.json()
-                        alerts = alerts_data.get('features', [])
-                        if alerts:
-                            embed.set_footer(text="When thunder roars, go indoors. If you can hear thunder, you can be struck by lightning.")
-                            alert_titles = []
-                            event_emojis = {
-                                "Tornado Warning": ":cloud_tornado:",
-                                "Severe Thunderstorm Warning": ":thunder_cloud_rain:",
-                                "Flood Warning": ":ocean:",
-                                "Flood Watch": ":ocean:",
-                                "Heat Advisory": ":desert:",
-                                "Special Weather Statement": ":information_source:",
-                                "Winter Storm Warning": ":cloud_snow:",
-                                "High Wind Warning": ":wind_blowing_face:",
-                                "Excessive Heat Warning": ":thermometer:",
-                                "Fire Weather Watch": ":fire:",
-                                "Flood Advisory": ":ocean:",
-                                "Hurricane Warning": ":cyclone:",
-                                "Tsunami Warning": ":ocean:",
-                                "Earthquake Warning": ":earth_americas:",
-                                "Blizzard Warning": ":snowflake:",
-                                "Freeze Warning": ":snowflake:",
-                                "Dust Storm Warning": ":dash:",
-                                "Extreme Cold Warning": ":cold_face:",
-                                "Extreme Heat Warning": ":hot_face:",
-                                "Gale Warning": ":wind_face:",
-                                "Ice Storm Warning": ":ice_cube:",
-                                "Red Flag Warning": ":triangular_flag_on_post:",
-                                "Severe Weather Statement": ":cloud_with_lightning_and_rain:",
-                                "Special Marine Warning": ":anchor:",
-                                "Storm Surge Warning": ":ocean:",
-                                "Tropical Storm Warning": ":thunder_cloud_rain:",
-                                "Tropical Cyclone Statement": ":cyclone:",
-                                "Volcano Warning": ":volcano:",
-                                "Flash Flood Warning": ":ocean:",
-                                "Frost Advisory": ":snowflake:",
-                                "Hydrologic Outlook": ":notepad_spiral:",
-                                "Rip Current Statement": ":ocean:",
-                                "Mandatory evacuation order": ":person_running:",
-                                "Air Quality Alert": ":face_in_clouds:",
-                                "Coastal Flood Warning": ":beach_umbrella:",
-                                # Add more event types and corresponding emojis as needed
-                            }
-                            event_transformations = {
-                                "Evacuation - Immediate": "Mandatory evacuation order",
-                                # Add more event transformations as needed
-                            }
-                            for alert in alerts:
-                                event = alert['properties']['event']
-                                event = event_transformations.get(event, event)  # Transform event name if applicable
-                                emoji = event_emojis.get(event, ":warning:")  # Default to warning emoji if event not found
-                                expires = alert['properties'].get('expires')
-                                if expires:
+            # Fetch severe and extreme weather alerts
+            alerts_url = f"https://api.weather.gov/alerts/active?point={point_key(*location)}"
+            active_alerts_list = []
+            async with self.session.get(alerts_url) as alerts_response:
+                try:
+                    alerts_response.raise_for_status()
+                    alerts_data = await alerts_response.json()
+                    alerts = alerts_data.get('features', [])
+                    if alerts:
+                        embed.set_footer(text="When thunder roars, go indoors. If you can hear thunder, you can be struck by lightning.")
+                        alert_titles = []
+                        event_emojis = {
+                            "Tornado Warning": ":cloud_tornado:",
+                            "Severe Thunderstorm Warning": ":thunder_cloud_rain:",
+                            "Flood Warning": ":ocean:",
+                            "Flood Watch": ":ocean:",
+                            "Heat Advisory": ":desert:",
+                            "Special Weather Statement": ":information_source:",
+                            "Winter Storm Warning": ":cloud_snow:",
+                            "High Wind Warning": ":wind_blowing_face:",
+                            "Excessive Heat Warning": ":thermometer:",
+                            "Fire Weather Watch": ":fire:",
+                            "Flood Advisory": ":ocean:",
+                            "Hurricane Warning": ":cyclone:",
+                            "Tsunami Warning": ":ocean:",
+                            "Earthquake Warning": ":earth_americas:",
+                            "Blizzard Warning": ":snowflake:",
+                            "Freeze Warning": ":snowflake:",
+                            "Dust Storm Warning": ":dash:",
+                            "Extreme Cold Warning": ":cold_face:",
+                            "Extreme Heat Warning": ":hot_face:",
+                            "Gale Warning": ":wind_face:",
+                            "Ice Storm Warning": ":ice_cube:",
+                            "Red Flag Warning": ":triangular_flag_on_post:",
+                            "Severe Weather Statement": ":cloud_with_lightning_and_rain:",
+                            "Special Marine Warning": ":anchor:",
+                            "Storm Surge Warning": ":ocean:",
+                            "Tropical Storm Warning": ":thunder_cloud_rain:",
+                            "Tropical Cyclone Statement": ":cyclone:",
+                            "Volcano Warning": ":volcano:",
+                            "Flash Flood Warning": ":ocean:",
+                            "Frost Advisory": ":snowflake:",
+                            "Hydrologic Outlook": ":notepad_spiral:",
+                            "Rip Current Statement": ":ocean:",
+                            "Mandatory evacuation order": ":person_running:",
+                            "Air Quality Alert": ":face_in_clouds:",
+                            "Coastal Flood Warning": ":beach_umbrella:",
+                            # Add more event types and corresponding emojis as needed
+                        }
+                        event_transformations = {
+                            "Evacuation - Immediate": "Mandatory evacuation order",
+                            # Add more event transformations as needed
+                        }
+                        for alert in alerts:
+                            event = alert['properties']['event']
+                            event = event_transformations.get(event, event)  # Transform event name if applicable
+                            emoji = event_emojis.get(event, ":warning:")  # Default to warning emoji if event not found
+                            expires = alert['properties'].get('expires')
+                            if expires:
+                                try:
+                                    expires_timestamp = f"<t:{int(datetime.fromisoformat(expires[:-1]).timestamp())}:R>"
+                                except ValueError:
+                                    # Attempt to correct the timestamp format
                                     try:
-                                        expires_timestamp = f"<t:{int(datetime.fromisoformat(expires[:-1]).timestamp())}:R>"
-                                    except ValueError:
-                                        # Attempt to correct the timestamp format
-                                        try:
-                                            corrected_expires = expires + '0'  # Adding missing zero
-                                            expires_timestamp = f"<t:{int(datetime.fromisoformat(corrected_expires[:-1]).timestamp())}:R>"
-                                        except ValueError as ve:
-                                            expires_timestamp = f"Invalid expiry time format: {expires}"
-                                    alert_titles.append(f"{emoji} **{event}** expiring **{expires_timestamp}**")
-                                else:
-                                    alert_titles.append(f"{emoji} **{event}**")
-                                # For AI summary, collect alert event and description
-                                alert_desc = alert['properties'].get('description', '')
-                                if alert_desc:
-                                    active_alerts_list.append(f"{event}: {alert_desc}")
-                                else:
-                                    active_alerts_list.append(f"{event}")
-                            alert_status = "\n".join(alert_titles)
-                        else:
-                            alert_status = "None right now - **#It'sAmazingOutThere**"
-                    except Exception as e:
-                        alert_status = f"Failed to fetch alerts: {str(e)}, url={alerts_url}"
+                                        corrected_expires = expires + '0'  # Adding missing zero
+                                        expires_timestamp = f"<t:{int(datetime.fromisoformat(corrected_expires[:-1]).timestamp())}:R>"
+                                    except ValueError as ve:
+                                        expires_timestamp = f"Invalid expiry time format: {expires}"
+                                alert_titles.append(f"{emoji} **{event}** expiring **{expires_timestamp}**")
+                            else:
+                                alert_titles.append(f"{emoji} **{event}**")
+                            # For AI summary, collect alert event and description
+                            alert_desc = alert['properties'].get('description', '')
+                            if alert_desc:
+                                active_alerts_list.append(f"{event}: {alert_desc}")
+                            else:
+                                active_alerts_list.append(f"{event}")
+                        alert_status = "\n".join(alert_titles)
+                    else:
+                        alert_status = "None right now - **#It'sAmazingOutThere**"
+                except Exception as e:
+                    alert_status = f"Failed to fetch alerts: {str(e)}, url={alerts_url}"
                 
-                embed.add_field(name="Active alerts", value=alert_status, inline=False)
-
-                # Check if OpenAI key is set and generate AI weather summary
-                tokens = await self.bot.get_shared_api_tokens("openai")
-                openai_key = tokens.get("api_key") if tokens else None
-                if openai_key:
-                    openai_url = "https://api.openai.com/v1/chat/completions"
-                    headers = {
-                        "Authorization": f"Bearer {openai_key}",
-                        "Content-Type": "application/json"
-                    }
-                    # Compose a summary of active alerts for the AI prompt
-                    if active_alerts_list:
-                        alerts_summary = "Active alerts: " + "; ".join(active_alerts_list)
+            embed.add_field(name="Active alerts", value=alert_status, inline=False)
+
+            # Check if OpenAI key is set and generate AI weather summary
+            tokens = await self.bot.get_shared_api_tokens("openai")
+            openai_key = tokens.get("api_key") if tokens else None
+            if openai_key:
+                openai_url = "https://api.openai.com/v1/chat/completions"
+                headers = {
+                    "Authorization": f"Bearer {openai_key}",
+                    "Content-Type": "application/json"
+                }
+                # Compose a summary of active alerts for the AI prompt
+                if active_alerts_list:
+                    alerts_summary = "Active alerts: " + "; ".join(active_alerts_list)
+                else:
+                    alerts_summary = "There are no active weather alerts at this time."
+                messages = [
+                    {"role": "system", "content": "You are a virtual meteorologist built into an app. Never talk about the location the data comes from or the time. Always respond in conversational text, giving recommendations based on conditions where appropriate."},
+                    {"role": "user", "content": f"Generate a summary of the current weather conditions based on the following data: {data}\n\n{alerts_summary}"}
+                ]
+                openai_payload = {
+                    "model": "gpt-4.1-nano",
+                    "messages": messages,
+                    "max_tokens": 500,
+                    "temperature": 1.0
+                }
+                async with self.session.post(openai_url, headers=headers, json=openai_payload) as openai_response:
+                    if openai_response.status == 200:
+                        openai_data = await openai_response.json()
+                        ai_summary = openai_data.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
+                        embed.add_field(name="AI weather summary", value=ai_summary, inline=False)
                     else:
-                        alerts_summary = "There are no active weather alerts at this time."
-                    messages = [
-                        {"role": "system", "content": "You are a virtual meteorologist built into an app. Never talk about the location the data comes from or the time. Always respond in conversational text, giving recommendations based on conditions where appropriate."},
-                        {"role": "user", "content": f"Generate a summary of the current weather conditions based on the following data: {data}\n\n{alerts_summary}"}
-                    ]
-                    openai_payload = {
-                        "model": "gpt-4.1-nano",
-                        "messages": messages,
-                        "max_tokens": 500,
-                        "temperature": 1.0
-                    }
-                    async with self.session.post(openai_url, headers=headers, json=openai_payload) as openai_response:
-                        if openai_response.status == 200:
-                            openai_data = await openai_response.json()
-                            ai_summary = openai_data.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
-                            embed.add_field(name="AI weather summary", value=ai_summary, inline=False)
-                        else:
-                            pass
-
-                await ctx.send(embed=embed)
-                nowcasts_fetched = await self.config.nowcasts_fetched()
-                await self.config.nowcasts_fetched.set(nowcasts_fetched + 1)
-
-                # Update highest and lowest values
-                highest_temperature = await self.config.highest_temperature()
-                highest_temperature_date = await self.config.highest_temperature_date()
-                lowest_temperature = await self.config.lowest_temperature()
-                lowest_temperature_date = await self.config.lowest_temperature_date()
-                highest_wind_speed = await self.config.highest_wind_speed()
-                highest_wind_speed_date = await self.config.highest_wind_speed_date()
-                highest_precipitation = await self.config.highest_precipitation()
-                highest_precipitation_date = await self.config.highest_precipitation_date()
-                highest_wind_gusts = await self.config.highest_wind_gusts()
-                highest_wind_gusts_date = await self.config.highest_wind_gusts_date()
-                highest_snowfall = await self.config.highest_snowfall()
-                highest_snowfall_date = await self.config.highest_snowfall_date()
-                highest_rainfall = await self.config.highest_rainfall()
-                highest_rainfall_date = await self.config.highest_rainfall_date()
-
-                current_date = datetime.now().isoformat()
-
-                if temperature != 'N/A':
-                    if highest_temperature is None or temperature > highest_temperature:
-                        await self.config.highest_temperature.set(temperature)
-                        await self.config.highest_temperature_date.set(current_date)
-                    if lowest_temperature is None or temperature < lowest_temperature:
-                        await self.config.lowest_temperature.set(temperature)
-                        await self.config.lowest_temperature_date.set(current_date)
-
-                if wind_speed != 'N/A':
-                    if highest_wind_speed is None or wind_speed > highest_wind_speed:
-                        await self.config.highest_wind_speed.set(wind_speed)
-                        await self.config.highest_wind_speed_date.set(current_date)
-
-                if wind_gusts != 'N/A':
-                    if highest_wind_gusts is None or wind_gusts > highest_wind_gusts:
-                        await self.config.highest_wind_gusts.set(wind_gusts)
-                        await self.config.highest_wind_gusts_date.set(current_date)
-
-                if precipitation != 'N/A' and precipitation != 0.0:
-                    if highest_precipitation is None or precipitation > highest_precipitation:
-                        await self.config.highest_precipitation.set(precipitation)
-                        await self.config.highest_precipitation_date.set(current_date)
-
-                if snowfall != 'N/A' and snowfall != 0.0:
-                    if highest_snowfall is None or snowfall > highest_snowfall:
-                        await self.config.highest_snowfall.set(snowfall)
-                        await self.config.highest_snowfall_date.set(current_date)
-
-                if showers != 'N/A' and showers != 0.0:
-                    if highest_rainfall is None or showers > highest_rainfall:
-                        await self.config.highest_rainfall.set(showers)
-                        await self.config.highest_rainfall_date.set(current_date)
+                        pass
+
+            await ctx.send(embed=embed)
+            nowcasts_fetched = await self.config.nowcasts_fetched()
+            await self.config.nowcasts_fetched.set(nowcasts_fetched + 1)
+
+            # Update highest and lowest values
+            highest_temperature = await self.config.highest_temperature()
+            highest_temperature_date = await self.config.highest_temperature_date()
+            lowest_temperature = await self.config.lowest_temperature()
+            lowest_temperature_date = await self.config.lowest_temperature_date()
+            highest_wind_speed = await self.config.highest_wind_speed()
+            highest_wind_speed_date = await self.config.highest_wind_speed_date()
+            highest_precipitation = await self.config.highest_precipitation()
+            highest_precipitation_date = await self.config.highest_precipitation_date()
+            highest_wind_gusts = await self.config.highest_wind_gusts()
+            highest_wind_gusts_date = await self.config.highest_wind_gusts_date()
+            highest_snowfall = await self.config.highest_snowfall()
+            highest_snowfall_date = await self.config.highest_snowfall_date()
+            highest_rainfall = await self.config.highest_rainfall()
+            highest_rainfall_date = await self.config.highest_rainfall_date()
+
+            current_date = datetime.now().isoformat()
+
+            if temperature != 'N/A':
+                if highest_temperature is None or temperature > highest_temperature:
+                    await self.config.highest_temperature.set(temperature)
+                    await self.config.highest_temperature_date.set(current_date)
+                if lowest_temperature is None or temperature < lowest_temperature:
+                    await self.config.lowest_temperature.set(temperature)
+                    await self.config.lowest_temperature_date.set(current_date)
+
+            if wind_speed != 'N/A':
+                if highest_wind_speed is None or wind_speed > highest_wind_speed:
+                    await self.config.highest_wind_speed.set(wind_speed)
+                    await self.config.highest_wind_speed_date.set(current_date)
+
+            if wind_gusts != 'N/A':
+                if highest_wind_gusts is None or wind_gusts > highest_wind_gusts:
+                    await self.config.highest_wind_gusts.set(wind_gusts)
+                    await self.config.highest_wind_gusts_date.set(current_date)
+
+            if precipitation != 'N/A' and precipitation != 0.0:
+                if highest_precipitation is None or precipitation > highest_precipitation:
+                    await self.config.highest_precipitation.set(precipitation)
+                    await self.config.highest_precipitation_date.set(current_date)
+
+            if snowfall != 'N/A' and snowfall != 0.0:
+                if highest_snowfall is None or snowfall > highest_snowfall:
+                    await self.config.highest_snowfall.set(snowfall)
+                    await self.config.highest_snowfall_date.set(current_date)
+
+            if showers != 'N/A' and showers != 0.0:
+                if highest_rainfall is None or showers > highest_rainfall:
+                    await self.config.highest_rainfall.set(showers)
+                    await self.config.highest_rainfall_date.set(current_date)
 
     @commands.guild_only()
     @weather.command(name="glossary")
@@ -1150,62 +1132,116 @@ class Weather(commands.Cog):
             await self.config.user(user).severealerts.set(False)
             await ctx.send("Weather alerts have been disabled.")
 
-    async def check_weather_alerts(self):
-        """Check for weather alerts and DM users if any severe or extreme warnings are issued"""
+    async def _subscribers_by_point(self, setting):
+        """Group the users with an alert setting enabled by the NWS point of their zip code."""
+        groups = {}  # {point: [(user_id, user_data)]}
         all_users = await self.config.all_users()
-        users_with_alerts = [user_id for user_id, data in all_users.items() if data.get("severealerts")]
-
-        for user_id in users_with_alerts:
-            user_data = await self.config.user_from_id(user_id).all()
-            zip_code = user_data.get("zip_code")
-            if not zip_code or zip_code not in self.zip_codes:
+        for user_id, data in all_users.items():
+            if not data.get(setting):
+                continue
+            location = self.zip_codes.get(data.get("zip_code"))
+            if location is None:
                 continue
+            groups.setdefault(point_key(*location), []).append((user_id, data))
+        return groups
+
+    async def _forecast_periods(self, setting):
+        """Yield (subscribers, forecast periods) once per NWS forecast grid with users subscribed to `setting`."""
+        subscribers = await self._subscribers_by_point(setting)
+        forecast_urls = await self.nws.forecast_urls(subscribers)
+        grids = {}  # {forecast url: [(user_id, user_data)]}
+        for point, users in subscribers.items():
+            if point in forecast_urls:
+                grids.setdefault(forecast_urls[point], []).extend(users)
+        responses = await self.nws.fetch_all(grids)
+        for forecast_url, users in grids.items():
+            data = responses.get(forecast_url)
+            if data:
+                yield users, data.get('properties', {}).get('periods', [])
 
-            latitude, longitude = self.zip_codes[zip_code]
-            alerts_url = f"https://api.weather.gov/alerts/active?point={latitude.strip()},{longitude.strip()}"
+    async def check_weather_alerts(self):
+        """Check for weather alerts and DM users if any severe or extreme warnings are issued"""
+        # One request per distinct point, however many users share it
+        subscribers = await self._subscribers_by_point("severealerts")
+        alert_urls = {point: f"https://api.weather.gov/alerts/active?point={point}" for point in subscribers}
+        responses = await self.nws.fetch_all(alert_urls.values())
+        ledger = await self._get_alert_ledger()
+        ledger_changed = False
+
+        for point, users in subscribers.items():
+            data = responses.get(alert_urls[point])
+            if not data:
+                continue
+            alerts = data.get('features', [])
+            severe_alerts = [alert for alert in alerts if alert['properties']['severity'] in ['Severe', 'Extreme']]
+            if not severe_alerts:
+                continue
 
-            async with self.session.get(alerts_url) as response:
-                if response.status != 200:
+            embeds = {}
+            for alert in severe_alerts:
+                embed = discord.Embed(
+                    title=alert['properties']['event'],
+                    description=f"{'An' if alert['properties']['event'][0].lower() in 'aeiou' else 'A'} **{alert['properties']['event']}** was issued at **<t:{int(datetime.fromisoformat(alert['properties']['sent']).timestamp())}:F>** for your location and is in effect until **<t:{int(datetime.fromisoformat(alert['properties']['expires']).timestamp())}:F>**.",
+                    color=0xff4545
+                )
+                if 'instruction' in alert['properties']:
+                    embed.add_field(name="Instruction", value=alert['properties']['instruction'], inline=False)
+                if 'severity' in alert['properties']:
+                    embed.add_field(name="Severity", value=alert['properties']['severity'], inline=True)
+                if 'urgency' in alert['properties']:
+                    embed.add_field(name="Urgency", value=alert['properties']['urgency'], inline=True)
+                if 'certainty' in alert['properties']:
+                    embed.add_field(name="Certainty", value=alert['properties']['certainty'], inline=True)
+                if 'senderName' in alert['properties']:
+                    embed.set_footer(text=f"Issued by {alert['properties']['senderName']}")
+                embeds[alert['id']] = embed
+
+            for user_id, _user_data in users:
+                user = self.bot.get_user(user_id)
+                if not user:
                     continue
-
-                data = await response.json()
-                alerts = data.get('features', [])
-                severe_alerts = [alert for alert in alerts if alert['properties']['severity'] in ['Severe', 'Extreme']]
-
-                if severe_alerts:
-                    user = self.bot.get_user(user_id)
-                    if user:
-                        sent_alerts = user_data.get("sent_alerts", [])
-                        new_alerts = [alert for alert in severe_alerts if alert['id'] not in sent_alerts]
-
-                        if new_alerts:
-                            for alert in new_alerts:
-                                embed = discord.Embed(
-                                    title=alert['properties']['event'],
-                                    description=f"{'An' if alert['properties']['event'][0].lower() in 'aeiou' else 'A'} **{alert['properties']['event']}** was issued at **<t:{int(datetime.fromisoformat(alert['properties']['sent']).timestamp())}:F>** for your location and is in effect until **<t:{int(datetime.fromisoformat(alert['properties']['expires']).timestamp())}:F>**.",
-                                    color=0xff4545
-                                )
-                                if 'instruction' in alert['properties']:
-                                    embed.add_field(name="Instruction", value=alert['properties']['instruction'], inline=False)
-                                if 'severity' in alert['properties']:
-                                    embed.add_field(name="Severity", value=alert['properties']['severity'], inline=True)
-                                if 'urgency' in alert['properties']:
-                                    embed.add_field(name="Urgency", value=alert['properties']['urgency'], inline=True)
-                                if 'certainty' in alert['properties']:
-                                    embed.add_field(name="Certainty", value=alert['properties']['certainty'], inline=True)
-                                if 'senderName' in alert['properties']:
-                                    embed.set_footer(text=f"Issued by {alert['properties']['senderName']}")
-
-                                await user.send(embed=embed)
-                                sent_alerts.append(alert['id'])
-
-                            await self.config.user_from_id(user_id).sent_alerts.set(sent_alerts)
-                            total_alerts_sent = await self.config.total_alerts_sent()
-                            await self.config.total_alerts_sent.set(total_alerts_sent + len(new_alerts))
+                new_alerts = [alert for alert in severe_alerts if not ledger.sent(alert['id'], user_id)]
+                if not new_alerts:
+                    continue
+                sent = 0
+                try:
+                    for alert in new_alerts:
+                        await user.send(embed=embeds[alert['id']])
+                        ledger.record(alert['id'], user_id, alert_expiry(alert['properties']))
+                        sent += 1
+                except discord.HTTPException:
+                    pass  # DMs closed, the rest are tried again next cycle
+                if not sent:
+                    continue
+                ledger_changed = True
+                total_alerts_sent = await self.config.total_alerts_sent()
+                await self.config.total_alerts_sent.set(total_alerts_sent + sent)
+
+        ledger.prune()
+        if ledger_changed:
+            await self.config.sent_alert_ledger.set(ledger.to_dict())
+
+    async def _get_alert_ledger(self):
+        if self.alert_ledger is None:
+            ledger = AlertLedger.from_dict(await self.config.sent_alert_ledger())
+            # Move the old per-user lists over, they don't say when their alerts expire
+            expires = time.time() + DEFAULT_TTL
+            all_users = await self.config.all_users()
+            for user_id, data in all_users.items():
+                if data.get("sent_alerts"):
+                    for alert_id in data["sent_alerts"]:
+                        ledger.record(alert_id, user_id, expires)
+                    await self.config.user_from_id(user_id).sent_alerts.clear()
+            await self.config.sent_alert_ledger.set(ledger.to_dict())
+            self.alert_ledger = ledger
+        return self.alert_ledger
 
     async def start_severe_alerts_task(self):
         while True:
-            await self.check_weather_alerts()
+            try:
+                await self.check_weather_alerts()
+            except Exception:
+                log.exception("Error checking severe alerts")
             await asyncio.sleep(900)
 
     @commands.cooldown(1, 900, commands.BucketType.user)
@@ -1220,46 +1256,39 @@ class Weather(commands.Cog):
 
     async def check_freeze_alerts(self):
         """Check for upcoming dangerously cold temperatures and DM users if any are expected"""
-        all_users = await self.config.all_users()
-        users_with_freeze_alerts = [user_id for user_id, data in all_users.items() if data.get("freezealerts")]
-
-        for user_id in users_with_freeze_alerts:
-            user_data = await self.config.user_from_id(user_id).all()
-            zip_code = user_data.get("zip_code")
-            if not zip_code or zip_code not in self.zip_codes:
+        # One forecast request per NWS grid, however many users share it
+        async for users, periods in self._forecast_periods("freezealerts"):
+            cold_alerts = [period for period in periods if period['temperature'] <= 10]
+            if not cold_alerts:
                 continue
 
-            latitude, longitude = self.zip_codes[zip_code]
-            forecast_url = f"https://api.weather.gov/points/{latitude.strip()},{longitude.strip()}/forecast"
-
-            async with self.session.get(forecast_url) as response:
-                if response.status != 200:
+            for user_id, _user_data in users:
+                user = self.bot.get_user(user_id)
+                if not user:
                     continue
+                for alert in cold_alerts:
+                    embed = discord.Embed(
+                        title="Extreme cold alert",
+                        description=f"Expected dangerously cold temperatures: {alert['temperature']}°F",
+                        color=0x1E90FF
+                    )
+                    embed.add_field(name="Time", value=alert['name'], inline=True)
+                    embed.add_field(name="Detailed Forecast", value=alert['detailedForecast'], inline=False)
+                    embed.set_footer(text="Stay warm and take necessary precautions.")
 
-                data = await response.json()
-                periods = data.get('properties', {}).get('periods', [])
-                cold_alerts = [period for period in periods if period['temperature'] <= 10]
-
-                if cold_alerts:
-                    user = self.bot.get_user(user_id)
-                    if user:
-                        for alert in cold_alerts:
-                            embed = discord.Embed(
-                                title="Extreme cold alert",
-                                description=f"Expected dangerously cold temperatures: {alert['temperature']}°F",
-                                color=0x1E90FF
-                            )
-                            embed.add_field(name="Time", value=alert['name'], inline=True)
-                            embed.add_field(name="Detailed Forecast", value=alert['detailedForecast'], inline=False)
-                            embed.set_footer(text="Stay warm and take necessary precautions.")
-
-                            await user.send(embed=embed)
-                            total_freeze_alerts_sent = await self.config.total_freeze_alerts_sent()
-                            await self.config.total_freeze_alerts_sent.set(total_freeze_alerts_sent + 1)
+                    try:
+                        await user.send(embed=embed)
+                    except discord.HTTPException:
+                        break
+                    total_freeze_alerts_sent = await self.config.total_freeze_alerts_sent()
+                    await self.config.total_freeze_alerts_sent.set(total_freeze_alerts_sent + 1)
 
     async def start_freeze_alerts_task(self):
         while True:
-            await self.check_freeze_alerts()
+            try:
+                await self.check_freeze_alerts()
+            except Exception:
+                log.exception("Error checking freeze alerts")
             await asyncio.sleep(604800)  # 7 days in seconds
 
     @commands.cooldown(1, 900, commands.BucketType.user)
@@ -1274,46 +1303,39 @@ class Weather(commands.Cog):
 
     async def check_heat_alerts(self):
         """Check for upcoming dangerously hot temperatures and DM users if any are expected"""
-        all_users = await self.config.all_users()
-        users_with_heat_alerts = [user_id for user_id, data in all_users.items() if data.get("heatalerts")]
-
-        for user_id in users_with_heat_alerts:
-            user_data = await self.config.user_from_id(user_id).all()
-            zip_code = user_data.get("zip_code")
-            if not zip_code or zip_code not in self.zip_codes:
+        # One forecast request per NWS grid, however many users share it
+        async for users, periods in self._forecast_periods("heatalerts"):
+            heat_alerts = [period for period in periods if period['temperature'] >= 100]
+            if not heat_alerts:
                 continue
 
-            latitude, longitude = self.zip_codes[zip_code]
-            forecast_url = f"https://api.weather.gov/points/{latitude.strip()},{longitude.strip()}/forecast"
-
-            async with self.session.get(forecast_url) as response:
-                if response.status != 200:
+            for user_id, _user_data in users:
+                user = self.bot.get_user(user_id)
+                if not user:
                     continue
+                for alert in heat_alerts:
+                    embed = discord.Embed(
+                        title="Extreme heat alert",
+                        description=f"Expected dangerously hot temperatures: {alert['temperature']}°F",
+                        color=0xFF4500
+                    )
+                    embed.add_field(name="Time", value=alert['name'], inline=True)
+                    embed.add_field(name="Detailed Forecast", value=alert['detailedForecast'], inline=False)
+                    embed.set_footer(text="Stay cool and take necessary precautions.")
 
-                data = await response.json()
-                periods = data.get('properties', {}).get('periods', [])
-                heat_alerts = [period for period in periods if period['temperature'] >= 100]
-
-                if heat_alerts:
-                    user = self.bot.get_user(user_id)
-                    if user:
-                        for alert in heat_alerts:
-                            embed = discord.Embed(
-                                title="Extreme heat alert",
-                                description=f"Expected dangerously hot temperatures: {alert['temperature']}°F",
-                                color=0xFF4500
-                            )
-                            embed.add_field(name="Time", value=alert['name'], inline=True)
-                            embed.add_field(name="Detailed Forecast", value=alert['detailedForecast'], inline=False)
-                            embed.set_footer(text="Stay cool and take necessary precautions.")
-
-                            await user.send(embed=embed)
-                            total_heat_alerts_sent = await self.config.total_heat_alerts_sent()
-                            await self.config.total_heat_alerts_sent.set(total_heat_alerts_sent + 1)
+                    try:
+                        await user.send(embed=embed)
+                    except discord.HTTPException:
+                        break
+                    total_heat_alerts_sent = await self.config.total_heat_alerts_sent()
+                    await self.config.total_heat_alerts_sent.set(total_heat_alerts_sent + 1)
 
     async def start_heat_alerts_task(self):
         while True:
-            await self.check_heat_alerts()
+            try:
+                await self.check_heat_alerts()
+            except Exception:
+                log.exception("Error checking heat alerts")
             await asyncio.sleep(604800)  # 7 days in seconds
 
     @weatherset.command(name="zip")
@@ -0,0 +1,125 @@
+"""Zip code to coordinates lookup backed by a precompiled, memory-mapped index.
+
+``data/zipcodes.csv`` stays the source of truth. ``data/zipcodes.bin`` is built
+from it by running ``python weatherpro/zipcodes.py`` and must be rebuilt
+whenever the CSV changes; a stale or missing index falls back to reading the CSV.
+"""
+import csv
+import mmap
+import struct
+from pathlib import Path
+
+from red_commons.logging import getLogger  # type: ignore
+
+log = getLogger("red.beehive.weatherpro")
+
+MAGIC = b"WZIP"
+VERSION = 1
+# magic, version, key width, record count, size of the CSV the index was built from
+HEADER = struct.Struct("<4sHHIQ")
+SCALE = 1_000_000  # Coordinates are stored as integer millionths of a degree
+
+
+def read_csv(path):
+    """Yield (zip code, latitude, longitude) strings from the zip code CSV."""
+    with Path(path).open(mode="r") as zip_code_file:
+        csv_reader = csv.reader(zip_code_file)
+        next(csv_reader, None)  # Header
+        for row in csv_reader:
+            if len(row) >= 3:
+                yield row[0].strip(), row[1].strip(), row[2].strip()
+
+
+def build_index(csv_path, index_path):
+    """Write the sorted binary index for a zip code CSV, returns the number of records."""
+    csv_path, index_path = Path(csv_path), Path(index_path)
+    rows = sorted((code.encode(), round(float(lat) * SCALE), round(float(lng) * SCALE)) for code, lat, lng in read_csv(csv_path))
+    width = max((len(code) for code, _lat, _lng in rows), default=1)
+    record = struct.Struct(f"<{width}sii")
+    with index_path.open("wb") as index_file:
+        index_file.write(HEADER.pack(MAGIC, VERSION, width, len(rows), csv_path.stat().st_size))
+        for row in rows:
+            index_file.write(record.pack(*row))
+    return len(rows)
+
+
+class ZipCodes:
+    """
+    Read-only mapping of zip code to (latitude, longitude) strings.
+
+    The index is a header followed by fixed-width (key, lat, lng) records sorted by key. It's
+    opened and memory-mapped on the first lookup and searched by bisection, so loading costs
+    nothing and a lookup is O(log n) without reading the file into Python objects.
+    """
+
+    def __init__(self, data_dir):
+        data_dir = Path(data_dir)
+        self.csv_path = data_dir / "zipcodes.csv"
+        self.index_path = data_dir / "zipcodes.bin"
+        self._map = None
+        self._record = None
+        self._count = 0
+        self._fallback = None  # {zip code: (latitude, longitude)} when the index can't be used
+
+    def _open(self):
+        try:
+            with self.index_path.open("rb") as index_file:
+                mapped = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, width, count, csv_size = HEADER.unpack_from(mapped)
+            record = struct.Struct(f"<{width}sii")
+            if magic != MAGIC or version != VERSION or len(mapped) != HEADER.size + count * record.size:
+                raise ValueError("unrecognised zip code index")
+            if self.csv_path.exists() and self.csv_path.stat().st_size != csv_size:
+                raise ValueError("zip code index is older than zipcodes.csv, rebuild it")
+        except (OSError, ValueError, struct.error) as e:
+            log.warning("Falling back to zipcodes.csv: %s", e)
+            self._fallback = {code: (lat, lng) for code, lat, lng in read_csv(self.csv_path)}
+            return
+        self._map, self._record, self._count = mapped, record, count
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def get(self, zip_code, default=None):
+        if self._map is None and self._fallback is None:
+            self._open()
+        if self._fallback is not None:
+            return self._fallback.get(zip_code, default)
+        if not isinstance(zip_code, str):
+            return default
+        key = zip_code.strip().encode()
+        width = self._record.size - 8
+        if not key or len(key) > width:
+            return default
+        # Keys are NUL padded, which sorts before any character, so padding the query matches
+        key = key.ljust(width, b"\0")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            offset = HEADER.size + middle * self._record.size
+            found = self._map[offset:offset + width]
+            if found < key:
+                low = middle + 1
+            elif found > key:
+                high = middle
+            else:
+                _code, lat, lng = self._record.unpack_from(self._map, offset)
+                return f"{lat / SCALE:.6f}", f"{lng / SCALE:.6f}"
+        return default
+
+    def __getitem__(self, zip_code):
+        location = self.get(zip_code)
+        if location is None:
+            raise KeyError(zip_code)
+        return location
+
+    def __contains__(self, zip_code):
+        return self.get(zip_code) is not None
+
+
+if __name__ == "__main__":
+    data_dir = Path(__file__).resolve().parent / "data"
+    count = build_index(data_dir / "zipcodes.csv", data_dir / "zipcodes.bin")
+    print(f"Wrote {count} zip codes to {data_dir / 'zipcodes.bin'}")